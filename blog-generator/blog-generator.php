@@ -26,6 +26,7 @@ class Blog_Generator_Plugin {
     private function __construct() {
         add_action('admin_menu', array($this, 'add_plugin_page'));
         add_action('rest_api_init', array($this, 'register_rest_routes'));
+        add_filter('rest_pre_dispatch', array($this, 'decode_request_body'), 10, 3);
         
         // デバッグ用：ログ出力を有効化
         if (!defined('WP_DEBUG') || !WP_DEBUG) {
@@ -603,6 +604,20 @@ class Blog_Generator_Plugin {
             )
         ));
         
+        // ブロックパッチ更新（変更ブロックのみ受け取り、基準版と異なる場合は409）
+        register_rest_route('blog-generator/v1', '/patch-post/(?P<id>\d+)', array(
+            'methods' => 'POST',
+            'callback' => array($this, 'rest_patch_post'),
+            'permission_callback' => array($this, 'check_api_permission'),
+            'args' => array(
+                'id' => array(
+                    'validate_callback' => function($param, $request, $key) {
+                        return is_numeric($param);
+                    }
+                )
+            )
+        ));
+        
         register_rest_route('blog-generator/v1', '/get-post/(?P<id>\d+)', array(
             'methods' => 'GET',
             'callback' => array($this, 'rest_get_post'),
@@ -648,6 +663,13 @@ class Blog_Generator_Plugin {
             'permission_callback' => array($this, 'check_api_permission')
         ));
         
+        // 記事カタログ同期用（更新日時順、前回同期位置以降のみ）
+        register_rest_route('blog-generator/v1', '/list-posts', array(
+            'methods' => 'GET',
+            'callback' => array($this, 'rest_list_posts'),
+            'permission_callback' => array($this, 'check_api_permission')
+        ));
+        
         register_rest_route('blog-generator/v1', '/analytics/(?P<id>\d+)', array(
             'methods' => 'GET',
             'callback' => array($this, 'rest_get_analytics'),
@@ -703,6 +725,7 @@ class Blog_Generator_Plugin {
             $status = sanitize_text_field($request->get_param('status')) ?: 'draft';
             $meta_description = sanitize_text_field($request->get_param('meta_description'));
             $featured_image_id = intval($request->get_param('featured_image_id'));
+            $intent_ids = $request->get_param('intent_ids');
             
             $this->debug_log('Creating post via REST API:', array(
                 'title' => $title,
@@ -731,6 +754,16 @@ class Blog_Generator_Plugin {
                 update_post_meta($post_id, '_meta_description', $meta_description);
             }
             
+            // 検索意図ID（INT-01 形式、list-posts で返す）
+            if (is_array($intent_ids)) {
+                $intent_ids = array_values(array_filter(array_map('sanitize_text_field', $intent_ids), function($intent_id) {
+                    return preg_match('/^INT-\d+$/', $intent_id);
+                }));
+                if ($intent_ids) {
+                    update_post_meta($post_id, '_blog_generator_intent_ids', implode(',', $intent_ids));
+                }
+            }
+            
             // アイキャッチ画像設定
             if ($featured_image_id && $featured_image_id > 0) {
                 $thumbnail_result = set_post_thumbnail($post_id, $featured_image_id);
@@ -766,10 +799,37 @@ class Blog_Generator_Plugin {
         return rest_ensure_response(array(
             'today_count' => $today_count,
             'total_count' => $total_count,
-            'last_used' => $last_used
+            'last_used' => $last_used,
+            // クライアントはこの一覧でリクエスト本文の圧縮可否を判断する
+            'request_encodings' => function_exists('gzdecode') ? array('gzip') : array()
         ));
     }
     
+    // REST API: gzip圧縮されたリクエスト本文（Content-Encoding: gzip）を展開
+    public function decode_request_body($result, $server, $request) {
+        if ($result !== null || strpos($request->get_route(), '/blog-generator/v1/') !== 0) {
+            return $result;
+        }
+        
+        $encoding = strtolower(trim((string) $request->get_header('content_encoding')));
+        if ($encoding === '' || $encoding === 'identity') {
+            return $result;
+        }
+        if ($encoding !== 'gzip' || !function_exists('gzdecode')) {
+            return new WP_Error('unsupported_encoding', '対応していないContent-Encodingです: ' . $encoding, array('status' => 415));
+        }
+        
+        // 展開後サイズの上限（圧縮爆弾対策）
+        $body = @gzdecode($request->get_body(), 64 * 1024 * 1024);
+        if ($body === false) {
+            return new WP_Error('invalid_encoding', 'リクエスト本文のgzip展開に失敗しました', array('status' => 400));
+        }
+        
+        $request->set_body($body);
+        $request->remove_header('content_encoding');
+        return $result;
+    }
+    
     // 使用状況更新
     private function update_usage_stats() {
         $today = date('Y-m-d');
@@ -1682,6 +1742,219 @@ class Blog_Generator_Plugin {
         }
     }
     
+    // REST API: ブロックパッチ更新エンドポイント
+    public function rest_patch_post(WP_REST_Request $request) {
+        try {
+            $post_id = intval($request->get_param('id'));
+            
+            // 記事存在チェック
+            $post = get_post($post_id);
+            if (!$post) {
+                return new WP_Error('post_not_found', '指定された記事が見つかりません', array('status' => 404));
+            }
+            
+            $base_hash = $request->get_param('base_hash');
+            $patches = $request->get_param('patches');
+            if (!is_string($base_hash) || !is_array($patches)) {
+                return new WP_Error('invalid_patch', 'base_hash と patches を指定してください', array('status' => 400));
+            }
+            
+            // 取得時点から本文が変更されていれば競合
+            $current_hash = hash('sha256', $post->post_content);
+            if (!hash_equals($current_hash, $base_hash)) {
+                return new WP_Error('update_conflict', '記事が取得時点から更新されています', array(
+                    'status' => 409,
+                    'current_hash' => $current_hash
+                ));
+            }
+            
+            $content = $this->apply_block_patch($post->post_content, $patches, $request->get_param('block_count'));
+            if (is_wp_error($content)) {
+                return $content;
+            }
+            
+            $this->debug_log('Applying block patch:', array(
+                'post_id' => $post_id,
+                'patches' => count($patches),
+                'content_length' => strlen($content)
+            ));
+            
+            // 本文以外の項目・バックアップ・アイキャッチは通常の更新処理で反映
+            $request->set_param('content', $content);
+            $response = $this->rest_update_post($request);
+            if (is_wp_error($response)) {
+                return $response;
+            }
+            
+            $data = $response->get_data();
+            $data['patched_blocks'] = count($patches);
+            $data['content_hash'] = hash('sha256', get_post($post_id)->post_content);
+            $response->set_data($data);
+            
+            return $response;
+            
+        } catch (Exception $e) {
+            $this->debug_log('Error in rest_patch_post:', $e->getMessage());
+            return new WP_Error('patch_failed', $e->getMessage(), array('status' => 500));
+        }
+    }
+    
+    // 本文をトップレベルのブロック範囲 array(name, start, end) に分割
+    // 分割規則は utils/content_diff.py の _block_spans と同一に保つこと
+    private function get_block_spans($content) {
+        $spans = array();
+        $whitespace = " \t\n\r\x0B\x0C";
+        
+        // ブロック外のテキストは空行で区切って freeform ブロックとする
+        $add_chunk = function($start, $end) use ($content, $whitespace, &$spans) {
+            $chunk = substr($content, $start, $end - $start);
+            $stripped = trim($chunk, $whitespace);
+            if ($stripped !== '') {
+                $start += strlen($chunk) - strlen(ltrim($chunk, $whitespace));
+                $spans[] = array('freeform', $start, $start + strlen($stripped));
+            }
+        };
+        $add_freeform = function($start, $end) use ($content, $add_chunk) {
+            preg_match_all('/\n\s*\n/', substr($content, $start, $end - $start), $separators, PREG_OFFSET_CAPTURE);
+            $chunk_start = $start;
+            foreach ($separators[0] as $separator) {
+                $add_chunk($chunk_start, $start + $separator[1]);
+                $chunk_start = $start + $separator[1] + strlen($separator[0]);
+            }
+            $add_chunk($chunk_start, $end);
+        };
+        
+        preg_match_all(
+            '/<!--\s+(?P<closer>\/)?wp:(?P<name>[a-z][a-z0-9_-]*(?:\/[a-z][a-z0-9_-]*)?)(?:\s+\{.*?\})?\s+(?P<void>\/)?-->/s',
+            $content,
+            $matches,
+            PREG_SET_ORDER | PREG_OFFSET_CAPTURE
+        );
+        
+        $depth = 0;
+        $block_start = 0;
+        $block_name = null;
+        $position = 0;
+        foreach ($matches as $match) {
+            $match_start = $match[0][1];
+            $match_end = $match_start + strlen($match[0][0]);
+            $is_closer = !empty($match['closer'][0]);
+            $is_void = !empty($match['void'][0]);
+            
+            if ($depth === 0) {
+                $add_freeform($position, $match_start);
+                if ($is_closer) {
+                    // 対応する開始のない終了区切りは本文として扱う
+                    $add_chunk($match_start, $match_end);
+                    $position = $match_end;
+                    continue;
+                }
+                if ($is_void) {
+                    $spans[] = array($match['name'][0], $match_start, $match_end);
+                    $position = $match_end;
+                    continue;
+                }
+                $block_start = $match_start;
+                $block_name = $match['name'][0];
+                $depth = 1;
+            } elseif ($is_closer) {
+                $depth--;
+                if ($depth === 0) {
+                    $spans[] = array($block_name, $block_start, $match_end);
+                    $position = $match_end;
+                }
+            } elseif (!$is_void) {
+                $depth++;
+            }
+        }
+        
+        if ($depth > 0) {
+            // 閉じられていないブロックは末尾までを1ブロックとする
+            $spans[] = array($block_name, $block_start, strlen(rtrim($content, $whitespace)));
+        } else {
+            $add_freeform($position, strlen($content));
+        }
+        
+        return $spans;
+    }
+    
+    // ブロックパッチ適用（ブロック間の既存の区切りは保持）
+    // 適用規則は utils/content_diff.py の apply_block_patch と同一に保つこと
+    private function apply_block_patch($content, $patches, $block_count = null) {
+        $spans = $this->get_block_spans($content);
+        $count = count($spans);
+        if ($block_count !== null && intval($block_count) !== $count) {
+            return new WP_Error('update_conflict', 'ブロック数が基準版と一致しません', array('status' => 409));
+        }
+        
+        $replacements = array();
+        $deletions = array();
+        $inserts = array();
+        foreach ($patches as $patch) {
+            $op = isset($patch['op']) ? $patch['op'] : null;
+            $index = isset($patch['index']) ? $patch['index'] : null;
+            if (!is_int($index) || $index < 0 || $index > $count || ($op !== 'insert' && $index === $count)) {
+                return new WP_Error('invalid_patch', 'ブロック番号が範囲外です', array('status' => 400));
+            }
+            
+            $block_content = isset($patch['content']) ? (string) $patch['content'] : '';
+            if ($op === 'insert') {
+                $inserts[$index][] = $block_content;
+                continue;
+            }
+            if ($op !== 'replace' && $op !== 'delete') {
+                return new WP_Error('invalid_patch', '未対応の操作です: ' . $op, array('status' => 400));
+            }
+            
+            // アンカー（基準版ブロックのハッシュ）照合
+            list(, $start, $end) = $spans[$index];
+            $anchor = isset($patch['anchor']) ? (string) $patch['anchor'] : '';
+            if (!hash_equals(hash('sha256', substr($content, $start, $end - $start)), $anchor)) {
+                return new WP_Error('update_conflict', 'ブロック ' . $index . ' が基準版と一致しません', array('status' => 409));
+            }
+            
+            if ($op === 'replace') {
+                $replacements[$index] = $block_content;
+            } else {
+                $deletions[$index] = true;
+            }
+        }
+        
+        $separator = "\n\n";
+        if ($count === 0) {
+            return implode($separator, isset($inserts[0]) ? $inserts[0] : array()) . $content;
+        }
+        
+        $pieces = array(substr($content, 0, $spans[0][1]));
+        foreach ($spans as $i => $span) {
+            list(, $start, $end) = $span;
+            $next_start = ($i + 1 < $count) ? $spans[$i + 1][1] : strlen($content);
+            $following = substr($content, $end, $next_start - $end);
+            
+            if (isset($inserts[$i])) {
+                foreach ($inserts[$i] as $inserted) {
+                    $pieces[] = $inserted . $separator;
+                }
+            }
+            if (!isset($deletions[$i])) {
+                $pieces[] = isset($replacements[$i]) ? $replacements[$i] : substr($content, $start, $end - $start);
+            }
+            if ($i + 1 === $count) {
+                if (isset($inserts[$count])) {
+                    foreach ($inserts[$count] as $inserted) {
+                        $pieces[] = $separator . $inserted;
+                    }
+                }
+                $pieces[] = $following;
+            } elseif (!isset($deletions[$i])) {
+                // 削除したブロックの後ろの区切りは除く
+                $pieces[] = $following;
+            }
+        }
+        
+        return implode('', $pieces);
+    }
+    
     // REST API: 記事取得エンドポイント
     public function rest_get_post(WP_REST_Request $request) {
         try {
@@ -1719,12 +1992,35 @@ class Blog_Generator_Plugin {
                 $post_data['featured_image_url'] = wp_get_attachment_url($featured_image_id);
             }
             
+            // 条件付きGET: ETag（応答データのハッシュ）/ Last-Modified が一致すれば本文を返さず304
+            $etag = '"' . md5(wp_json_encode($post_data)) . '"';
+            $modified_time = get_post_modified_time('U', true, $post);
+            $if_none_match = $request->get_header('if_none_match');
+            $if_modified_since = $request->get_header('if_modified_since');
+            
+            $not_modified = false;
+            if ($if_none_match !== null) {
+                // If-None-Match がある場合は If-Modified-Since より優先
+                $not_modified = in_array($etag, array_map('trim', explode(',', $if_none_match)), true);
+            } elseif ($if_modified_since !== null && $modified_time) {
+                $since = strtotime($if_modified_since);
+                $not_modified = ($since !== false && $modified_time <= $since);
+            }
+            
             $this->debug_log('Post retrieved successfully:', array(
                 'post_id' => $post_id,
-                'title' => $post->post_title
+                'title' => $post->post_title,
+                'not_modified' => $not_modified
             ));
             
-            return rest_ensure_response($post_data);
+            $response = $not_modified ? new WP_REST_Response(null, 304) : rest_ensure_response($post_data);
+            $response->header('ETag', $etag);
+            if ($modified_time) {
+                $response->header('Last-Modified', gmdate('D, d M Y H:i:s', $modified_time) . ' GMT');
+            }
+            $response->header('Cache-Control', 'private, no-cache');
+            
+            return $response;
             
         } catch (Exception $e) {
             $this->debug_log('Error in rest_get_post:', $e->getMessage());
@@ -1831,6 +2127,67 @@ class Blog_Generator_Plugin {
         }
     }
     
+    // REST API: 記事一覧エンドポイント（記事カタログの差分同期用）
+    public function rest_list_posts(WP_REST_Request $request) {
+        global $wpdb;
+        
+        try {
+            $per_page = min(100, max(1, intval($request->get_param('per_page')) ?: 100));
+            $modified_after = sanitize_text_field((string) $request->get_param('modified_after'));
+            $after_id = max(0, intval($request->get_param('after_id')));
+            $statuses = array('publish', 'draft', 'pending', 'private', 'future', 'trash');
+            
+            // (更新日時GMT, ID) のキーセットページング（同期中に記事が更新されても取りこぼさない）
+            $ids = $wpdb->get_col($wpdb->prepare(
+                "SELECT ID FROM {$wpdb->posts}
+                 WHERE post_type = 'post'
+                   AND post_status IN ('publish', 'draft', 'pending', 'private', 'future', 'trash')
+                   AND (post_modified_gmt > %s OR (post_modified_gmt = %s AND ID > %d))
+                 ORDER BY post_modified_gmt ASC, ID ASC
+                 LIMIT %d",
+                $modified_after, $modified_after, $after_id, $per_page + 1
+            ));
+            $has_more = count($ids) > $per_page;
+            $ids = array_map('intval', array_slice($ids, 0, $per_page));
+            
+            // 記事・メタデータをまとめて取得（post__in の順序 = 更新日時順）
+            $posts = $ids ? get_posts(array(
+                'post__in' => $ids,
+                'orderby' => 'post__in',
+                'post_type' => 'post',
+                'post_status' => $statuses,
+                'posts_per_page' => count($ids),
+                'suppress_filters' => true
+            )) : array();
+            
+            $results = array();
+            foreach ($posts as $post) {
+                $intent_ids = get_post_meta($post->ID, '_blog_generator_intent_ids', true);
+                $results[] = array(
+                    'id' => $post->ID,
+                    'title' => $post->post_title,
+                    'slug' => $post->post_name,
+                    'status' => $post->post_status,
+                    'modified' => $post->post_modified,
+                    'modified_gmt' => $post->post_modified_gmt,
+                    'featured_media' => (int) get_post_thumbnail_id($post->ID),
+                    'meta_description' => get_post_meta($post->ID, '_meta_description', true),
+                    'intent_ids' => $intent_ids ? explode(',', $intent_ids) : array(),
+                    'content' => $post->post_content
+                );
+            }
+            
+            return rest_ensure_response(array(
+                'posts' => $results,
+                'has_more' => $has_more
+            ));
+            
+        } catch (Exception $e) {
+            $this->debug_log('Error in rest_list_posts:', $e->getMessage());
+            return new WP_Error('list_failed', $e->getMessage(), array('status' => 500));
+        }
+    }
+    
     // REST API: 記事分析データ取得エンドポイント
     public function rest_get_analytics(WP_REST_Request $request) {
         try {
@@ -1,4 +1,4 @@
-#\!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 記事更新専用アルゴリズム - President0緊急戦略指示対応
 リライト専用3Phase構造による新規投稿レベル品質基準実装
@@ -6,7 +6,6 @@
 
 import os
 import json
-import requests
 from datetime import datetime
 import subprocess
 import logging
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress記事更新クライアント（asyncio版）
+WordPressUpdateClient と同じAPI・例外階層を持つ非同期クライアント
+httpx.AsyncClient の接続プールとセマフォで同時リクエスト数を制限し、
+一括更新・検索・分析データ取得・画像アップロードを大量に並行実行できる
+差分計算・ブロックパッチ作成・gzip圧縮・SQLite / ディスクキャッシュの読み書きは
+asyncio.to_thread で実行し、イベントループを止めない
+
+Usage:
+    async with AsyncWordPressUpdateClient(max_concurrency=16) as client:
+        posts = await asyncio.gather(*(client.get_post(post_id) for post_id in post_ids))
+"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union
+
+import httpx
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from scripts.wordpress_update_client import (
+    WordPressUpdateClientBase,
+    WordPressUpdateError,
+    PostNotFoundError
+)
+from utils.wordpress_session import get_wordpress_settings
+from utils.upload_registry import DEFAULT_REGISTRY_PATH, UploadRegistry
+
+
+class AsyncWordPressUpdateClient(WordPressUpdateClientBase):
+    """非同期WordPress記事更新クライアント（WordPressUpdateClient互換）"""
+
+    def __init__(self, integration_mode: bool = False, max_concurrency: Optional[int] = None,
+                 data_dir: Optional[Union[str, Path]] = None):
+        """
+        初期化
+
+        Args:
+            integration_mode: post_blog_universal.pyとの統合モード
+            max_concurrency: 同時リクエスト数の上限（Noneの場合は async_concurrency 設定値）
+            data_dir: 更新履歴DB・記事カタログ・アップロード台帳の保存先ディレクトリ（Noneの場合は outputs/）
+        """
+        super().__init__(integration_mode, data_dir)
+
+        settings = get_wordpress_settings()
+        self.max_concurrency = max_concurrency or settings['async_concurrency']
+        self.timeout = httpx.Timeout(settings['timeout'], connect=settings['connect_timeout'])
+        self.upload_timeout = httpx.Timeout(settings['upload_timeout'], connect=settings['connect_timeout'])
+        self.retry_attempts = settings['retry_attempts']
+
+        # アップロード重複排除（SHA-256 → 添付ファイル）
+        self.upload_registry = UploadRegistry(self._data_path(DEFAULT_REGISTRY_PATH)) if settings['upload_dedupe'] else None
+        self.verify_existing_uploads = settings['upload_dedupe_verify']
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # 並行送信時にプラグインのgzip対応確認（/usage）を1回だけ行う
+        self._negotiation_lock = asyncio.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """接続プール付きHTTPクライアント（初回使用時に生成）"""
+        if self._client is None:
+            # 接続確立前のエラーのみ再試行（同期版の共有セッションと同じ方針）
+            transport = httpx.AsyncHTTPTransport(
+                retries=self.retry_attempts,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+            self._client = httpx.AsyncClient(transport=transport, timeout=self.timeout)
+        return self._client
+
+    async def aclose(self):
+        """接続プールを閉じる"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """同時実行数を制限してリクエスト送信"""
+        async with self._semaphore:
+            return await self.client.request(method, url, **kwargs)
+
+    async def update_post(self,
+                          post_id: int,
+                          title: Optional[str] = None,
+                          content: Optional[str] = None,
+                          excerpt: Optional[str] = None,
+                          meta_description: Optional[str] = None,
+                          status: Optional[str] = None,
+                          featured_image_id: Optional[int] = None,
+                          backup: bool = True,
+                          diff_update: bool = True) -> Dict[str, Any]:
+        """
+        WordPress記事更新（WordPressUpdateClient.update_post と同じ処理）
+
+        Returns:
+            更新結果とメタデータ
+        """
+        print(f"🚀 WordPress記事更新開始 (ID: {post_id})")
+
+        # 1. 入力検証
+        if not isinstance(post_id, int) or post_id <= 0:
+            raise ValueError("有効な投稿IDを指定してください")
+
+        # 2. 既存記事の取得
+        current_post = await self._fetch_current_post(post_id) if diff_update or backup else None
+
+        # 3. バックアップ作成（オプション）
+        backup_result = await self._backup_current_post(post_id, current_post) if backup and current_post else None
+
+        # 4-5. 差分更新判定・更新データ構築（差分計算はスレッドで実行）
+        update_data = await asyncio.to_thread(
+            self._prepare_update_data,
+            current_post,
+            diff_update,
+            title=title,
+            content=content,
+            excerpt=excerpt,
+            meta_description=meta_description,
+            status=status,
+            featured_image_id=featured_image_id
+        )
+
+        # 6. API呼び出し実行
+        return await self._send_update(post_id, update_data, backup_result, current_post)
+
+    async def _fetch_current_post(self, post_id: int) -> Optional[Dict[str, Any]]:
+        """既存記事の取得（失敗時はNone）"""
+        try:
+            current_post = await self.get_post(post_id)
+            print(f"📖 既存記事取得完了: {current_post.get('title', 'Unknown')}")
+            return current_post
+        except Exception as e:
+            print(f"⚠️  既存記事取得失敗: {str(e)}")
+            return None
+
+    async def _backup_current_post(self, post_id: int, current_post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """バックアップ作成（失敗時はNone）"""
+        try:
+            backup_result = await self._create_backup(post_id, current_post)
+            print(f"📋 バックアップ作成完了: ID {backup_result.get('backup_id')}")
+            return backup_result
+        except Exception as e:
+            print(f"⚠️  バックアップ作成失敗: {str(e)}")
+            return None
+
+    async def _send_update(self, post_id: int, update_data: Dict[str, Any],
+                           backup_result: Optional[Dict[str, Any]],
+                           current_post: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        更新APIの呼び出し
+
+        差分更新は変更ブロックのみ patch-post に送信し、取得時点から記事が更新されていた場合は
+        UpdateConflictError（409）
+        """
+        try:
+            print(f"✏️  記事更新実行中... (戦略: {update_data['update_strategy']})")
+            print(f"   更新項目: {list(update_data.keys())}")
+
+            patch_data = await asyncio.to_thread(self._prepare_patch_data, current_post, update_data)
+            if patch_data is not None:
+                body, headers = await self._encode_json(patch_data)
+                response = await self._request(
+                    'POST',
+                    f"{self.endpoint}/patch-post/{post_id}",
+                    headers=headers,
+                    content=body
+                )
+                if response.status_code == 200:
+                    return await asyncio.to_thread(self._complete_update, post_id, update_data,
+                                                   response.json(), backup_result)
+                if not self._is_missing_route(response):
+                    self._handle_api_error(response)
+                print("⚠️  プラグインがブロックパッチ未対応のため全体送信に切り替え")
+                self.block_patch_supported = False
+
+            body, headers = await self._encode_json(update_data)
+            response = await self._request(
+                'POST',
+                f"{self.endpoint}/update-post/{post_id}",
+                headers=headers,
+                content=body
+            )
+
+            if response.status_code == 200:
+                return await asyncio.to_thread(self._complete_update, post_id, update_data,
+                                               response.json(), backup_result)
+            else:
+                self._handle_api_error(response)
+
+        except httpx.HTTPError as e:
+            error_msg = f"接続エラー: {str(e)}"
+            print(f"❌ {error_msg}")
+            raise WordPressUpdateError(error_msg)
+
+    async def _encode_json(self, data: Dict[str, Any]):
+        """JSON本文のエンコード（初回はプラグインのgzip対応を /usage で確認）"""
+        if self.body_encoder.needs_negotiation:
+            async with self._negotiation_lock:
+                if self.body_encoder.needs_negotiation:
+                    try:
+                        response = await self._request('GET', f"{self.endpoint}/usage", headers=self.headers)
+                        self.body_encoder.negotiate(response.json() if response.status_code == 200 else {})
+                    except (httpx.HTTPError, ValueError):
+                        pass
+        return await asyncio.to_thread(self.body_encoder.encode, data, self.headers)
+
+    async def get_post(self, post_id: int) -> Dict[str, Any]:
+        """記事データ取得（キャッシュ済みの記事は条件付きGETで再検証）"""
+        try:
+            headers, cached = await asyncio.to_thread(self.post_cache.conditional_headers,
+                                                      self.site, post_id, self.headers)
+            response = await self._request(
+                'GET',
+                f"{self.endpoint}/get-post/{post_id}",
+                headers=headers
+            )
+
+            post = await asyncio.to_thread(self.post_cache.resolve, self.site, post_id, response, cached)
+            if post is not None:
+                return post
+            elif response.status_code == 404:
+                raise PostNotFoundError(f"投稿ID {post_id} が見つかりません")
+            else:
+                raise WordPressUpdateError(f"記事取得エラー: {response.status_code}")
+
+        except httpx.HTTPError as e:
+            raise WordPressUpdateError(f"記事取得に失敗: {str(e)}")
+
+    async def batch_update_posts(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        複数記事の一括更新（並行実行、失敗した記事は他の記事の処理を妨げない）
+
+        Args:
+            updates: [{'post_id': int, ...update_postの引数}]（呼び出し側のdictは変更しない）
+
+        Returns:
+            入力順の [{'post_id', 'success', 'result' または 'error'/'stage', 'timings'}]
+            （WordPressUpdateClient.batch_update_posts と同じ形式）
+        """
+        print(f"🔄 バッチ更新開始: {len(updates)}件の記事（同時実行数 {self.max_concurrency}）")
+
+        async def update_one(update_config: Dict[str, Any]) -> Dict[str, Any]:
+            fields = dict(update_config)
+            post_id = fields.pop('post_id', None)
+            backup = fields.pop('backup', True)
+            diff_update = fields.pop('diff_update', True)
+            timings = {}
+            stage = 'validate'
+
+            async def timed(name, awaitable):
+                start = time.perf_counter()
+                try:
+                    return await awaitable
+                finally:
+                    timings[name] = round(time.perf_counter() - start, 4)
+
+            try:
+                if not isinstance(post_id, int) or post_id <= 0:
+                    raise ValueError("有効な投稿IDを指定してください")
+                unknown = set(fields) - set(self.UPDATE_FIELDS)
+                if unknown:
+                    raise TypeError(f"未対応の更新項目: {', '.join(sorted(unknown))}")
+
+                stage = 'fetch'
+                current_post = None
+                if diff_update or backup:
+                    current_post = await timed('fetch', self._fetch_current_post(post_id))
+
+                stage = 'backup'
+                backup_result = None
+                if backup and current_post:
+                    backup_result = await timed('backup', self._backup_current_post(post_id, current_post))
+
+                stage = 'diff'
+                diff_ratio = None
+                if diff_update and fields.get('content') and current_post:
+                    diff_ratio = await timed('diff', asyncio.to_thread(
+                        self._calculate_diff_ratio, current_post.get('content', ''), fields['content']))
+
+                stage = 'update'
+                update_data = await asyncio.to_thread(self._prepare_update_data, current_post, diff_update,
+                                                      diff_ratio=diff_ratio, **fields)
+                result = await timed('update', self._send_update(post_id, update_data, backup_result, current_post))
+                return {"post_id": post_id, "success": True, "result": result, "timings": timings}
+
+            except Exception as e:
+                error_msg = str(e)
+                print(f"❌ 記事ID {post_id} 更新失敗 ({stage}): {error_msg}")
+                return {"post_id": post_id, "success": False, "error": error_msg,
+                        "stage": stage, "timings": timings}
+
+        results = await asyncio.gather(*(update_one(update_config) for update_config in updates))
+
+        success_count = sum(1 for r in results if r["success"])
+        print(f"\n🎉 バッチ更新完了: {success_count}/{len(updates)} 件成功")
+
+        # 工程ごとの平均所要時間
+        for name in ('fetch', 'backup', 'diff', 'update'):
+            values = [r['timings'][name] for r in results if name in r['timings']]
+            if values:
+                print(f"   {name}: 平均 {sum(values) / len(values):.3f}秒 ({len(values)}件)")
+        self._print_cache_stats()
+
+        return list(results)
+
+    async def restore_from_backup(self, post_id: int, backup_id: str) -> Dict[str, Any]:
+        """バックアップからの復元"""
+        print(f"🔄 記事復元開始: ID {post_id}, バックアップ {backup_id}")
+
+        try:
+            response = await self._request(
+                'POST',
+                f"{self.endpoint}/restore-post/{post_id}",
+                headers=self.headers,
+                json={"backup_id": backup_id}
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                await asyncio.to_thread(self.post_cache.forget, self.site, post_id)
+                print(f"✅ 記事復元完了: {result.get('restored_time')}")
+                return result
+            else:
+                raise WordPressUpdateError(f"復元エラー: {response.status_code}")
+
+        except httpx.HTTPError as e:
+            raise WordPressUpdateError(f"復元失敗: {str(e)}")
+
+    async def _create_backup(self, post_id: int, current_post: Dict[str, Any]) -> Dict[str, Any]:
+        """記事のバックアップ作成"""
+        backup_data = {
+            "post_id": post_id,
+            "content": current_post,
+            "created_at": datetime.now().isoformat()
+        }
+
+        try:
+            body, headers = await self._encode_json(backup_data)
+            response = await self._request(
+                'POST',
+                f"{self.endpoint}/backup-post/{post_id}",
+                headers=headers,
+                content=body
+            )
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                raise WordPressUpdateError(f"バックアップ作成エラー: {response.status_code}")
+
+        except httpx.HTTPError as e:
+            raise WordPressUpdateError(f"バックアップ作成失敗: {str(e)}")
+
+    async def update_post_from_markdown(self, post_id: int, markdown_file: str,
+                                        image_dir: str = None, **kwargs) -> Dict[str, Any]:
+        """Markdownファイルから記事更新"""
+        # ファイル読み込み・変換（変換キャッシュ）・画像挿入はスレッドで実行
+        title, content = await asyncio.to_thread(self._read_markdown_update, markdown_file, image_dir)
+
+        return await self.update_post(
+            post_id=post_id,
+            title=title,
+            content=content,
+            **kwargs
+        )
+
+    async def search_posts_by_title(self, title: str, fuzzy: bool = True, local: bool = False) -> List[Dict[str, Any]]:
+        """タイトルによる記事検索（local: 同期済みの記事カタログから検索）"""
+        if local:
+            return await asyncio.to_thread(self.post_catalog.search_titles, self.site, title, fuzzy)
+
+        try:
+            # 同期版（requests）と同じく真偽値は "True"/"False" で送信
+            params = {'title': title, 'fuzzy': str(fuzzy)}
+            response = await self._request(
+                'GET',
+                f"{self.endpoint}/search-posts",
+                headers=self.headers,
+                params=params
+            )
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return []
+
+        except httpx.HTTPError:
+            return []
+
+    async def get_post_analytics(self, post_id: int, local: bool = False) -> Dict[str, Any]:
+        """記事分析データ取得（local: 同期済みの記事カタログから取得）"""
+        if local:
+            return await asyncio.to_thread(self.post_catalog.get_analytics, self.site, post_id)
+
+        try:
+            response = await self._request(
+                'GET',
+                f"{self.endpoint}/analytics/{post_id}",
+                headers=self.headers
+            )
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {}
+
+        except httpx.HTTPError:
+            return {}
+
+    async def attachment_exists(self, attachment_id: int) -> bool:
+        """メディアライブラリに添付ファイルが残っているか（確認できない場合はFalse）"""
+        try:
+            response = await self._request(
+                'GET',
+                f"{self.site}/wp-json/wp/v2/media/{attachment_id}",
+                params={'_fields': 'id'}
+            )
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def upload_image(self, image_path: str, alt_text: str = "") -> Optional[Dict[str, Any]]:
+        """
+        画像をWordPressにアップロード（WordPressClient.upload_image と同じ応答形式）
+
+        同じ内容（SHA-256）の画像がアップロード済みの場合は既存の添付ファイルを返す
+
+        Returns:
+            {'attachment_id', 'url'} または None
+        """
+        if not os.path.exists(image_path):
+            print(f"❌ 画像ファイルが見つかりません: {image_path}")
+            return None
+
+        image_data = await asyncio.to_thread(Path(image_path).read_bytes)
+
+        image_hash = None
+        if self.upload_registry:
+            image_hash = await asyncio.to_thread(UploadRegistry.hash_bytes, image_data)
+            existing = await asyncio.to_thread(self.upload_registry.lookup, image_hash, self.site)
+            if existing:
+                if not self.verify_existing_uploads or await self.attachment_exists(existing['attachment_id']):
+                    print(f"♻️  アップロード済みの画像を再利用 (ID: {existing['attachment_id']})")
+                    return {'attachment_id': existing['attachment_id'], 'url': existing['url']}
+                await asyncio.to_thread(self.upload_registry.forget, image_hash, self.site)
+
+        try:
+            print(f"📤 画像アップロード中: {os.path.basename(image_path)}")
+            response = await self._request(
+                'POST',
+                f"{self.endpoint}/upload-image",
+                headers={'X-API-Key': self.api_key},
+                files={'file': (os.path.basename(image_path), image_data, 'image/png')},
+                timeout=self.upload_timeout
+            )
+        except httpx.HTTPError as e:
+            print(f"❌ 画像アップロードエラー: {str(e)}")
+            return None
+
+        if response.status_code != 200:
+            print(f"❌ 画像アップロード失敗: {response.status_code}")
+            print(f"   エラー詳細: {response.text}")
+            return None
+
+        result = response.json()
+        # CozeのJSコードと同じレスポンス形式 / 従来のレスポンス形式
+        if 'source_url' in result and 'id' in result:
+            result = {'attachment_id': result['id'], 'url': result['source_url']}
+        elif 'attachment_id' not in result:
+            print(f"❌ 予期しないレスポンス形式: {result}")
+            return None
+
+        print(f"✅ 画像アップロード成功! ID: {result['attachment_id']}")
+        if image_hash:
+            await asyncio.to_thread(self.upload_registry.record, image_hash, self.site, result['attachment_id'],
+                                    result.get('url'), os.path.basename(image_path))
+        return result
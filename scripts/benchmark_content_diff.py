@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+記事差分ベンチマーク
+3万〜10万文字の日本語Gutenberg記事（見出し・段落・リスト）を合成し、
+記事全体への SequenceMatcher（旧実装）とブロック単位の diff_content の
+処理時間・変更率・差分/全体更新の判定（変更率30%未満で差分更新）を比較する
+
+旧実装は10万文字で数十秒かかるため、--legacy-max-chars を超えるサイズでは省略する
+
+Usage:
+    python scripts/benchmark_content_diff.py
+    python scripts/benchmark_content_diff.py --sizes 30000,60000,100000 --legacy-max-chars 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.content_diff import diff_content
+
+# update_post の差分更新判定しきい値
+DIFF_STRATEGY_THRESHOLD = 0.3
+
+WORDS = [
+    '生成AI', '業務効率化', '導入事例', 'データ分析', 'プロンプト', 'クラウド', 'セキュリティ',
+    '従業員', 'コスト削減', '自動化', 'を活用する', 'ことで', 'が重要です', 'について解説します',
+    'により', 'の課題', 'を実現する', '具体的には', '一方で', 'さらに', 'ため', '、'
+]
+
+
+def make_sentence(rng: random.Random) -> str:
+    return ''.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))) + '。'
+
+
+def make_paragraph(rng: random.Random) -> str:
+    text = ''.join(make_sentence(rng) for _ in range(rng.randint(3, 8)))
+    return f'<!-- wp:paragraph -->\n<p>{text}</p>\n<!-- /wp:paragraph -->'
+
+
+def make_post(size: int, seed: int = 0) -> List[str]:
+    """約 size 文字の記事（ブロックのリスト）を生成"""
+    rng = random.Random(seed)
+    blocks = []
+    total = 0
+    chapter = 0
+    while total < size:
+        if len(blocks) % 9 == 0:
+            chapter += 1
+            block = (f'<!-- wp:heading {{"level":2}} -->\n<h2>第{chapter}章 {make_sentence(rng)}</h2>\n'
+                     f'<!-- /wp:heading -->')
+        elif len(blocks) % 9 == 5:
+            items = ''.join(f'<li>{make_sentence(rng)}</li>' for _ in range(4))
+            block = f'<!-- wp:list -->\n<ul>{items}</ul>\n<!-- /wp:list -->'
+        else:
+            block = make_paragraph(rng)
+        blocks.append(block)
+        total += len(block)
+    return blocks
+
+
+def rewrite_paragraphs(share: float) -> Callable[[List[str], random.Random], List[str]]:
+    """段落の share 割合を書き換える編集"""
+    def edit(blocks: List[str], rng: random.Random) -> List[str]:
+        blocks = list(blocks)
+        paragraphs = [i for i, block in enumerate(blocks) if 'wp:paragraph' in block]
+        for i in rng.sample(paragraphs, max(1, int(len(paragraphs) * share))):
+            blocks[i] = make_paragraph(rng)
+        return blocks
+    return edit
+
+
+def fix_typo(blocks: List[str], rng: random.Random) -> List[str]:
+    """1段落の数文字を修正"""
+    blocks = list(blocks)
+    i = next(i for i, block in enumerate(blocks) if 'wp:paragraph' in block)
+    blocks[i] = blocks[i].replace('生成AI', '生成 AI', 1)
+    return blocks
+
+
+def insert_chapter(blocks: List[str], rng: random.Random) -> List[str]:
+    """記事中ほどに1章（見出し + 段落8個）を追加"""
+    middle = len(blocks) // 2
+    chapter = ['<!-- wp:heading {"level":2} -->\n<h2>追加章</h2>\n<!-- /wp:heading -->']
+    chapter += [make_paragraph(rng) for _ in range(8)]
+    return blocks[:middle] + chapter + blocks[middle:]
+
+
+SCENARIOS = [
+    ('typo fix', fix_typo),
+    ('chapter insert', insert_chapter),
+    ('10% rewrite', rewrite_paragraphs(0.10)),
+    ('50% rewrite', rewrite_paragraphs(0.50)),
+]
+
+
+def legacy_diff_ratio(old_content: str, new_content: str) -> float:
+    """旧実装（記事全体への SequenceMatcher）"""
+    return 1.0 - SequenceMatcher(None, old_content, new_content).ratio()
+
+
+def measure(func: Callable, *args) -> Dict[str, float]:
+    start = time.perf_counter()
+    value = func(*args)
+    return {"ms": (time.perf_counter() - start) * 1000, "value": value}
+
+
+def strategy(ratio: float) -> str:
+    return 'diff' if ratio < DIFF_STRATEGY_THRESHOLD else 'full'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Post content diff benchmark')
+    parser.add_argument('--sizes', default='30000,60000,100000', help='Comma-separated post sizes (characters)')
+    parser.add_argument('--legacy-max-chars', type=int, default=60000,
+                        help='Skip whole-post SequenceMatcher above this size')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print("📊 Content diff benchmark (whole-post SequenceMatcher vs block diff)")
+    print("="*96)
+    print(f"{'size':>8s}  {'scenario':16s} {'legacy ms':>10s} {'ratio':>7s}   {'block ms':>9s} {'ratio':>7s} "
+          f"{'changed':>8s}  strategy")
+
+    mismatches = 0
+    for size in sizes:
+        old_blocks = make_post(size)
+        old_content = '\n\n'.join(old_blocks)
+        for label, edit in SCENARIOS:
+            new_content = '\n\n'.join(edit(old_blocks, random.Random(size)))
+
+            block = measure(diff_content, old_content, new_content)
+            block_ratio = block['value']['ratio']
+            changed = len(block['value']['changed_blocks'])
+
+            if len(old_content) <= args.legacy_max_chars:
+                legacy = measure(legacy_diff_ratio, old_content, new_content)
+                legacy_ms, legacy_ratio = f"{legacy['ms']:10.1f}", f"{legacy['value']:7.3f}"
+                same = strategy(legacy['value']) == strategy(block_ratio)
+                mismatches += 0 if same else 1
+                decision = f"{strategy(block_ratio)} {'✅' if same else '❌ (legacy: ' + strategy(legacy['value']) + ')'}"
+            else:
+                legacy_ms, legacy_ratio = f"{'skipped':>10s}", f"{'-':>7s}"
+                decision = strategy(block_ratio)
+
+            print(f"{len(old_content):8d}  {label:16s} {legacy_ms} {legacy_ratio}   {block['ms']:9.1f} "
+                  f"{block_ratio:7.3f} {changed:8d}  {decision}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
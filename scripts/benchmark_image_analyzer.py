@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+ImageAnalyzer マイクロベンチマーク
+旧実装（list(img.getdata()) + Pythonレベルの合計）と
+NumPy版 extract_style_profile の処理時間を比較する
+
+Usage:
+    python scripts/benchmark_image_analyzer.py
+    python scripts/benchmark_image_analyzer.py --width 1536 --height 1024 --repeat 5 --batch 7
+"""
+
+import sys
+import time
+import argparse
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Any, Callable, List
+
+import numpy as np
+from PIL import Image
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from scripts.consolidated_image_manager import ImageAnalyzer
+
+
+def legacy_extract_style_profile(image_data: bytes) -> Dict[str, Any]:
+    """旧実装（比較用）"""
+    img = Image.open(BytesIO(image_data))
+    profile = {
+        "dimensions": img.size,
+        "format": img.format,
+        "mode": img.mode,
+        "file_size": len(image_data)
+    }
+    if img.mode == "RGB":
+        pixels = list(img.getdata())
+        avg_r = sum(p[0] for p in pixels) / len(pixels)
+        avg_g = sum(p[1] for p in pixels) / len(pixels)
+        avg_b = sum(p[2] for p in pixels) / len(pixels)
+        profile["average_color"] = {"r": int(avg_r), "g": int(avg_g), "b": int(avg_b)}
+        brightness = (avg_r * 0.299 + avg_g * 0.587 + avg_b * 0.114)
+        profile["brightness"] = brightness
+        profile["is_dark"] = brightness < 128
+    return profile
+
+
+def make_test_image(width: int, height: int, seed: int = 0) -> bytes:
+    """グラデーション＋ノイズの合成テスト画像（PNG）を生成"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    base = np.broadcast_to(gradient, (height, width, 3)) * np.array([1.0, 0.6, 0.3], dtype=np.float32)
+    noise = rng.normal(0, 25, (height, width, 3)).astype(np.float32)
+    array = np.clip(base + noise, 0, 255).astype(np.uint8)
+
+    output = BytesIO()
+    Image.fromarray(array, 'RGB').save(output, 'PNG')
+    return output.getvalue()
+
+
+def measure(func: Callable, repeat: int) -> float:
+    """最小実行時間（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ImageAnalyzer micro-benchmark')
+    parser.add_argument('--width', type=int, default=1536, help='Test image width')
+    parser.add_argument('--height', type=int, default=1024, help='Test image height')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best time is reported)')
+    parser.add_argument('--batch', type=int, default=7, help='Images per batch (eyecatch + 6 chapters)')
+    args = parser.parse_args()
+
+    analyzer = ImageAnalyzer()
+    image_data = make_test_image(args.width, args.height)
+    batch: List[bytes] = [make_test_image(args.width, args.height, seed) for seed in range(args.batch)]
+
+    print(f"📊 ImageAnalyzer benchmark ({args.width}×{args.height}, best of {args.repeat})")
+    print("="*50)
+
+    # 結果の一致確認
+    legacy = legacy_extract_style_profile(image_data)
+    current = analyzer.extract_style_profile(image_data)
+    assert legacy["average_color"] == current["average_color"], (legacy, current)
+    assert abs(legacy["brightness"] - current["brightness"]) < 1e-3, (legacy, current)
+
+    legacy_time = measure(lambda: legacy_extract_style_profile(image_data), args.repeat)
+    numpy_time = measure(lambda: analyzer.extract_style_profile(image_data), args.repeat)
+    print(f"Legacy (getdata + sum):   {legacy_time * 1000:9.1f} ms")
+    print(f"NumPy profile:            {numpy_time * 1000:9.1f} ms")
+    print(f"Speedup:                  {legacy_time / numpy_time:9.1f}x")
+
+    serial_time = measure(lambda: [legacy_extract_style_profile(d) for d in batch], 1)
+    batch_time = measure(lambda: analyzer.extract_style_profiles(batch), args.repeat)
+    print(f"\nBatch of {args.batch} (legacy serial): {serial_time * 1000:9.1f} ms")
+    print(f"Batch of {args.batch} (NumPy batch):   {batch_time * 1000:9.1f} ms")
+    print(f"Speedup:                      {serial_time / batch_time:9.1f}x")
+
+    print("\nProfile sample:")
+    print(f"   brightness={current['brightness']:.1f} contrast={current['contrast']:.1f} "
+          f"saturation={current['saturation']:.3f}")
+    print(f"   palette={[c['hex'] for c in current['dominant_colors']]}")
+
+
+if __name__ == '__main__':
+    main()
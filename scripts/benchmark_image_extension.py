@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+16:9拡張ベンチマーク
+旧パイプライン（1920×1080へ拡張 + 全面ブラー → 目標サイズへ縮小）と
+端の帯のみをブラーして目標サイズへ直接描画する extend_to_size の
+処理時間・ピークメモリを比較する
+
+ピークメモリは変種ごとに新しいプロセスで計測
+（Linuxでは /proc/self/clear_refs でピークRSSをリセットして増分を取得、それ以外は ru_maxrss の増分）
+
+Usage:
+    python scripts/benchmark_image_extension.py
+    python scripts/benchmark_image_extension.py --target 1024x576 --repeat 5
+"""
+
+import sys
+import time
+import resource
+import argparse
+import multiprocessing
+from pathlib import Path
+from typing import Tuple, Dict, Any
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.image_postprocess import extend_to_size, OPENAI_EYECATCH_SIZE
+
+
+def legacy_extend_image_to_16_9(image: Image.Image) -> Image.Image:
+    """旧実装（比較用）"""
+    current_width, current_height = image.size
+    target_width, target_height = 1920, 1080
+
+    extended_image = Image.new('RGB', (target_width, target_height), (0, 0, 0))
+    x_offset = (target_width - current_width) // 2
+    y_offset = (target_height - current_height) // 2
+    extended_image.paste(image, (x_offset, y_offset))
+
+    if x_offset > 0:
+        left_edge = image.crop((0, 0, 20, current_height))
+        left_blurred = left_edge.filter(ImageFilter.GaussianBlur(radius=3))
+        left_stretched = left_blurred.resize((x_offset, current_height))
+        extended_image.paste(left_stretched, (0, y_offset))
+
+        right_edge = image.crop((current_width-20, 0, current_width, current_height))
+        right_blurred = right_edge.filter(ImageFilter.GaussianBlur(radius=3))
+        right_stretched = right_blurred.resize((x_offset, current_height))
+        extended_image.paste(right_stretched, (x_offset + current_width, y_offset))
+
+    if y_offset > 0:
+        top_edge = extended_image.crop((0, y_offset, target_width, y_offset + 20))
+        top_blurred = top_edge.filter(ImageFilter.GaussianBlur(radius=5))
+        top_stretched = top_blurred.resize((target_width, y_offset))
+        extended_image.paste(top_stretched, (0, 0))
+
+        bottom_edge = extended_image.crop((0, y_offset + current_height - 20, target_width, y_offset + current_height))
+        bottom_blurred = bottom_edge.filter(ImageFilter.GaussianBlur(radius=5))
+        bottom_stretched = bottom_blurred.resize((target_width, y_offset))
+        extended_image.paste(bottom_stretched, (0, y_offset + current_height))
+
+    return extended_image.filter(ImageFilter.GaussianBlur(radius=0.5))
+
+
+def make_test_image(seed: int = 0) -> bytes:
+    """OpenAIアイキャッチ相当（1536×1024）の合成テスト画像（生RGBバイト）を生成"""
+    width, height = OPENAI_EYECATCH_SIZE
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    base = np.broadcast_to(gradient, (height, width, 3)) * np.array([0.3, 0.6, 1.0], dtype=np.float32)
+    noise = rng.normal(0, 20, (height, width, 3)).astype(np.float32)
+    return np.clip(base + noise, 0, 255).astype(np.uint8).tobytes()
+
+
+def _reset_peak_rss() -> int:
+    """ピークRSSをリセットし、基準値（KB）を返す"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _current_rss_kb('VmRSS')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_rss_kb() -> int:
+    """ピークRSS（KB）"""
+    try:
+        return _current_rss_kb('VmHWM')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _current_rss_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise OSError(f"{field} not available")
+
+
+def run_variant(variant: str, image_data: bytes, target_size: Tuple[int, int], repeat: int) -> Dict[str, Any]:
+    """ワーカープロセスで1変種を計測（デコード済み画像からの処理のみ）"""
+    # デコーダーのバッファでピークメモリの基準値が上がらないよう生RGBから構築
+    image = Image.frombytes('RGB', OPENAI_EYECATCH_SIZE, image_data)
+    baseline_kb = _reset_peak_rss()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if variant == 'legacy':
+            result = legacy_extend_image_to_16_9(image).resize(target_size, Image.Resampling.LANCZOS)
+        else:
+            result = extend_to_size(image, target_size, allow_upscale=True)
+        timings.append(time.perf_counter() - start)
+
+    peak_kb = _peak_rss_kb()
+    return {
+        "best_ms": min(timings) * 1000,
+        "peak_delta_mb": (peak_kb - baseline_kb) / 1024,
+        "size": result.size
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='16:9 extension benchmark')
+    parser.add_argument('--target', default='1024x576', help='Target dimensions WIDTHxHEIGHT')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions (best time is reported)')
+    args = parser.parse_args()
+
+    target_size = tuple(int(value) for value in args.target.lower().split('x'))
+    image_data = make_test_image()
+
+    print(f"📊 16:9 extension benchmark ({OPENAI_EYECATCH_SIZE[0]}×{OPENAI_EYECATCH_SIZE[1]} → "
+          f"{target_size[0]}×{target_size[1]}, best of {args.repeat})")
+    print("="*60)
+
+    # 変種ごとに新しいプロセスでピークメモリを分離
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for variant, label in (('legacy', 'Legacy (1920×1080 + full blur + resize)'),
+                           ('single_pass', 'Single pass (edge strips → target)')):
+        with context.Pool(1) as pool:
+            results[variant] = pool.apply(run_variant, (variant, image_data, target_size, args.repeat))
+        result = results[variant]
+        print(f"{label:42s} {result['best_ms']:8.1f} ms   peak +{result['peak_delta_mb']:6.1f} MB")
+
+    speedup = results['legacy']['best_ms'] / results['single_pass']['best_ms']
+    print(f"\nSpeedup: {speedup:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
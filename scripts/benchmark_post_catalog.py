@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+記事カタログベンチマーク
+ローカルのプラグインスタンドインに数千件の記事を用意し、記事カタログの全件同期・差分同期
+（一部の記事のみ更新）の所要時間とリクエスト数、および タイトル検索・分析のリモート / ローカル比較と
+キーワード・検索意図での絞り込み・リライト候補選定の所要時間を計測する
+
+Usage:
+    python scripts/benchmark_post_catalog.py
+    python scripts/benchmark_post_catalog.py --posts 5000 --latency-ms 80
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from scripts.wordpress_standin_server import DEFAULT_API_KEY, FaultConfig, start_standin_server
+
+TOPICS = ['AI', 'ブログ', 'SEO', '副業', 'Python', 'マーケティング', '画像生成', 'ライティング', '投資', '英語学習']
+FORMS = ['完全ガイド', '始め方', 'おすすめツール10選', 'よくある失敗と対策', '初心者向け入門', '最新トレンド']
+PARAGRAPHS = 30
+
+
+def make_post(index: int, rng: random.Random):
+    """(タイトル, 本文, 検索意図ID)"""
+    topic, other = rng.sample(TOPICS, 2)
+    title = f"{topic}と{other}の{rng.choice(FORMS)} {index}"
+    blocks = []
+    for i in range(PARAGRAPHS):
+        if i % 6 == 0:
+            blocks.append(f'<!-- wp:heading -->\n<h2>{topic}の基本 {i // 6 + 1}</h2>\n<!-- /wp:heading -->')
+        sentence = ''.join(rng.choice('あいうえおかきくけこさしすせそたちつてと') for _ in range(80))
+        blocks.append(f'<!-- wp:paragraph -->\n<p>{other}について。{sentence}。</p>\n<!-- /wp:paragraph -->')
+    return title, '\n\n'.join(blocks), [f"INT-{rng.randint(1, 5):02d}"]
+
+
+def timed_ms(func, *args, repeat: int = 20, **kwargs):
+    """平均所要時間（ミリ秒）と最後の戻り値"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000 / repeat, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Post catalog sync and local query benchmark')
+    parser.add_argument('--posts', type=int, default=2000, help='Posts on the stand-in site')
+    parser.add_argument('--changed', type=int, default=25, help='Posts modified before the incremental sync')
+    parser.add_argument('--latency-ms', type=float, default=40.0, help='Stand-in latency per request')
+    args = parser.parse_args()
+
+    server, endpoint = start_standin_server(faults=FaultConfig(latency_ms=args.latency_ms))
+    os.environ['WORDPRESS_ENDPOINT'] = endpoint
+    os.environ['WORDPRESS_API_KEY'] = DEFAULT_API_KEY
+
+    from scripts.wordpress_update_client import WordPressUpdateClient
+
+    rng = random.Random(0)
+    post_ids = []
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(args.posts):
+        title, content, intent_ids = make_post(index, rng)
+        post_id = server.state.add_post(title, content, status='publish', intent_ids=intent_ids)
+        # 既存記事の更新日時を過去に分散（1時間間隔）
+        server.state.posts[post_id]['modified_gmt'] = (created_at + timedelta(hours=index)).strftime('%Y-%m-%d %H:%M:%S')
+        post_ids.append(post_id)
+
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(open(os.devnull, 'w')) as quiet:
+        client = WordPressUpdateClient(data_dir=tmp)
+
+        full = client.sync_post_catalog()
+        idle = client.sync_post_catalog()
+        for post_id in rng.sample(post_ids, args.changed):
+            server.state.update_post(post_id, {'title': f"リライト済み記事 {post_id}"})
+        incremental = client.sync_post_catalog()
+
+        query = '副業と投資の始め方'
+        remote_search_ms, remote_hits = timed_ms(client.search_posts_by_title, query, repeat=5)
+        local_search_ms, local_hits = timed_ms(client.search_posts_by_title, query, local=True)
+        typo_ms, typo_hits = timed_ms(client.search_posts_by_title, '副業と投資の始めかた 12', local=True)
+        remote_analytics_ms, _ = timed_ms(client.get_post_analytics, post_ids[0], repeat=5)
+        local_analytics_ms, _ = timed_ms(client.get_post_analytics, post_ids[0], local=True)
+        keyword_ms, keyword_hits = timed_ms(client.post_catalog.find_posts, client.site, keyword='マーケティング', limit=None)
+        intent_ms, intent_hits = timed_ms(client.post_catalog.find_posts, client.site, intent_id='INT-03', limit=None)
+        rewrite_ms, candidates = timed_ms(client.post_catalog.select_rewrite_candidates, client.site,
+                                          max_characters=5000, intent_id='INT-03',
+                                          history_path=client.history_store.db_path)
+        quiet.close()
+
+    print(f"📊 Post catalog benchmark ({args.posts} posts, {args.latency_ms:.0f} ms stand-in latency)")
+    print("="*72)
+    print(f"full sync          {full['elapsed']:8.2f} s   {full['requests']:4d} requests  {full['fetched']} posts")
+    print(f"no-change sync     {idle['elapsed']:8.2f} s   {idle['requests']:4d} requests  {idle['fetched']} posts")
+    print(f"incremental sync   {incremental['elapsed']:8.2f} s   {incremental['requests']:4d} requests  "
+          f"{incremental['fetched']} posts ({args.changed} changed)")
+    print("-"*72)
+    print(f"title search       remote {remote_search_ms:7.1f} ms ({len(remote_hits)} hits)   "
+          f"local {local_search_ms:6.2f} ms ({len(local_hits)} hits)")
+    print(f"fuzzy title (typo) local  {typo_ms:7.2f} ms ({len(typo_hits)} hits, top: {typo_hits[0]['title'] if typo_hits else '-'})")
+    print(f"analytics          remote {remote_analytics_ms:7.1f} ms   local {local_analytics_ms:6.2f} ms")
+    print(f"keyword filter     local  {keyword_ms:7.2f} ms ({len(keyword_hits)} posts)")
+    print(f"intent filter      local  {intent_ms:7.2f} ms ({len(intent_hits)} posts with INT-03)")
+    print(f"rewrite candidates local  {rewrite_ms:7.2f} ms ({len(candidates)} candidates)")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
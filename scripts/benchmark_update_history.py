@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+更新履歴ストアベンチマーク
+一時DBに数万件の更新履歴（記事数百件・3万文字本文）を追記し、
+get_update_history 相当の検索（記事別・期間指定・全件の最新N件）の所要時間と
+本文をハッシュ化した場合のDBサイズを計測する
+
+Usage:
+    python scripts/benchmark_update_history.py
+    python scripts/benchmark_update_history.py --entries 50000 --posts 500
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.update_history import UpdateHistoryStore
+
+SITE = 'https://example.com'
+CONTENT_CHARS = 30000
+BATCH_SIZE = 1000
+
+
+def make_entries(count: int, posts: int, rng: random.Random):
+    """1分間隔の更新履歴エントリを生成"""
+    start = datetime(2025, 1, 1)
+    content = 'あ' * CONTENT_CHARS
+    for i in range(count):
+        post_id = rng.randint(1, posts)
+        yield {
+            "post_id": post_id,
+            "updated_at": (start + timedelta(minutes=i)).isoformat(),
+            "update_data": {"title": f"記事 {post_id}", "content": content,
+                            "update_strategy": rng.choice(['diff', 'full'])},
+            "result": {"post_id": post_id, "modified_time": "2025-01-01 00:00:00"},
+            "backup_id": f"backup_{i}"
+        }
+
+
+def timed_ms(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update history store benchmark')
+    parser.add_argument('--entries', type=int, default=30000, help='History entries to append')
+    parser.add_argument('--posts', type=int, default=300, help='Distinct post IDs')
+    parser.add_argument('--queries', type=int, default=200, help='Per-post lookups to time')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UpdateHistoryStore(Path(tmp) / 'update_history.db')
+
+        entries = list(make_entries(args.entries, args.posts, rng))
+        start = time.perf_counter()
+        for i in range(0, len(entries), BATCH_SIZE):
+            store.append(SITE, entries[i:i + BATCH_SIZE])
+        append_s = time.perf_counter() - start
+
+        db_size = sum(path.stat().st_size for path in Path(tmp).iterdir())
+        raw_size = args.entries * CONTENT_CHARS * 3
+
+        print(f"📊 Update history benchmark ({args.entries} entries, {args.posts} posts)")
+        print("="*72)
+        print(f"append            {append_s:8.2f} s total ({append_s / args.entries * 1e6:.0f} µs/entry)")
+        print(f"db size           {db_size / 1024 / 1024:8.2f} MB (full content would be "
+              f"{raw_size / 1024 / 1024:.0f} MB)")
+
+        post_ms = []
+        for _ in range(args.queries):
+            ms, history = timed_ms(store.get_history, SITE, rng.randint(1, args.posts))
+            post_ms.append(ms)
+        post_ms.sort()
+        print(f"by post_id        mean {sum(post_ms) / len(post_ms):6.2f} ms  "
+              f"p95 {post_ms[int(len(post_ms) * 0.95) - 1]:6.2f} ms  (~{len(history)} entries each)")
+
+        since = entries[-len(entries) // 100]['updated_at']
+        ms, history = timed_ms(store.get_history, SITE, since=since)
+        print(f"since (last 1%)   {ms:11.2f} ms  ({len(history)} entries)")
+
+        ms, history = timed_ms(store.get_history, SITE, limit=100)
+        print(f"latest 100        {ms:11.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
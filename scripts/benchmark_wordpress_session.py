@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+WordPress HTTPセッションベンチマーク
+ローカルのスタンドインサーバー（keep-alive対応、opensslがあればTLSも）に対して
+記事1件分のリクエスト（create-post 1回 + 章画像アップロード6回 + usage 1回）を繰り返し、
+素の requests.get/post と共有セッション（utils.wordpress_session）の
+リクエストあたりレイテンシ・新規接続数を比較する
+
+Usage:
+    python scripts/benchmark_wordpress_session.py
+    python scripts/benchmark_wordpress_session.py --posts 20 --workers 4 --no-tls
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+CHAPTER_IMAGES = 6
+IMAGE_BYTES = 64 * 1024
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """blog-generator プラグインAPIのスタンドイン（固定レスポンス）"""
+
+    protocol_version = 'HTTP/1.1'
+    # 本番サーバー（nginx tcp_nodelay 等）と同様に、keep-alive接続での遅延ACK待ちを避ける
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({'today_count': 0, 'total_count': 0})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.endswith('/upload-image'):
+            self._reply({'attachment_id': 1, 'url': 'http://localhost/image.jpg'})
+        else:
+            self._reply({'post_id': 1})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(cert_dir=None):
+    """スタンドインサーバーを起動し (server, base_url) を返す"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.stats_lock = threading.Lock()
+    scheme = 'http'
+    if cert_dir:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_dir / 'cert.pem', cert_dir / 'key.pem')
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://localhost:{server.server_address[1]}/wp-json/blog-generator/v1"
+
+
+def make_certificate(cert_dir: Path) -> bool:
+    """自己署名証明書を生成（opensslがない場合はFalse）"""
+    if not shutil.which('openssl'):
+        return False
+    result = subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost',
+         '-keyout', str(cert_dir / 'key.pem'), '-out', str(cert_dir / 'cert.pem')],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return result.returncode == 0
+
+
+def post_requests(http, endpoint: str, verify):
+    """記事1件分のリクエストを送信し、各リクエストの所要時間（秒）を返す"""
+    headers = {'X-API-Key': 'benchmark'}
+    image = os.urandom(IMAGE_BYTES)
+    timings = []
+
+    def timed(method, url, **kwargs):
+        start = time.perf_counter()
+        response = method(url, headers=headers, verify=verify, timeout=(10, 30), **kwargs)
+        response.raise_for_status()
+        timings.append(time.perf_counter() - start)
+
+    for i in range(CHAPTER_IMAGES):
+        timed(http.post, f"{endpoint}/upload-image",
+              files={'file': (f'chapter{i + 1}.jpg', image, 'image/jpeg')})
+    timed(http.post, f"{endpoint}/create-post", json={'title': 'benchmark', 'content': 'x' * 4096})
+    timed(http.get, f"{endpoint}/usage")
+    return timings
+
+
+def run_variant(http, server, endpoint: str, verify, posts: int, workers: int):
+    """指定クライアントで posts 件分を workers 並列で送信"""
+    server.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda _: post_requests(http, endpoint, verify), range(posts)))
+    elapsed = time.perf_counter() - start
+    timings = [t for post_timings in results for t in post_timings]
+    return {
+        "requests": len(timings),
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1] * 1000,
+        "total_s": elapsed,
+        "connections": server.connections
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WordPress HTTP session benchmark')
+    parser.add_argument('--posts', type=int, default=10, help='Posts to simulate per variant')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent posts')
+    parser.add_argument('--no-tls', action='store_true', help='Skip the TLS stand-in server')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_dir = Path(tmp)
+        modes = [('HTTP', None)]
+        if not args.no_tls and make_certificate(cert_dir):
+            modes.append(('TLS', cert_dir))
+
+        for label, mode_cert_dir in modes:
+            server, endpoint = start_server(mode_cert_dir)
+            verify = str(mode_cert_dir / 'cert.pem') if mode_cert_dir else True
+
+            # 共有セッションの設定はスタンドインのエンドポイントで読み込む
+            os.environ['WORDPRESS_ENDPOINT'] = endpoint
+            os.environ['WORDPRESS_API_KEY'] = 'benchmark'
+            from utils.wordpress_session import get_wordpress_session, close_wordpress_session
+
+            print(f"📊 WordPress session benchmark ({label}, {args.posts} posts × "
+                  f"{CHAPTER_IMAGES + 2} requests, {args.workers} workers)")
+            print("="*72)
+
+            results = {}
+            for variant, http in (('bare', requests), ('session', get_wordpress_session())):
+                results[variant] = result = run_variant(http, server, endpoint, verify,
+                                                        args.posts, args.workers)
+                print(f"{variant:8s} mean {result['mean_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                      f"total {result['total_s']:6.2f} s  connections {result['connections']:4d}"
+                      f"/{result['requests']}")
+
+            speedup = results['bare']['mean_ms'] / results['session']['mean_ms']
+            print(f"\nPer-request latency: {speedup:.1f}x faster with pooled session\n")
+
+            close_wordpress_session()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
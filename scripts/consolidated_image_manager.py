@@ -14,6 +14,7 @@
     # 新規画像生成
     python consolidated_image_manager.py generate --outline path/to/outline.md --mode eyecatch
     python consolidated_image_manager.py generate --outline path/to/outline.md --mode all
+    python consolidated_image_manager.py generate --outline path/to/outline.md --mode all --max-concurrency 4
     
     # WordPress画像更新
     python consolidated_image_manager.py update --post-id 1234 --type eyecatch
@@ -22,122 +23,308 @@
     # 簡単更新（後方互換性）
     python consolidated_image_manager.py quick-update 1234
     
+    # 複数記事の一括更新（結果JSONを --ids-file に渡すと失敗分のみ再実行）
+    python consolidated_image_manager.py update-batch 1234 1235 1236:2 --max-concurrency 4
+    python consolidated_image_manager.py update-batch --ids-file post_ids.txt --results outputs/batch.json
+    
     # バージョン管理
     python consolidated_image_manager.py version --post-id 1234 --action history
     python consolidated_image_manager.py version --post-id 1234 --action restore --version-id VERSION_ID
+    python consolidated_image_manager.py version --action gc
 """
 
 import os
 import sys
 import argparse
 import json
-import hashlib
 import re
 import base64
-import requests
+import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Union, TYPE_CHECKING
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
-from google import genai
-from google.genai import types
-from openai import OpenAI
-from PIL import Image, ImageFilter, ImageDraw
+from PIL import Image
 from dotenv import load_dotenv
-import numpy as np
+
+# google.genai / openai / numpy / requests は使用時にimport（CLI起動時間短縮のため）
+if TYPE_CHECKING:
+    import numpy as np
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from utils.output_manager import OutputManager
+from utils.image_concurrency import (
+    ProviderConcurrencyLimiter, generate_images_concurrently, refresh_images_concurrently,
+    get_concurrency_settings
+)
+from utils.prompt_cache import PromptCache
+from utils.chapter_prompt_batch import build_batch_request, parse_batch_response
+from utils.image_result_cache import ImageResultCache
+from utils.post_cache import PostCache
+from utils.image_postprocess import (
+    ImagePostProcessor, optimize_image_bytes, prepare_png_bytes,
+    extend_image_to_16_9 as blur_extend_to_16_9
+)
+from utils.image_blob_store import ImageBlobStore
+from utils.upload_registry import UploadRegistry, site_from_endpoint
+from utils.provider_clients import (
+    ProviderClients, require_credentials,
+    GOOGLE_API_KEY, OPENAI_API_KEY, WORDPRESS_API_KEY, WORDPRESS_ENDPOINT
+)
 
 # 環境変数読み込み
 load_dotenv()
 
 
 class ImageVersionManager:
-    """画像バージョン管理システム"""
+    """
+    画像バージョン管理システム（SQLite WALストア）
+    
+    (post_id, image_type) と version_id にインデックスを持ち、複数プロセスからの
+    同時書き込みはSQLiteのロック（BEGIN IMMEDIATE + busy timeout）で直列化する
+    画像バイトはブロブストア（SHA-256キー）に保存し、復元時に再生成せず再利用する
+    """
     
-    def __init__(self, base_dir: str = "outputs"):
+    DB_FILENAME = "image_versions.db"
+    BLOB_DIRNAME = "image_blobs"
+    LEGACY_JSON_FILENAME = "image_version_db.json"
+    DEFAULT_RETENTION = 10
+    BUSY_TIMEOUT_SECONDS = 30
+    
+    def __init__(self, base_dir: Union[str, Path] = project_root / 'outputs',
+                 retention: Optional[int] = DEFAULT_RETENTION,
+                 blob_store: Optional[ImageBlobStore] = None):
+        """
+        初期化
+        
+        Args:
+            base_dir: データベース配置ディレクトリ（既定はプロジェクトルートの outputs/、実行ディレクトリに依存しない）
+            retention: (post_id, image_type) ごとの保持件数（None/0で無制限）
+            blob_store: 画像ブロブストア（Noneの場合は base_dir/image_blobs）
+        """
         self.base_dir = Path(base_dir)
-        self.version_db = {}
-        self._load_version_database()
+        self.retention = retention
+        self.db_path = self.base_dir / self.DB_FILENAME
+        self.blob_store = blob_store or ImageBlobStore(self.base_dir / self.BLOB_DIRNAME)
+        self._initialize_database()
+        self._migrate_legacy_json()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """接続を作成（スレッド・プロセス間で共有せず操作ごとに使用）"""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """書き込みトランザクション（開始時に書き込みロックを取得）"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _initialize_database(self):
+        """スキーマ作成・WALモード設定"""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS image_versions (
+                    version_id TEXT PRIMARY KEY,
+                    post_id INTEGER NOT NULL,
+                    image_type TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    image_hash TEXT NOT NULL,
+                    metadata TEXT NOT NULL DEFAULT '{}',
+                    blob_sha256 TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_image_versions_post_type
+                    ON image_versions (post_id, image_type, created_at);
+                CREATE TABLE IF NOT EXISTS schema_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+            
+            # ブロブ参照列がない既存DBに列を追加
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(image_versions)")}
+            if "blob_sha256" not in columns:
+                try:
+                    conn.execute("ALTER TABLE image_versions ADD COLUMN blob_sha256 TEXT")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column" not in str(e):  # 他プロセスが先に追加済み
+                        raise
+        finally:
+            conn.close()
+    
+    def _migrate_legacy_json(self):
+        """旧 image_version_db.json の内容を一度だけ取り込み"""
+        json_file = self.base_dir / self.LEGACY_JSON_FILENAME
+        if not json_file.exists():
+            return
+        
+        try:
+            with self._transaction() as conn:
+                migrated = conn.execute(
+                    "SELECT value FROM schema_meta WHERE key = 'legacy_json_migrated'"
+                ).fetchone()
+                if migrated:
+                    return
+                
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    legacy_db = json.load(f)
+                
+                # JSONのキーは再読み込み後に文字列化されているためpost_idは値から復元
+                count = 0
+                for post_key, image_types in legacy_db.items():
+                    for image_type, versions in image_types.items():
+                        for version in versions:
+                            conn.execute(
+                                "INSERT OR IGNORE INTO image_versions "
+                                "(version_id, post_id, image_type, created_at, file_size, image_hash, metadata) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (
+                                    version["version_id"],
+                                    int(version.get("post_id", post_key)),
+                                    version.get("image_type", image_type),
+                                    version.get("created_at", ""),
+                                    version.get("file_size", 0),
+                                    version.get("image_hash", ""),
+                                    json.dumps(version.get("metadata", {}), ensure_ascii=False)
+                                )
+                            )
+                            count += 1
+                
+                conn.execute(
+                    "INSERT INTO schema_meta (key, value) VALUES ('legacy_json_migrated', ?)",
+                    (datetime.now().isoformat(),)
+                )
+            print(f"📦 バージョンDB移行: {json_file.name} から {count}件")
+        except Exception as e:
+            print(f"⚠️  バージョンDB移行失敗: {e}")
     
     def create_image_version(self, post_id: int, image_type: str, 
                            image_data: bytes, metadata: Dict[str, Any]) -> str:
         """新しい画像バージョンを作成"""
         
-        # 画像ハッシュ生成
-        image_hash = hashlib.sha256(image_data).hexdigest()[:16]
+        # 画像バイトをブロブストアに保存（同一内容は重複保存しない）
+        blob_sha256 = self.blob_store.put(image_data)
+        image_hash = blob_sha256[:16]
         
         # バージョンID生成
         version_id = f"{post_id}_{image_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{image_hash}"
         
-        # バージョン情報記録
-        version_info = {
-            "version_id": version_id,
-            "post_id": post_id,
-            "image_type": image_type,
-            "created_at": datetime.now().isoformat(),
-            "file_size": len(image_data),
-            "image_hash": image_hash,
-            "metadata": metadata
-        }
-        
-        # データベース更新
-        if post_id not in self.version_db:
-            self.version_db[post_id] = {}
-        
-        if image_type not in self.version_db[post_id]:
-            self.version_db[post_id][image_type] = []
-        
-        self.version_db[post_id][image_type].append(version_info)
-        
-        # バージョン履歴の制限（最新10件まで）
-        if len(self.version_db[post_id][image_type]) > 10:
-            self.version_db[post_id][image_type] = self.version_db[post_id][image_type][-10:]
-        
-        self._save_version_database()
+        # バージョン情報記録・保持件数を超えた古いバージョンを削除
+        with self._transaction() as conn:
+            # 同一秒・同一内容のバージョン（復元直後など）はIDに連番を付与
+            base_version_id = version_id
+            suffix = 1
+            while conn.execute(
+                "SELECT 1 FROM image_versions WHERE version_id = ?", (version_id,)
+            ).fetchone():
+                suffix += 1
+                version_id = f"{base_version_id}_{suffix}"
+            
+            conn.execute(
+                "INSERT INTO image_versions "
+                "(version_id, post_id, image_type, created_at, file_size, image_hash, metadata, blob_sha256) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (version_id, int(post_id), image_type, datetime.now().isoformat(),
+                 len(image_data), image_hash, json.dumps(metadata, ensure_ascii=False), blob_sha256)
+            )
+            if self.retention:
+                conn.execute(
+                    "DELETE FROM image_versions WHERE post_id = ? AND image_type = ? AND version_id NOT IN ("
+                    "SELECT version_id FROM image_versions WHERE post_id = ? AND image_type = ? "
+                    "ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+                    (int(post_id), image_type, int(post_id), image_type, self.retention)
+                )
         
         print(f"📸 画像バージョン作成: {version_id}")
         return version_id
     
     def get_image_history(self, post_id: int, image_type: str) -> List[Dict[str, Any]]:
-        """画像の更新履歴取得"""
-        return self.version_db.get(post_id, {}).get(image_type, [])
+        """画像の更新履歴取得（古い順）"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM image_versions WHERE post_id = ? AND image_type = ? "
+                "ORDER BY created_at, rowid",
+                (int(post_id), image_type)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_version(row) for row in rows]
+    
+    def get_post_history(self, post_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """記事の全画像タイプの更新履歴取得"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM image_versions WHERE post_id = ? ORDER BY image_type, created_at, rowid",
+                (int(post_id),)
+            ).fetchall()
+        finally:
+            conn.close()
+        
+        history: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            history.setdefault(row["image_type"], []).append(self._row_to_version(row))
+        return history
     
     def restore_image_version(self, version_id: str) -> Optional[Dict[str, Any]]:
         """指定バージョンの画像情報取得"""
-        for post_id, image_types in self.version_db.items():
-            for image_type, versions in image_types.items():
-                for version in versions:
-                    if version["version_id"] == version_id:
-                        return version
-        return None
-    
-    def _load_version_database(self):
-        """バージョンデータベース読み込み"""
-        db_file = self.base_dir / "image_version_db.json"
-        if db_file.exists():
-            try:
-                with open(db_file, 'r', encoding='utf-8') as f:
-                    self.version_db = json.load(f)
-            except Exception as e:
-                print(f"⚠️  バージョンDB読み込み失敗: {e}")
-                self.version_db = {}
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM image_versions WHERE version_id = ?", (version_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_version(row) if row else None
     
-    def _save_version_database(self):
-        """バージョンデータベース保存"""
-        db_file = self.base_dir / "image_version_db.json"
-        db_file.parent.mkdir(parents=True, exist_ok=True)
-        
+    def get_image_bytes(self, version_info: Dict[str, Any]) -> Optional[bytes]:
+        """バージョンの画像バイトをブロブストアから取得（旧バージョン等でブロブがない場合はNone）"""
+        blob_sha256 = version_info.get("blob_sha256")
+        if not blob_sha256:
+            return None
+        return self.blob_store.get(blob_sha256)
+    
+    def collect_garbage(self) -> Dict[str, int]:
+        """どのバージョンからも参照されていないブロブを削除"""
+        conn = self._connect()
         try:
-            with open(db_file, 'w', encoding='utf-8') as f:
-                json.dump(self.version_db, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"⚠️  バージョンDB保存失敗: {e}")
+            referenced = {
+                row["blob_sha256"] for row in conn.execute(
+                    "SELECT DISTINCT blob_sha256 FROM image_versions WHERE blob_sha256 IS NOT NULL"
+                )
+            }
+        finally:
+            conn.close()
+        return self.blob_store.collect_garbage(referenced)
+    
+    @staticmethod
+    def _row_to_version(row: sqlite3.Row) -> Dict[str, Any]:
+        """DB行を従来のバージョン情報形式に変換"""
+        version = dict(row)
+        version["metadata"] = json.loads(version["metadata"] or "{}")
+        return version
 
 
 class ImageAnalyzer:
@@ -179,8 +366,13 @@ class ImageAnalyzer:
         except Exception as e:
             return {"error": str(e), "compatibility_score": 0.0}
     
+    # 輝度ヒストグラムのビン数・パレット量子化ビット数・パレット色数
+    HISTOGRAM_BINS = 16
+    PALETTE_QUANT_BITS = 3
+    PALETTE_SIZE = 5
+    
     def extract_style_profile(self, image_data: bytes) -> Dict[str, Any]:
-        """画像スタイルプロファイル抽出"""
+        """画像スタイルプロファイル抽出（NumPy配列での一括計算）"""
         
         try:
             img = Image.open(BytesIO(image_data))
@@ -193,69 +385,204 @@ class ImageAnalyzer:
                 "file_size": len(image_data)
             }
             
-            # 色彩分析（RGB画像の場合）
-            if img.mode == "RGB":
-                # 平均色計算
-                pixels = list(img.getdata())
-                avg_r = sum(p[0] for p in pixels) / len(pixels)
-                avg_g = sum(p[1] for p in pixels) / len(pixels)
-                avg_b = sum(p[2] for p in pixels) / len(pixels)
-                
-                profile["average_color"] = {
-                    "r": int(avg_r),
-                    "g": int(avg_g), 
-                    "b": int(avg_b)
-                }
-                
-                # 明度計算
-                brightness = (avg_r * 0.299 + avg_g * 0.587 + avg_b * 0.114)
-                profile["brightness"] = brightness
-                profile["is_dark"] = brightness < 128
+            # 色彩分析（RGB以外はRGBに変換して分析）
+            import numpy as np
+            rgb_img = img if img.mode == "RGB" else img.convert("RGB")
+            pixels = np.asarray(rgb_img, dtype=np.uint8).reshape(-1, 3)
+            profile.update(self._analyze_pixels(pixels))
             
             return profile
             
         except Exception as e:
             return {"error": str(e)}
+    
+    def extract_style_profiles(self, images: List[bytes], max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        複数画像のスタイルプロファイルを一括抽出（記事のメディア全体を1回で分析）
+        
+        Args:
+            images: 画像バイトのリスト
+            max_workers: 並列スレッド数（デコード・NumPy演算はGILを解放する）
+        
+        Returns:
+            入力順のプロファイルリスト
+        """
+        if len(images) <= 1 or max_workers <= 1:
+            return [self.extract_style_profile(image_data) for image_data in images]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(images))) as executor:
+            return list(executor.map(self.extract_style_profile, images))
+    
+    def _analyze_pixels(self, pixels: 'np.ndarray') -> Dict[str, Any]:
+        """(N, 3) uint8画素配列から色彩・輝度・コントラスト・彩度・パレットを計算"""
+        import numpy as np
+        if pixels.size == 0:
+            return {}
+        
+        # チャンネル別の連続配列（列ごとのストライドアクセスを避ける）
+        red, green, blue = np.ascontiguousarray(pixels.T)
+        pixel_count = red.size
+        
+        # 平均色計算
+        avg_r, avg_g, avg_b = (channel.sum(dtype=np.uint64) / pixel_count for channel in (red, green, blue))
+        
+        # 明度（輝度）計算
+        luminance = np.float32(0.299) * red + np.float32(0.587) * green + np.float32(0.114) * blue
+        brightness = float(luminance.mean(dtype=np.float64))
+        bin_index = np.minimum((luminance * (self.HISTOGRAM_BINS / 256)).astype(np.intp), self.HISTOGRAM_BINS - 1)
+        histogram = np.bincount(bin_index, minlength=self.HISTOGRAM_BINS)
+        
+        # 彩度（HSVのS成分平均）
+        channel_max = np.maximum(np.maximum(red, green), blue)
+        channel_min = np.minimum(np.minimum(red, green), blue)
+        saturation = np.divide((channel_max - channel_min).astype(np.float32), channel_max,
+                               out=np.zeros(pixel_count, dtype=np.float32), where=channel_max > 0)
+        
+        return {
+            "average_color": {
+                "r": int(avg_r),
+                "g": int(avg_g),
+                "b": int(avg_b)
+            },
+            "brightness": brightness,
+            "is_dark": brightness < 128,
+            "luminance_histogram": (histogram / pixel_count).round(4).tolist(),
+            "contrast": float(luminance.std(dtype=np.float64)),
+            "saturation": float(saturation.mean(dtype=np.float64)),
+            "dominant_colors": self._dominant_colors((red, green, blue), pixel_count)
+        }
+    
+    def _dominant_colors(self, channels: Tuple['np.ndarray', 'np.ndarray', 'np.ndarray'],
+                         pixel_count: int) -> List[Dict[str, Any]]:
+        """量子化ヒストグラムによる主要色パレット抽出（k-means不使用）"""
+        import numpy as np
+        bits = self.PALETTE_QUANT_BITS
+        shift = 8 - bits
+        red, green, blue = ((channel >> shift).astype(np.intp) for channel in channels)
+        bins = (red << (2 * bits)) | (green << bits) | blue
+        
+        counts = np.bincount(bins, minlength=1 << (3 * bits))
+        top_bins = np.argsort(counts)[::-1][:self.PALETTE_SIZE]
+        top_bins = top_bins[counts[top_bins] > 0]
+        
+        palette = []
+        for bin_index in top_bins:
+            # 代表色はビン内画素の平均色
+            mask = bins == bin_index
+            count = counts[bin_index]
+            r, g, b = (int(channel[mask].sum(dtype=np.uint64) / count) for channel in channels)
+            palette.append({
+                "r": r,
+                "g": g,
+                "b": b,
+                "hex": f"#{r:02x}{g:02x}{b:02x}",
+                "ratio": round(float(count / pixel_count), 4)
+            })
+        return palette
 
 
 class ConsolidatedImageManager:
     """統合画像管理システム"""
     
-    def __init__(self):
-        """初期化"""
+    def __init__(self, use_prompt_cache: bool = True, force_fresh_images: bool = False):
+        """
+        初期化
+        
+        Args:
+            use_prompt_cache: Geminiプロンプト生成キャッシュの使用有無（--no-prompt-cache でFalse）
+            force_fresh_images: 生成画像キャッシュを参照せず常に新規生成（--force-fresh）
+        """
         # 画像設定を読み込み
         self.load_image_settings()
         
-        # API設定
-        self.google_api_key = os.getenv('GOOGLE_API_KEY')
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.wordpress_api_key = os.getenv('WORDPRESS_API_KEY')
-        self.wordpress_endpoint = os.getenv('WORDPRESS_ENDPOINT')
-        
-        if not self.google_api_key:
-            raise ValueError("GOOGLE_API_KEY not found in .env file")
-        if not self.openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in .env file")
-        if not self.wordpress_api_key:
-            raise ValueError("WORDPRESS_API_KEY not found in .env file")
-        if not self.wordpress_endpoint:
-            raise ValueError("WORDPRESS_ENDPOINT not found in .env file")
-        
-        # クライアント初期化
-        self.google_client = genai.Client(api_key=self.google_api_key)
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        # API設定（必須項目はサブコマンドごとに main で検証）
+        self.google_api_key = os.getenv(GOOGLE_API_KEY)
+        self.openai_api_key = os.getenv(OPENAI_API_KEY)
+        self.wordpress_api_key = os.getenv(WORDPRESS_API_KEY)
+        self.wordpress_endpoint = os.getenv(WORDPRESS_ENDPOINT)
+        
+        # クライアントは初回使用時に生成
+        self.clients = ProviderClients(self.google_api_key, self.openai_api_key)
+        
+        # アップロード重複排除（WordPress設定を読むため初回アップロード時に生成）
+        self._upload_registry = None
+        self.verify_existing_uploads = True
+        
+        # get-post の記事キャッシュ（同上、初回取得時に生成）
+        self._post_cache = None
         
         self.imagen_model = 'imagen-3.0-generate-002'
         self.openai_image_model = 'gpt-image-1'
+        self.gemini_text_model = 'gemini-2.0-flash-exp'
+        
+        # Geminiプロンプト生成キャッシュ
+        self.prompt_cache = PromptCache.from_settings(self.image_settings, enabled=use_prompt_cache)
+        
+        # 生成画像キャッシュ（同一プロンプト・モデル・サイズの再生成を回避）
+        self.image_cache = ImageResultCache.from_settings(self.image_settings)
+        self.force_fresh_images = force_fresh_images
+        
+        # CPU処理（リサイズ・エンコード）用ポストプロセスプール
+        self.postprocessor = ImagePostProcessor.from_settings(self.image_settings)
+        
+        # プロバイダー別同時実行数制限
+        concurrency = get_concurrency_settings(self.image_settings)
+        self.provider_limiter = ProviderConcurrencyLimiter(concurrency['provider_limits'])
         
         # 管理システム初期化
         self.output_manager = OutputManager()
-        self.version_manager = ImageVersionManager()
+        version_settings = self.image_settings.get('version_history', {})
+        self.version_manager = ImageVersionManager(
+            retention=version_settings.get('retention', ImageVersionManager.DEFAULT_RETENTION)
+        )
         self.analyzer = ImageAnalyzer()
         
         # 後方互換性のため
         self.outputs_dir = Path('outputs')
         self.outputs_dir.mkdir(exist_ok=True)
+        
+        # 生成後の工程で失敗した画像差し替え（再実行時は保存済みの画像から再開）
+        self.pending_refresh_path = self.outputs_dir / 'image_refresh_pending.json'
+        self._pending_refresh_lock = threading.Lock()
+    
+    @property
+    def google_client(self):
+        """Google GenAI クライアント（初回使用時に生成）"""
+        return self.clients.google
+    
+    @property
+    def openai_client(self):
+        """OpenAI クライアント（初回使用時に生成）"""
+        return self.clients.openai
+    
+    @property
+    def wordpress_session(self):
+        """WordPress共有HTTPセッション（requestsのimportを初回使用時まで遅延）"""
+        from utils.wordpress_session import get_wordpress_session
+        return get_wordpress_session()
+    
+    def wordpress_timeout(self, upload: bool = False):
+        """WordPress API呼び出しのタイムアウト（接続, 読み取り）"""
+        from utils.wordpress_session import wordpress_timeout
+        return wordpress_timeout(upload=upload)
+    
+    @property
+    def upload_registry(self) -> Optional[UploadRegistry]:
+        """アップロード重複排除レジストリ（無効化されている場合はNone）"""
+        if self._upload_registry is None:
+            from utils.wordpress_session import get_wordpress_settings
+            settings = get_wordpress_settings()
+            self._upload_registry = UploadRegistry() if settings['upload_dedupe'] else False
+            self.verify_existing_uploads = settings['upload_dedupe_verify']
+        return self._upload_registry or None
+    
+    @property
+    def post_cache(self) -> PostCache:
+        """WordPress記事キャッシュ（ETag / Last-Modified で再検証）"""
+        if self._post_cache is None:
+            from utils.wordpress_session import get_wordpress_settings
+            self._post_cache = PostCache.from_settings(get_wordpress_settings())
+        return self._post_cache
     
     def load_image_settings(self):
         """画像設定ファイルを読み込み"""
@@ -272,6 +599,7 @@ class ConsolidatedImageManager:
                         "enabled": True,
                         "target_max_size_kb": 500,
                         "target_dimensions": {"width": 1200, "height": 675},
+                        "aspect_fit": "extend",
                         "jpeg_quality": 85
                     }
                 },
@@ -286,66 +614,30 @@ class ConsolidatedImageManager:
             }
     
     def optimize_image(self, image_data: bytes, image_type: str = 'eyecatch') -> bytes:
-        """画像を最適化してファイルサイズを削減"""
+        """画像を最適化してファイルサイズを削減（ポストプロセスプールで実行）"""
         try:
             settings = self.image_settings.get(image_type, {}).get('optimization', {})
             
             if not settings.get('enabled', True):
                 return image_data
             
-            # PIL Imageで読み込み
-            image = Image.open(BytesIO(image_data))
+            # RGB変換・リサイズ・目標サイズJPEGエンコードをワーカープロセスで実行
+            output_data, info = self.postprocessor.run(optimize_image_bytes, image_data, settings)
+            if info.get('extended'):
+                width, height = info['dimensions']
+                print(f"📐 Extended {info['original_size'][0]}×{info['original_size'][1]} to {width}×{height} with edge blur padding")
             
-            # RGBA -> RGBに変換（JPEG保存のため）
-            if image.mode in ('RGBA', 'LA'):
-                # 白背景で合成
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'RGBA':
-                    background.paste(image, mask=image.split()[3])  # アルファチャンネルをマスクとして使用
-                else:
-                    background.paste(image)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # 目標サイズにリサイズ
-            target_dims = settings.get('target_dimensions', {})
-            if target_dims.get('width') and target_dims.get('height'):
-                target_size = (target_dims['width'], target_dims['height'])
-                image = image.resize(target_size, Image.Resampling.LANCZOS)
-            
-            # JPEG品質を段階的に調整してファイルサイズを最適化
-            target_size_kb = settings.get('target_max_size_kb', 500)
-            base_quality = settings.get('jpeg_quality', 85)
-            
-            for quality in range(base_quality, 50, -5):  # 85から50まで5刻みで下げる
-                output = BytesIO()
-                save_kwargs = {
-                    'format': 'JPEG',
-                    'quality': quality,
-                    'optimize': True,
-                    'progressive': True
-                }
-                image.save(output, **save_kwargs)
-                
-                output_size_kb = output.tell() / 1024
-                print(f"   Quality {quality}: {output_size_kb:.1f}KB")
-                
-                if output_size_kb <= target_size_kb:
-                    print(f"✅ Optimized to {output_size_kb:.1f}KB (quality: {quality})")
-                    return output.getvalue()
-            
-            # 最低品質でも目標サイズを超える場合は最低品質で保存
-            output = BytesIO()
-            image.save(output, format='JPEG', quality=50, optimize=True)
-            final_size_kb = output.tell() / 1024
-            print(f"⚠️  Final size: {final_size_kb:.1f}KB (minimum quality)")
-            return output.getvalue()
+            if info['within_target']:
+                print(f"✅ Optimized to {info['size_kb']:.1f}KB (quality: {info['quality']}, "
+                      f"full encodes: {info['full_encodes']}, trial encodes: {info['trial_encodes']})")
+            else:
+                print(f"⚠️  Final size: {info['size_kb']:.1f}KB (minimum quality, full encodes: {info['full_encodes']})")
+            return output_data
             
         except Exception as e:
             print(f"❌ Image optimization failed: {e}")
             return image_data  # 最適化に失敗した場合は元の画像を返す
-    
+        
     def load_outline(self, outline_path: str) -> Dict:
         """アウトラインファイルを読み込み"""
         try:
@@ -415,12 +707,21 @@ class ConsolidatedImageManager:
                 chapter_number = chapter_match.group(1) if chapter_match else '1'
                 content = content.replace('{{chapter_number}}', chapter_number)
             
+            # キャッシュチェック（テンプレート・アウトライン・対象章・モデルが同一なら再利用）
+            cache_key = PromptCache.make_key(template, outline_data['content'], target_chapter, self.gemini_text_model)
+            cached_text = self.prompt_cache.get_text(cache_key)
+            if cached_text is not None:
+                print(f"♻️  Prompt cache hit: {template_path.name}" + (f" ({target_chapter[:30]})" if target_chapter else ""))
+                return cached_text
+            
             # Gemini Text APIでプロンプト生成を実行
             try:
                 response = self.google_client.models.generate_content(
-                    model='gemini-2.0-flash-exp',
+                    model=self.gemini_text_model,
                     contents=content
                 )
+                if response.text:
+                    self.prompt_cache.set_text(cache_key, response.text)
                 return response.text
             except Exception as e:
                 print(f"Warning: Gemini text generation failed: {e}")
@@ -431,6 +732,68 @@ class ConsolidatedImageManager:
             print(f"Error generating prompt: {e}")
             return None
     
+    def generate_chapter_prompts(self, outline_data: Dict, chapters: List[str]) -> Dict[int, str]:
+        """
+        全章のサムネイル用プロンプトをGemini 1回の呼び出しで一括生成（アウトラインは1回だけ送信）
+        
+        キャッシュ済みの章は再利用し、一括応答から欠落・不正な章は結果に含めない
+        （generate_thumbnail が章ごとの生成にフォールバック）
+        
+        Returns:
+            {章番号(1始まり): Gemini生成テキスト}
+        """
+        if not chapters or not self.image_settings.get('prompt_batch', {}).get('enabled', True):
+            return {}
+        
+        try:
+            with open(project_root / 'templates' / 'thumbnail.md', 'r', encoding='utf-8') as f:
+                template = f.read()
+        except OSError as e:
+            print(f"Warning: Could not load thumbnail template: {e}")
+            return {}
+        
+        # キャッシュ済みの章を除外（キーは章ごとの生成と共通）
+        outline_content = outline_data['content']
+        prompts = {}
+        pending = []
+        for i, chapter in enumerate(chapters, 1):
+            cache_key = PromptCache.make_key(template, outline_content, chapter, self.gemini_text_model)
+            cached_text = self.prompt_cache.get_text(cache_key)
+            if cached_text is not None:
+                prompts[i] = cached_text
+            else:
+                pending.append((i, chapter, cache_key))
+        
+        if prompts:
+            print(f"♻️  Prompt cache hit: {len(prompts)}/{len(chapters)} chapters")
+        if len(pending) < 2:
+            # 1章以下は章ごとの生成と往復回数が変わらない
+            return prompts
+        
+        print(f"🧩 Generating {len(pending)} chapter prompts in one Gemini call...")
+        request = build_batch_request(template, outline_content, [chapter for _, chapter, _ in pending])
+        try:
+            from google.genai import types
+            response = self.google_client.models.generate_content(
+                model=self.gemini_text_model,
+                contents=request,
+                config=types.GenerateContentConfig(response_mime_type='application/json')
+            )
+            batch = parse_batch_response(response.text, len(pending))
+        except Exception as e:
+            print(f"Warning: Batched prompt generation failed: {e}")
+            batch = {}
+        
+        for position, (i, _, cache_key) in enumerate(pending, 1):
+            if position in batch:
+                prompts[i] = batch[position]
+                self.prompt_cache.set_text(cache_key, batch[position])
+        
+        missing = len(pending) - len(batch)
+        if missing:
+            print(f"⚠️  {missing} chapter prompt(s) missing from batched response, falling back to per-chapter calls")
+        return prompts
+    
     def extract_yaml_and_convert_to_prompt(self, generated_text: str) -> str:
         """生成されたテキストからYAML設定を抽出してImagen 3用プロンプトに変換"""
         try:
@@ -613,23 +976,36 @@ class ConsolidatedImageManager:
         
         return extracted_prompt
     
-    def generate_image_openai(self, prompt: str) -> Optional[bytes]:
+    def generate_image_openai(self, prompt: str, force_fresh: Optional[bool] = None) -> Optional[bytes]:
         """OpenAI gpt-image-1でアイキャッチ画像生成（日本語テキスト対応）"""
         try:
+            size = "1536x1024"  # gpt-image-1の横長サイズ
+            
+            # 生成画像キャッシュチェック
+            cache_key = ImageResultCache.make_key('openai', self.openai_image_model, prompt, size)
+            if not (self.force_fresh_images if force_fresh is None else force_fresh):
+                cached_image = self.image_cache.get_bytes(cache_key)
+                if cached_image is not None:
+                    print(f"♻️  Reusing cached OpenAI image ({len(cached_image) / 1024:.1f}KB): {prompt[:60]}...")
+                    return cached_image
+            
             print(f"🎨 Generating eyecatch with OpenAI: {prompt[:100]}...")
             
-            response = self.openai_client.images.generate(
-                model=self.openai_image_model,
-                prompt=prompt,
-                size="1536x1024",  # gpt-image-1の横長サイズ
-                quality="high",
-                n=1
-            )
+            with self.provider_limiter.limit('openai'):
+                response = self.openai_client.images.generate(
+                    model=self.openai_image_model,
+                    prompt=prompt,
+                    size=size,
+                    quality="high",
+                    n=1
+                )
             
             # base64データを取得（gpt-image-1はbase64を返す）
             if response.data and len(response.data) > 0:
                 image_base64 = response.data[0].b64_json
-                return base64.b64decode(image_base64)
+                image_bytes = base64.b64decode(image_base64)
+                self.image_cache.set_bytes(cache_key, image_bytes)
+                return image_bytes
             else:
                 print("No images generated by OpenAI")
                 return None
@@ -638,26 +1014,40 @@ class ConsolidatedImageManager:
             print(f"Error generating image with OpenAI: {e}")
             return None
     
-    def generate_image_imagen(self, prompt: str) -> Optional[bytes]:
+    def generate_image_imagen(self, prompt: str, force_fresh: Optional[bool] = None) -> Optional[bytes]:
         """Imagen 3でサムネイル画像生成（テキストなし）"""
         try:
+            aspect_ratio = "16:9"  # ブログ用の比率
+            
+            # 生成画像キャッシュチェック
+            cache_key = ImageResultCache.make_key('imagen', self.imagen_model, prompt, aspect_ratio)
+            if not (self.force_fresh_images if force_fresh is None else force_fresh):
+                cached_image = self.image_cache.get_bytes(cache_key)
+                if cached_image is not None:
+                    print(f"♻️  Reusing cached Imagen image ({len(cached_image) / 1024:.1f}KB): {prompt[:60]}...")
+                    return cached_image
+            
             print(f"🎨 Generating thumbnail with Imagen 3: {prompt[:100]}...")
             
-            response = self.google_client.models.generate_images(
-                model=self.imagen_model,
-                prompt=prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                    aspect_ratio="16:9",  # ブログ用の比率
-                    safety_filter_level="block_low_and_above",
-                    person_generation="allow_adult"
+            from google.genai import types
+            with self.provider_limiter.limit('imagen'):
+                response = self.google_client.models.generate_images(
+                    model=self.imagen_model,
+                    prompt=prompt,
+                    config=types.GenerateImagesConfig(
+                        number_of_images=1,
+                        aspect_ratio=aspect_ratio,
+                        safety_filter_level="block_low_and_above",
+                        person_generation="allow_adult"
+                    )
                 )
-            )
             
             # 最初の画像を取得
             if response.generated_images:
                 generated_image = response.generated_images[0]
-                return generated_image.image.image_bytes
+                image_bytes = generated_image.image.image_bytes
+                self.image_cache.set_bytes(cache_key, image_bytes)
+                return image_bytes
             else:
                 print("No images generated by Imagen 3")
                 return None
@@ -669,50 +1059,10 @@ class ConsolidatedImageManager:
     def extend_image_to_16_9(self, image: Image.Image) -> Image.Image:
         """1536×1024の画像を16:9（1920×1080）に拡張（ブラー延長）"""
         try:
-            # 現在のサイズと目標サイズ
             current_width, current_height = image.size
-            target_width, target_height = 1920, 1080
-            
-            print(f"📐 Extending image from {current_width}×{current_height} to {target_width}×{target_height}")
+            print(f"📐 Extending image from {current_width}×{current_height} to 1920×1080")
             
-            # 新しいキャンバス作成
-            extended_image = Image.new('RGB', (target_width, target_height), (0, 0, 0))
-            
-            # 元画像を中央に配置
-            x_offset = (target_width - current_width) // 2
-            y_offset = (target_height - current_height) // 2
-            extended_image.paste(image, (x_offset, y_offset))
-            
-            # 左右の拡張（ブラー）
-            if x_offset > 0:
-                # 左端を拡張
-                left_edge = image.crop((0, 0, 20, current_height))  # 左端20px
-                left_blurred = left_edge.filter(ImageFilter.GaussianBlur(radius=3))
-                left_stretched = left_blurred.resize((x_offset, current_height))
-                extended_image.paste(left_stretched, (0, y_offset))
-                
-                # 右端を拡張
-                right_edge = image.crop((current_width-20, 0, current_width, current_height))  # 右端20px
-                right_blurred = right_edge.filter(ImageFilter.GaussianBlur(radius=3))
-                right_stretched = right_blurred.resize((x_offset, current_height))
-                extended_image.paste(right_stretched, (x_offset + current_width, y_offset))
-            
-            # 上下の拡張（ブラー）
-            if y_offset > 0:
-                # 上端を拡張（全幅で）
-                top_edge = extended_image.crop((0, y_offset, target_width, y_offset + 20))  # 上端20px
-                top_blurred = top_edge.filter(ImageFilter.GaussianBlur(radius=5))
-                top_stretched = top_blurred.resize((target_width, y_offset))
-                extended_image.paste(top_stretched, (0, 0))
-                
-                # 下端を拡張（全幅で）
-                bottom_edge = extended_image.crop((0, y_offset + current_height - 20, target_width, y_offset + current_height))  # 下端20px
-                bottom_blurred = bottom_edge.filter(ImageFilter.GaussianBlur(radius=5))
-                bottom_stretched = bottom_blurred.resize((target_width, y_offset))
-                extended_image.paste(bottom_stretched, (0, y_offset + current_height))
-            
-            # 角の部分をさらにブラーで自然に
-            extended_image = extended_image.filter(ImageFilter.GaussianBlur(radius=0.5))
+            extended_image = blur_extend_to_16_9(image)
             
             print("✅ Image extended to 16:9 with blur padding")
             return extended_image
@@ -728,6 +1078,7 @@ class ConsolidatedImageManager:
             try:
                 image = Image.open(BytesIO(image_data))
                 is_optimized_jpeg = image.format == 'JPEG'
+                image_size = image.size
             except:
                 is_optimized_jpeg = False
             
@@ -740,36 +1091,24 @@ class ConsolidatedImageManager:
                     with open(filepath, 'wb') as f:
                         f.write(image_data)
             else:
-                # PNG画像の場合は従来の処理
-                image = Image.open(BytesIO(image_data))
-                original_size = image.size
-                
-                # アイキャッチ画像（1536×1024）の場合は16:9に拡張
-                if original_size == (1536, 1024):
-                    print(f"🎨 Detected OpenAI eyecatch image, extending to 16:9...")
-                    image = self.extend_image_to_16_9(image)
-                
-                # Web最適化
-                if image.size[0] > 1920:  # 幅が1920pxより大きい場合リサイズ
-                    ratio = 1920 / image.size[0]
-                    new_size = (1920, int(image.size[1] * ratio))
-                    image = image.resize(new_size, Image.Resampling.LANCZOS)
+                # PNG画像の場合は16:9拡張・リサイズ・PNG最適化をワーカープロセスで実行
+                png_data, info = self.postprocessor.run(prepare_png_bytes, image_data)
+                image_size = info['dimensions']
+                if info['extended']:
+                    print(f"🎨 Detected OpenAI eyecatch image, extended to 16:9")
                 
                 # 保存処理
                 if metadata:
                     # 新しい自動分類システムを使用
-                    img_bytes = BytesIO()
-                    image.save(img_bytes, 'PNG', optimize=True)
-                    img_bytes.seek(0)
-                    
-                    filepath = self.output_manager.save_binary(img_bytes.getvalue(), metadata, file_type, chapter)
+                    filepath = self.output_manager.save_binary(png_data, metadata, file_type, chapter)
                 else:
                     # 従来の方法（後方互換性）
                     filepath = self.outputs_dir / filename
-                    image.save(filepath, 'PNG', optimize=True)
+                    with open(filepath, 'wb') as f:
+                        f.write(png_data)
                 filepath = str(filepath)
             
-            print(f"✅ Image saved: {filepath} ({image.size[0]}x{image.size[1]})")
+            print(f"✅ Image saved: {filepath} ({image_size[0]}x{image_size[1]})")
             return filepath
             
         except Exception as e:
@@ -815,12 +1154,14 @@ class ConsolidatedImageManager:
         }
         return self.save_image(image_data, '', metadata, 'eyecatch')
     
-    def generate_thumbnail(self, outline_data: Dict, chapter: str, chapter_num: int) -> Optional[str]:
-        """サムネイル画像生成（Imagen 3使用、テキストなし）"""
+    def generate_thumbnail(self, outline_data: Dict, chapter: str, chapter_num: int,
+                           prompt_text: Optional[str] = None) -> Optional[str]:
+        """サムネイル画像生成（Imagen 3使用、テキストなし。prompt_text は一括生成済みのGemini出力）"""
         print(f"🖼️  Generating thumbnail for chapter {chapter_num}: {chapter[:50]}...")
         
-        # プロンプト生成
-        prompt_text = self.generate_prompt_with_gemini('thumbnail.md', outline_data, chapter)
+        # プロンプト生成（一括生成で得られなかった章は個別に生成）
+        if prompt_text is None:
+            prompt_text = self.generate_prompt_with_gemini('thumbnail.md', outline_data, chapter)
         if not prompt_text:
             return None
         
@@ -852,8 +1193,14 @@ class ConsolidatedImageManager:
         }
         return self.save_image(image_data, '', metadata, 'thumbnail', chapter_num)
     
-    def generate_all_images(self, outline_path: str) -> Dict:
-        """全画像生成"""
+    def generate_all_images(self, outline_path: str, max_concurrency: Optional[int] = None) -> Dict:
+        """
+        全画像生成
+        
+        Args:
+            outline_path: アウトラインファイルのパス
+            max_concurrency: 並列ワーカー数（Noneの場合はimage_settings.jsonの値、1で逐次実行）
+        """
         results = {
             'eyecatch': None,
             'thumbnails': [],
@@ -870,6 +1217,11 @@ class ConsolidatedImageManager:
         chapters = self.extract_chapters(outline_data['content'])
         print(f"📚 Found {len(chapters)} chapters")
         
+        # 並列モード
+        max_workers = get_concurrency_settings(self.image_settings, max_concurrency)['max_workers']
+        if max_workers > 1:
+            return generate_images_concurrently(self, outline_data, chapters, max_workers)
+        
         # アイキャッチ生成
         print("\n" + "="*50)
         print("EYECATCH GENERATION")
@@ -890,9 +1242,10 @@ class ConsolidatedImageManager:
         print("\n" + "="*50)
         print("THUMBNAIL GENERATION")
         print("="*50)
+        chapter_prompts = self.generate_chapter_prompts(outline_data, chapters)
         for i, chapter in enumerate(chapters, 1):
             try:
-                thumbnail_path = self.generate_thumbnail(outline_data, chapter, i)
+                thumbnail_path = self.generate_thumbnail(outline_data, chapter, i, chapter_prompts.get(i))
                 if thumbnail_path:
                     results['thumbnails'].append(thumbnail_path)
                     print(f"✅ Chapter {i} completed: {thumbnail_path}")
@@ -908,21 +1261,25 @@ class ConsolidatedImageManager:
     # ==== WordPress画像更新機能 ====
     
     def get_wordpress_post(self, post_id: int) -> Optional[Dict]:
-        """WordPress記事情報を取得"""
+        """WordPress記事情報を取得（キャッシュ済みの記事は条件付きGETで再検証）"""
         try:
             headers = {
                 'X-API-Key': self.wordpress_api_key,
                 'Content-Type': 'application/json'
             }
+            site = site_from_endpoint(self.wordpress_endpoint)
+            headers, cached = self.post_cache.conditional_headers(site, post_id, headers)
+            
+            with self.provider_limiter.limit('wordpress'):
+                response = self.wordpress_session.get(
+                    f'{self.wordpress_endpoint}/get-post/{post_id}',
+                    headers=headers,
+                    timeout=self.wordpress_timeout()
+                )
             
-            response = requests.get(
-                f'{self.wordpress_endpoint}/get-post/{post_id}',
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return response.json()
+            post = self.post_cache.resolve(site, post_id, response, cached)
+            if post is not None:
+                return post
             else:
                 print(f"❌ Failed to get post {post_id}: {response.status_code}")
                 return None
@@ -932,25 +1289,41 @@ class ConsolidatedImageManager:
             return None
     
     def upload_image_to_wordpress(self, image_data: bytes, filename: str) -> Optional[int]:
-        """WordPress メディアライブラリに画像をアップロード"""
+        """WordPress メディアライブラリに画像をアップロード（同じ内容の画像はアップロード済みのIDを再利用）"""
         try:
+            registry = self.upload_registry
+            image_hash = None
+            site = site_from_endpoint(self.wordpress_endpoint)
+            if registry:
+                image_hash = UploadRegistry.hash_bytes(image_data)
+                existing = registry.lookup(
+                    image_hash, site,
+                    exists=self.wordpress_attachment_exists if self.verify_existing_uploads else None
+                )
+                if existing:
+                    print(f"♻️  Reusing uploaded image: ID {existing['attachment_id']}")
+                    return existing['attachment_id']
+            
             headers = {'X-API-Key': self.wordpress_api_key}
             
             files = {
                 'file': (filename, BytesIO(image_data), 'image/jpeg')
             }
             
-            response = requests.post(
-                f'{self.wordpress_endpoint}/upload-image',
-                headers=headers,
-                files=files,
-                timeout=60
-            )
+            with self.provider_limiter.limit('wordpress'):
+                response = self.wordpress_session.post(
+                    f'{self.wordpress_endpoint}/upload-image',
+                    headers=headers,
+                    files=files,
+                    timeout=self.wordpress_timeout(upload=True)
+                )
             
             if response.status_code == 200:
                 result = response.json()
                 attachment_id = result.get('attachment_id')
                 print(f"📤 Upload successful: ID {attachment_id}")
+                if image_hash and attachment_id:
+                    registry.record(image_hash, site, attachment_id, result.get('url'), filename)
                 return attachment_id
             else:
                 print(f"❌ Upload failed: {response.text}")
@@ -960,6 +1333,19 @@ class ConsolidatedImageManager:
             print(f"❌ Upload error: {e}")
             return None
     
+    def wordpress_attachment_exists(self, attachment_id: int) -> bool:
+        """WordPressメディアライブラリに添付ファイルが残っているか"""
+        try:
+            base_url = self.wordpress_endpoint.replace('/wp-json/blog-generator/v1', '')
+            with self.provider_limiter.limit('wordpress'):
+                response = self.wordpress_session.get(f'{base_url}/wp-json/wp/v2/media/{attachment_id}',
+                                                      params={'_fields': 'id'},
+                                                      timeout=self.wordpress_timeout())
+            return response.status_code == 200
+        except Exception as e:
+            print(f"⚠️  Attachment check failed: {e}")
+            return False
+    
     def update_wordpress_featured_image(self, post_id: int, attachment_id: int) -> bool:
         """WordPressの記事のアイキャッチ画像を更新"""
         try:
@@ -970,12 +1356,13 @@ class ConsolidatedImageManager:
             
             update_data = {'featured_image_id': attachment_id}
             
-            response = requests.post(
-                f'{self.wordpress_endpoint}/update-post/{post_id}',
-                headers=headers,
-                json=update_data,
-                timeout=30
-            )
+            with self.provider_limiter.limit('wordpress'):
+                response = self.wordpress_session.post(
+                    f'{self.wordpress_endpoint}/update-post/{post_id}',
+                    headers=headers,
+                    json=update_data,
+                    timeout=self.wordpress_timeout()
+                )
             
             if response.status_code == 200:
                 print("🔄 Featured image updated successfully!")
@@ -990,151 +1377,264 @@ class ConsolidatedImageManager:
     
     def update_eyecatch_wordpress(self, post_id: int, custom_prompt: Optional[str] = None) -> bool:
         """WordPressのアイキャッチ画像を更新"""
-        print(f"🚀 Updating eyecatch for post {post_id}")
-        
-        # 1. 記事情報取得
-        post_data = self.get_wordpress_post(post_id)
-        if not post_data:
-            return False
-        
-        title = post_data.get('title', '')
-        print(f"📖 Post title: {title}")
-        
-        # 2. 画像生成
-        if custom_prompt:
-            prompt = custom_prompt
-        else:
-            prompt = f'Modern professional digital illustration for blog article titled "{title}". Clean tech design with blue/purple gradient background. Japanese text "{title}" prominently displayed. High-quality contemporary style.'
-        
-        print("🎨 Generating image with gpt-image-1...")
-        image_data = self.generate_image_openai(prompt)
-        if not image_data:
-            return False
-        
-        # 3. 画像最適化
-        print("📦 Optimizing image...")
-        original_size_kb = len(image_data) / 1024
-        print(f"   Original size: {original_size_kb:.1f}KB")
-        
-        optimized_data = self.optimize_image(image_data, 'eyecatch')
-        optimized_size_kb = len(optimized_data) / 1024
-        print(f"   Final size: {optimized_size_kb:.1f}KB ({(1-optimized_size_kb/original_size_kb)*100:.1f}% reduction)")
-        
-        # 4. ローカル保存
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'eyecatch_{post_id}_{timestamp}.jpg'
-        local_path = self.outputs_dir / filename
+        return self.refresh_post_image(post_id, 'eyecatch', custom_prompt=custom_prompt)['status'] == 'success'
+    
+    def update_chapter_image_wordpress(self, post_id: int, chapter_num: int, custom_prompt: Optional[str] = None) -> bool:
+        """WordPressの章画像を更新"""
+        return self.refresh_post_image(post_id, 'chapter', chapter_num, custom_prompt)['status'] == 'success'
+    
+    # 画像差し替えの工程（失敗した工程以降から再開する）
+    REFRESH_STAGES = ('fetch', 'generate', 'optimize', 'save', 'upload', 'set_featured', 'version', 'verify')
+    
+    @staticmethod
+    def _refresh_key(post_id: int, image_type: str, chapter_num: Optional[int]) -> str:
+        return f"{post_id}:{image_type}:{chapter_num or ''}"
+    
+    def _load_pending_refreshes(self) -> Dict[str, Any]:
+        if not self.pending_refresh_path.exists():
+            return {}
+        try:
+            with open(self.pending_refresh_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def get_pending_refresh(self, post_id: int, image_type: str,
+                            chapter_num: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """生成後の工程で失敗した前回の差し替え結果（なければNone）"""
+        with self._pending_refresh_lock:
+            return self._load_pending_refreshes().get(self._refresh_key(post_id, image_type, chapter_num))
+    
+    def _set_pending_refresh(self, result: Dict[str, Any], pending: bool):
+        """失敗した差し替えを記録（pending=False で削除）"""
+        key = self._refresh_key(result['post_id'], result['type'], result['chapter_num'])
+        with self._pending_refresh_lock:
+            entries = self._load_pending_refreshes()
+            if pending:
+                entries[key] = result
+            elif entries.pop(key, None) is None:
+                return
+            with open(self.pending_refresh_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+    
+    def refresh_post_image(self, post_id: int, image_type: str = 'eyecatch',
+                           chapter_num: Optional[int] = None,
+                           custom_prompt: Optional[str] = None,
+                           resume: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        記事画像の再生成・差し替え（取得 → 生成 → 最適化 → 保存 → アップロード → 設定 → 記録 → 検証）
         
-        with open(local_path, 'wb') as f:
-            f.write(optimized_data)
-        print(f"💾 Image saved locally: {local_path}")
+        新しい差し替えは生成画像キャッシュを参照せず常に新規生成する。生成より後の工程で失敗した
+        差し替えの再実行は、保存済みの画像（なければ生成画像キャッシュ）を使い、失敗した工程から再開する
         
-        # 5. WordPress アップロード
-        attachment_id = self.upload_image_to_wordpress(optimized_data, filename)
-        if not attachment_id:
-            return False
+        Args:
+            post_id: WordPress記事ID
+            image_type: 'eyecatch' または 'chapter'
+            chapter_num: 章番号（chapter の場合）
+            custom_prompt: 画像生成プロンプト（省略時は記事タイトルから作成、指定時は再開しない）
+            resume: 前回の失敗結果（一括更新の結果ファイルから再実行する場合、省略時は前回の失敗記録を参照）
         
-        # 6. アイキャッチ更新
-        success = self.update_wordpress_featured_image(post_id, attachment_id)
-        if not success:
-            return False
-        
-        # 7. バージョン管理
-        metadata = {
+        Returns:
+            {'post_id', 'type', 'chapter_num', 'status', 'stage', 'error', 'attachment_id', 'version_id',
+             'prompt', 'local_path'}（失敗時の stage は失敗した工程名）
+        """
+        result = {
             'post_id': post_id,
-            'title': title,
-            'prompt': prompt,
-            'attachment_id': attachment_id,
-            'method': 'wp_update',
-            'timestamp': timestamp
+            'type': image_type,
+            'chapter_num': chapter_num,
+            'status': 'failed',
+            'stage': None,
+            'error': None,
+            'attachment_id': None,
+            'version_id': None,
+            'prompt': None,
+            'local_path': None
         }
         
-        version_id = self.version_manager.create_image_version(
-            post_id, 'eyecatch', optimized_data, metadata
-        )
-        
-        # 8. 検証
-        print("🔍 Verifying update...")
-        base_url = self.wordpress_endpoint.replace('/wp-json/blog-generator/v1', '')
-        verify_response = requests.get(f'{base_url}/wp-json/wp/v2/posts/{post_id}')
+        def failed(failed_stage: str, error: str) -> Dict[str, Any]:
+            result['stage'] = failed_stage
+            result['error'] = error
+            # 生成済みの画像がある失敗は記録して再実行時に再開（取得失敗は前回の記録を残す）
+            if failed_stage != 'fetch':
+                self._set_pending_refresh(result, pending=failed_stage != 'generate')
+            return result
+        
+        # 生成より後の工程で失敗した前回の結果から再開
+        if resume is None and custom_prompt is None:
+            resume = self.get_pending_refresh(post_id, image_type, chapter_num)
+        if (custom_prompt is not None or not resume or not resume.get('prompt')
+                or resume.get('stage') not in self.REFRESH_STAGES[2:]):
+            resume = None
+        resume_from = self.REFRESH_STAGES.index(resume['stage']) if resume else 0
+        
+        is_eyecatch = image_type == 'eyecatch'
+        stage = 'fetch'
+        if is_eyecatch:
+            print(f"🚀 Updating eyecatch for post {post_id}")
+        else:
+            print(f"🚀 Updating chapter {chapter_num} image for post {post_id}")
+        if resume:
+            print(f"🔁 Resuming from failed stage: {resume['stage']}")
         
-        if verify_response.status_code == 200:
-            verify_data = verify_response.json()
-            current_id = verify_data.get('featured_media', 0)
-            
-            if current_id == attachment_id:
+        try:
+            # 1. 記事情報取得
+            stage = 'fetch'
+            post_data = self.get_wordpress_post(post_id)
+            if not post_data:
+                return failed(stage, f"Failed to get post {post_id}")
+            
+            title = post_data.get('title', '')
+            print(f"📖 Post title: {title}")
+            
+            stage = 'generate'
+            if custom_prompt:
+                prompt = custom_prompt
+            elif resume:
+                prompt = resume['prompt']
+            elif is_eyecatch:
+                prompt = f'Modern professional digital illustration for blog article titled "{title}". Clean tech design with blue/purple gradient background. Japanese text "{title}" prominently displayed. High-quality contemporary style.'
+            else:
+                prompt = f'Chapter {chapter_num} illustration for "{title}". Professional modern design, clean visual style, no text, 16:9 aspect ratio, high quality digital art.'
+            result['prompt'] = prompt
+            
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            local_path = Path(resume['local_path']) if resume and resume.get('local_path') else None
+            if local_path is not None and local_path.exists():
+                # 保存済みの最適化画像から再開
+                optimized_data = local_path.read_bytes()
+                filename = local_path.name
+                print(f"♻️  Reusing saved image: {local_path}")
+            else:
+                # 2. 画像生成（再開時は届いた画像を生成画像キャッシュから再利用）
+                if is_eyecatch:
+                    print("🎨 Generating image with gpt-image-1...")
+                    image_data = self.generate_image_openai(prompt, force_fresh=resume is None)
+                else:
+                    print(f"🎨 Generating chapter {chapter_num} image with Imagen 3...")
+                    image_data = self.generate_image_imagen(prompt, force_fresh=resume is None)
+                if not image_data:
+                    return failed(stage, "Image generation failed")
+                
+                # 3. 画像最適化
+                stage = 'optimize'
+                print("📦 Optimizing image...")
+                original_size_kb = len(image_data) / 1024
+                print(f"   Original size: {original_size_kb:.1f}KB")
+                
+                optimized_data = self.optimize_image(image_data, 'eyecatch' if is_eyecatch else 'thumbnail')
+                optimized_size_kb = len(optimized_data) / 1024
+                print(f"   Final size: {optimized_size_kb:.1f}KB ({(1-optimized_size_kb/original_size_kb)*100:.1f}% reduction)")
+                
+                # 4. ローカル保存
+                stage = 'save'
+                if is_eyecatch:
+                    filename = f'eyecatch_{post_id}_{timestamp}.jpg'
+                else:
+                    filename = f'chapter_{chapter_num}_{post_id}_{timestamp}.jpg'
+                local_path = self.outputs_dir / filename
+                
+                with open(local_path, 'wb') as f:
+                    f.write(optimized_data)
+                print(f"💾 Image saved locally: {local_path}")
+            result['local_path'] = str(local_path.resolve())
+            
+            # 5. WordPress アップロード（アップロード後の工程で失敗した場合は同じ添付ファイルを使用）
+            stage = 'upload'
+            attachment_id = None
+            if (resume_from > self.REFRESH_STAGES.index('upload') and resume.get('attachment_id')
+                    and self.wordpress_attachment_exists(resume['attachment_id'])):
+                attachment_id = resume['attachment_id']
+                print(f"♻️  Reusing uploaded attachment: ID {attachment_id}")
+            else:
+                attachment_id = self.upload_image_to_wordpress(optimized_data, filename)
+            if not attachment_id:
+                return failed(stage, "Upload failed")
+            result['attachment_id'] = attachment_id
+            
+            # 6. アイキャッチ更新
+            stage = 'set_featured'
+            if is_eyecatch and not self.update_wordpress_featured_image(post_id, attachment_id):
+                return failed(stage, "Featured image update failed")
+            
+            # 7. バージョン管理（記録済みのバージョンは再作成しない）
+            stage = 'version'
+            if resume and resume.get('version_id') and resume.get('attachment_id') == attachment_id:
+                version_id = resume['version_id']
+            else:
+                metadata = {
+                    'post_id': post_id,
+                    'title': title,
+                    'prompt': prompt,
+                    'attachment_id': attachment_id,
+                    'method': 'wp_update',
+                    'timestamp': timestamp
+                }
+                if not is_eyecatch:
+                    metadata['chapter_num'] = chapter_num
+                
+                version_type = 'eyecatch' if is_eyecatch else f'chapter_{chapter_num}'
+                version_id = self.version_manager.create_image_version(
+                    post_id, version_type, optimized_data, metadata
+                )
+            result['version_id'] = version_id
+            
+            # 8. 検証（アイキャッチのみ）
+            if is_eyecatch:
+                stage = 'verify'
+                print("🔍 Verifying update...")
+                current_id = self.get_featured_media_id(post_id)
+                if current_id is None:
+                    print("❌ Verification API failed")
+                    return failed(stage, "Verification API failed")
+                if current_id != attachment_id:
+                    print(f"⚠️ Verification mismatch: expected {attachment_id}, got {current_id}")
+                    return failed(stage, f"Verification mismatch: expected {attachment_id}, got {current_id}")
                 print(f"🎉 Update completed! Eyecatch ID: {current_id}, Version: {version_id}")
-                return True
             else:
-                print(f"⚠️ Verification mismatch: expected {attachment_id}, got {current_id}")
-                return False
-        else:
-            print("❌ Verification API failed")
-            return False
+                print(f"🎉 Chapter {chapter_num} image updated! Attachment ID: {attachment_id}, Version: {version_id}")
+            
+            result['status'] = 'success'
+            self._set_pending_refresh(result, pending=False)
+            return result
+            
+        except Exception as e:
+            print(f"❌ Image update error for post {post_id} ({stage}): {e}")
+            return failed(stage, str(e))
     
-    def update_chapter_image_wordpress(self, post_id: int, chapter_num: int, custom_prompt: Optional[str] = None) -> bool:
-        """WordPressの章画像を更新"""
-        print(f"🚀 Updating chapter {chapter_num} image for post {post_id}")
-        
-        # 1. 記事情報取得
-        post_data = self.get_wordpress_post(post_id)
-        if not post_data:
-            return False
-        
-        title = post_data.get('title', '')
-        print(f"📖 Post title: {title}")
-        
-        # 2. 画像生成
-        if custom_prompt:
-            prompt = custom_prompt
-        else:
-            prompt = f'Chapter {chapter_num} illustration for "{title}". Professional modern design, clean visual style, no text, 16:9 aspect ratio, high quality digital art.'
-        
-        print(f"🎨 Generating chapter {chapter_num} image with Imagen 3...")
-        image_data = self.generate_image_imagen(prompt)
-        if not image_data:
-            return False
-        
-        # 3. 画像最適化
-        print("📦 Optimizing image...")
-        original_size_kb = len(image_data) / 1024
-        print(f"   Original size: {original_size_kb:.1f}KB")
-        
-        optimized_data = self.optimize_image(image_data, 'thumbnail')
-        optimized_size_kb = len(optimized_data) / 1024
-        print(f"   Final size: {optimized_size_kb:.1f}KB ({(1-optimized_size_kb/original_size_kb)*100:.1f}% reduction)")
-        
-        # 4. ローカル保存
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'chapter_{chapter_num}_{post_id}_{timestamp}.jpg'
-        local_path = self.outputs_dir / filename
-        
-        with open(local_path, 'wb') as f:
-            f.write(optimized_data)
-        print(f"💾 Image saved locally: {local_path}")
-        
-        # 5. WordPress アップロード
-        attachment_id = self.upload_image_to_wordpress(optimized_data, filename)
-        if not attachment_id:
-            return False
+    def get_featured_media_id(self, post_id: int) -> Optional[int]:
+        """WordPress標準APIから記事の現在のアイキャッチIDを取得（取得失敗時はNone）"""
+        try:
+            base_url = self.wordpress_endpoint.replace('/wp-json/blog-generator/v1', '')
+            with self.provider_limiter.limit('wordpress'):
+                verify_response = self.wordpress_session.get(f'{base_url}/wp-json/wp/v2/posts/{post_id}',
+                                                             timeout=self.wordpress_timeout())
+            if verify_response.status_code != 200:
+                return None
+            return verify_response.json().get('featured_media', 0)
+        except Exception as e:
+            print(f"❌ Verification error: {e}")
+            return None
+    
+    def update_images_batch(self, items: List[Dict[str, Any]],
+                            max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        複数記事の画像を一括更新（プロバイダー・WordPressごとの同時実行数制限付き）
         
-        # 6. バージョン管理
-        metadata = {
-            'post_id': post_id,
-            'title': title,
-            'chapter_num': chapter_num,
-            'prompt': prompt,
-            'attachment_id': attachment_id,
-            'method': 'wp_update',
-            'timestamp': timestamp
-        }
+        Args:
+            items: [{'post_id', 'type', 'chapter_num', 'resume'（任意、前回の失敗結果）}]
+            max_concurrency: 並列ワーカー数（Noneの場合はimage_settings.jsonの値）
         
-        version_id = self.version_manager.create_image_version(
-            post_id, f'chapter_{chapter_num}', optimized_data, metadata
-        )
+        Returns:
+            入力順の refresh_post_image 結果リスト
+        """
+        max_workers = get_concurrency_settings(self.image_settings, max_concurrency)['max_workers']
+        results = refresh_images_concurrently(self, items, max_workers)
         
-        print(f"🎉 Chapter {chapter_num} image updated! Attachment ID: {attachment_id}, Version: {version_id}")
-        return True
+        stats = self.post_cache.get_stats()
+        if stats['not_modified'] or stats['fetched']:
+            print(f"📦 Post cache: {stats['not_modified']} not modified / {stats['fetched']} fetched "
+                  f"({stats['revalidation_rate']:.0%} revalidated)")
+        return results
     
     # ==== バージョン管理機能 ====
     
@@ -1155,8 +1655,9 @@ class ConsolidatedImageManager:
                 print(f"No history found for {image_type}")
         else:
             # 全タイプの履歴を表示
-            if post_id in self.version_manager.version_db:
-                for img_type, history in self.version_manager.version_db[post_id].items():
+            post_history = self.version_manager.get_post_history(post_id)
+            if post_history:
+                for img_type, history in post_history.items():
                     print(f"\n{img_type} history:")
                     for i, version in enumerate(history, 1):
                         created_at = version.get('created_at', 'Unknown')
@@ -1175,15 +1676,174 @@ class ConsolidatedImageManager:
             print("❌ Version not found")
             return False
         
+        post_id = version_info['post_id']
+        image_type = version_info['image_type']
+        metadata = version_info.get('metadata', {})
         print(f"Found version: {version_info['created_at']}")
-        print(f"Post ID: {version_info['post_id']}")
-        print(f"Image type: {version_info['image_type']}")
+        print(f"Post ID: {post_id}")
+        print(f"Image type: {image_type}")
         print(f"File size: {version_info['file_size'] / 1024:.1f}KB")
         
-        # 実際の復元処理はメタデータのみ表示
-        # 実装時はWordPressへの再アップロードと更新処理を追加
-        print("⚠️  Restoration feature requires WordPress re-upload implementation")
+        image_data = self.version_manager.get_image_bytes(version_info)
+        
+        # 1. WordPressに当時のメディアが残っていれば再利用、なければローカルのバイトから再アップロード
+        attachment_id = metadata.get('attachment_id')
+        if attachment_id and self.wordpress_attachment_exists(attachment_id):
+            print(f"♻️  Reusing existing attachment: ID {attachment_id}")
+        elif image_data is not None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'{image_type}_{post_id}_restored_{timestamp}.jpg'
+            attachment_id = self.upload_image_to_wordpress(image_data, filename)
+            if not attachment_id:
+                return False
+        else:
+            print("❌ Image bytes not stored for this version and the attachment no longer exists")
+            return False
+        
+        # 2. アイキャッチは記事に再設定（章画像はアップロードのみ、update と同じ扱い）
+        if image_type == 'eyecatch':
+            if not self.update_wordpress_featured_image(post_id, attachment_id):
+                return False
+        
+        # 3. 復元結果を新しいバージョンとして記録（ブロブは重複保存されない）
+        if image_data is not None:
+            restored_metadata = dict(metadata)
+            restored_metadata.update({
+                'attachment_id': attachment_id,
+                'method': 'restore',
+                'restored_from': version_id,
+                'timestamp': datetime.now().strftime('%Y%m%d_%H%M%S')
+            })
+            self.version_manager.create_image_version(post_id, image_type, image_data, restored_metadata)
+        
+        print(f"🎉 Restored {image_type} for post {post_id}: attachment ID {attachment_id}")
         return True
+    
+    def collect_image_garbage(self) -> Dict[str, int]:
+        """どのバージョンからも参照されていない画像ブロブを削除"""
+        print("🧹 Collecting unreferenced image blobs...")
+        result = self.version_manager.collect_garbage()
+        print(f"✅ Removed {result['removed']} blobs ({result['freed_bytes'] / 1024:.1f}KB freed), "
+              f"kept {result['kept']}")
+        return result
+
+
+def parse_batch_items(tokens: List[str], default_type: str = 'eyecatch',
+                      default_chapter: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    一括更新の項目指定を変換（重複は除外）
+    
+    '1234' は --type の既定タイプ、'1234:2' は章2の画像、'1234:eyecatch' はアイキャッチ
+    """
+    items = []
+    seen = set()
+    for token in tokens:
+        post_part, _, target = token.strip().partition(':')
+        if not post_part:
+            continue
+        post_id = int(post_part)
+        
+        if target == 'eyecatch':
+            image_type, chapter_num = 'eyecatch', None
+        elif target:
+            image_type, chapter_num = 'chapter', int(target)
+        else:
+            image_type = default_type
+            chapter_num = default_chapter if default_type == 'chapter' else None
+        
+        if image_type == 'chapter' and not chapter_num:
+            raise ValueError(f"Chapter number required for post {post_id} (use POST_ID:CHAPTER or --chapter-num)")
+        
+        key = (post_id, image_type, chapter_num)
+        if key not in seen:
+            seen.add(key)
+            items.append({'post_id': post_id, 'type': image_type, 'chapter_num': chapter_num})
+    return items
+
+
+def load_batch_items(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    update-batch の対象項目を読み込み
+    
+    --ids-file はテキスト（空白・カンマ・改行区切り、# 以降はコメント）または
+    前回の結果ファイル（.json、失敗した項目のみ失敗した工程から再実行）
+    """
+    tokens = list(args.post_ids or [])
+    retry_items = []
+    
+    if args.ids_file:
+        ids_path = Path(args.ids_file)
+        if ids_path.suffix == '.json':
+            with open(ids_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            # 失敗した工程・保存済み画像・添付ファイルを引き継ぎ、失敗した工程から再開
+            retry_items = [
+                {'post_id': item['post_id'], 'type': item['type'], 'chapter_num': item.get('chapter_num'),
+                 'resume': item}
+                for item in previous.get('items', []) if item.get('status') != 'success'
+            ]
+        else:
+            with open(ids_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    tokens.extend(re.split(r'[\s,]+', line.split('#', 1)[0].strip()))
+    
+    items = retry_items + parse_batch_items(tokens, args.type, args.chapter_num)
+    
+    # 結果ファイルと直接指定の重複を除外
+    unique_items = []
+    seen = set()
+    for item in items:
+        key = (item['post_id'], item['type'], item['chapter_num'])
+        if key not in seen:
+            seen.add(key)
+            unique_items.append(item)
+    return unique_items
+
+
+def write_batch_results(results: List[Dict[str, Any]], results_path: Path, started_at: str):
+    """一括更新の結果ファイル（JSON）を書き出し"""
+    succeeded = sum(1 for result in results if result['status'] == 'success')
+    report = {
+        'started_at': started_at,
+        'finished_at': datetime.now().isoformat(),
+        'summary': {
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        },
+        'items': results
+    }
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def required_credentials(args: argparse.Namespace,
+                         batch_items: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+    """サブコマンドの実行に必要な環境変数（version history / gc は認証情報不要）"""
+    wordpress = [WORDPRESS_API_KEY, WORDPRESS_ENDPOINT]
+    
+    if args.command == 'generate':
+        # Gemini（プロンプト生成）+ アイキャッチはOpenAI、サムネイルはImagen
+        if args.mode == 'thumbnail':
+            return [GOOGLE_API_KEY]
+        return [GOOGLE_API_KEY, OPENAI_API_KEY]
+    if args.command == 'update':
+        provider = OPENAI_API_KEY if args.type == 'eyecatch' else GOOGLE_API_KEY
+        return [provider] + wordpress
+    if args.command == 'quick-update':
+        return [OPENAI_API_KEY] + wordpress
+    if args.command == 'update-batch':
+        image_types = {item['type'] for item in batch_items or []}
+        providers = []
+        if 'eyecatch' in image_types:
+            providers.append(OPENAI_API_KEY)
+        if 'chapter' in image_types:
+            providers.append(GOOGLE_API_KEY)
+        return providers + wordpress
+    if args.command == 'version' and args.action == 'restore':
+        return wordpress
+    return []
 
 
 def main():
@@ -1196,6 +1856,7 @@ def main():
   # 新規画像生成
   python consolidated_image_manager.py generate --outline outputs/final_articles/article/outline.md --mode eyecatch
   python consolidated_image_manager.py generate --outline outputs/final_articles/article/outline.md --mode all
+  python consolidated_image_manager.py generate --outline outputs/final_articles/article/outline.md --mode all --max-concurrency 4
   
   # WordPress画像更新
   python consolidated_image_manager.py update --post-id 1234 --type eyecatch
@@ -1204,9 +1865,14 @@ def main():
   # 簡単更新（後方互換性）
   python consolidated_image_manager.py quick-update 1234
   
+  # 複数記事の一括更新（結果JSONを --ids-file に渡すと失敗分のみ再実行）
+  python consolidated_image_manager.py update-batch 1234 1235 1236:2 --max-concurrency 4
+  python consolidated_image_manager.py update-batch --ids-file post_ids.txt --results outputs/batch.json
+  
   # バージョン管理
   python consolidated_image_manager.py version --post-id 1234 --action history
   python consolidated_image_manager.py version --post-id 1234 --action restore --version-id VERSION_ID
+  python consolidated_image_manager.py version --action gc
         """
     )
     
@@ -1219,6 +1885,12 @@ def main():
     generate_parser.add_argument('--mode', choices=['eyecatch', 'thumbnail', 'all'], 
                                 default='all', help='Generation mode')
     generate_parser.add_argument('--chapter', type=int, help='Chapter number for thumbnail mode')
+    generate_parser.add_argument('--max-concurrency', type=int,
+                                help='Worker pool size for --mode all (1 = sequential)')
+    generate_parser.add_argument('--no-prompt-cache', action='store_true',
+                                help='Always call Gemini for prompt generation')
+    generate_parser.add_argument('--force-fresh', action='store_true',
+                                help='Ignore cached provider images and generate new ones')
     
     # update サブコマンド
     update_parser = subparsers.add_parser('update', help='Update WordPress images')
@@ -1233,10 +1905,23 @@ def main():
     quick_parser.add_argument('post_id', type=int, help='WordPress post ID')
     quick_parser.add_argument('--prompt', help='Custom prompt for image generation')
     
+    # update-batch サブコマンド（複数記事の画像を一括更新）
+    batch_parser = subparsers.add_parser('update-batch', help='Update images for many posts')
+    batch_parser.add_argument('post_ids', nargs='*',
+                             help='POST_ID, POST_ID:CHAPTER or POST_ID:eyecatch')
+    batch_parser.add_argument('--ids-file',
+                             help='File with post IDs, or a previous results .json to retry failed items')
+    batch_parser.add_argument('--type', choices=['eyecatch', 'chapter'], default='eyecatch',
+                             help='Default image type for plain POST_ID entries')
+    batch_parser.add_argument('--chapter-num', type=int, help='Default chapter number for --type chapter')
+    batch_parser.add_argument('--max-concurrency', type=int,
+                             help='Worker pool size (per-provider limits still apply)')
+    batch_parser.add_argument('--results', help='Results JSON path (default: outputs/image_update_batch_TIMESTAMP.json)')
+    
     # version サブコマンド
     version_parser = subparsers.add_parser('version', help='Version management')
-    version_parser.add_argument('--post-id', type=int, required=True, help='WordPress post ID')
-    version_parser.add_argument('--action', choices=['history', 'restore'], 
+    version_parser.add_argument('--post-id', type=int, help='WordPress post ID (required for history)')
+    version_parser.add_argument('--action', choices=['history', 'restore', 'gc'], 
                                required=True, help='Version action')
     version_parser.add_argument('--type', help='Image type for history')
     version_parser.add_argument('--version-id', help='Version ID for restore')
@@ -1252,12 +1937,23 @@ def main():
         print("🚀 Consolidated Image Manager")
         print("="*50)
         
-        manager = ConsolidatedImageManager()
+        batch_items = None
+        if args.command == 'update-batch':
+            batch_items = load_batch_items(args)
+            if not batch_items:
+                print("❌ No posts specified (POST_ID arguments or --ids-file)")
+                sys.exit(1)
+        
+        require_credentials(required_credentials(args, batch_items))
+        manager = ConsolidatedImageManager(
+            use_prompt_cache=not getattr(args, 'no_prompt_cache', False),
+            force_fresh_images=args.command == 'generate' and args.force_fresh
+        )
         
         # generate コマンド
         if args.command == 'generate':
             if args.mode == 'all':
-                results = manager.generate_all_images(args.outline)
+                results = manager.generate_all_images(args.outline, args.max_concurrency)
                 
                 print("\n" + "="*50)
                 print("GENERATION SUMMARY")
@@ -1330,9 +2026,34 @@ def main():
             success = manager.update_eyecatch_wordpress(args.post_id, args.prompt)
             sys.exit(0 if success else 1)
         
+        # update-batch コマンド
+        elif args.command == 'update-batch':
+            started_at = datetime.now().isoformat()
+            results_path = Path(args.results) if args.results else \
+                manager.outputs_dir / f"image_update_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            
+            results = manager.update_images_batch(batch_items, args.max_concurrency)
+            write_batch_results(results, results_path, started_at)
+            
+            failed = [result for result in results if result['status'] != 'success']
+            print("\n" + "="*50)
+            print("BATCH UPDATE SUMMARY")
+            print("="*50)
+            print(f"📊 Succeeded: {len(results) - len(failed)}/{len(results)}")
+            for result in failed:
+                target = 'eyecatch' if result['type'] == 'eyecatch' else f"chapter {result['chapter_num']}"
+                print(f"   ❌ Post {result['post_id']} {target}: {result['stage']} - {result['error']}")
+            print(f"📄 Results: {results_path}")
+            if failed:
+                print(f"   Retry failed items: python consolidated_image_manager.py update-batch --ids-file {results_path}")
+            sys.exit(1 if failed else 0)
+        
         # version コマンド
         elif args.command == 'version':
             if args.action == 'history':
+                if not args.post_id:
+                    print("❌ --post-id required for history action")
+                    return
                 manager.show_image_history(args.post_id, args.type)
             elif args.action == 'restore':
                 if not args.version_id:
@@ -1343,6 +2064,8 @@ def main():
                     print("✅ Version restoration completed!")
                 else:
                     print("❌ Version restoration failed!")
+            elif args.action == 'gc':
+                manager.collect_image_garbage()
                     
     except Exception as e:
         print(f"💥 Fatal error: {e}")
@@ -7,6 +7,7 @@ Usage:
     python image_generator.py --outline path/to/outline.md --mode eyecatch
     python image_generator.py --outline path/to/outline.md --mode thumbnail --chapter 1
     python image_generator.py --outline path/to/outline.md --mode all
+    python image_generator.py --outline path/to/outline.md --mode all --max-concurrency 4
 """
 
 import os
@@ -19,44 +20,67 @@ from pathlib import Path
 from typing import Optional, Dict, List
 from io import BytesIO
 
-from google import genai
-from google.genai import types
-from openai import OpenAI
-from PIL import Image, ImageFilter, ImageDraw
+from PIL import Image
 from dotenv import load_dotenv
 import base64
-import numpy as np
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from utils.output_manager import OutputManager
+from utils.image_concurrency import (
+    ProviderConcurrencyLimiter, generate_images_concurrently, get_concurrency_settings
+)
+from utils.prompt_cache import PromptCache
+from utils.chapter_prompt_batch import build_batch_request, parse_batch_response
+from utils.image_result_cache import ImageResultCache
+from utils.image_postprocess import (
+    ImagePostProcessor, optimize_image_bytes, prepare_png_bytes,
+    extend_image_to_16_9 as blur_extend_to_16_9
+)
+from utils.provider_clients import ProviderClients, require_credentials, GOOGLE_API_KEY, OPENAI_API_KEY
 
 # 環境変数読み込み
 load_dotenv()
 
 class BlogImageGenerator:
-    def __init__(self):
-        """初期化"""
+    def __init__(self, use_prompt_cache: bool = True, force_fresh_images: bool = False):
+        """
+        初期化
+        
+        Args:
+            use_prompt_cache: Geminiプロンプト生成キャッシュの使用有無（--no-prompt-cache でFalse）
+            force_fresh_images: 生成画像キャッシュを参照せず常に新規生成（--force-fresh）
+        """
         # 画像設定を読み込み
         self.load_image_settings()
         # Google Gemini API (サムネイル用)
-        self.google_api_key = os.getenv('GOOGLE_API_KEY')
-        if not self.google_api_key:
-            raise ValueError("GOOGLE_API_KEY not found in .env file")
+        self.google_api_key = os.getenv(GOOGLE_API_KEY)
         
         # OpenAI API (アイキャッチ用)
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not self.openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in .env file")
+        self.openai_api_key = os.getenv(OPENAI_API_KEY)
         
-        # クライアント初期化
-        self.google_client = genai.Client(api_key=self.google_api_key)
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        # クライアントは初回使用時に生成（SDKのimportも遅延）
+        self.clients = ProviderClients(self.google_api_key, self.openai_api_key)
         
         self.imagen_model = 'imagen-3.0-generate-002'
         self.openai_image_model = 'gpt-image-1'
+        self.gemini_text_model = 'gemini-2.0-flash-exp'
+        
+        # Geminiプロンプト生成キャッシュ
+        self.prompt_cache = PromptCache.from_settings(self.image_settings, enabled=use_prompt_cache)
+        
+        # 生成画像キャッシュ（同一プロンプト・モデル・サイズの再生成を回避）
+        self.image_cache = ImageResultCache.from_settings(self.image_settings)
+        self.force_fresh_images = force_fresh_images
+        
+        # CPU処理（リサイズ・エンコード）用ポストプロセスプール
+        self.postprocessor = ImagePostProcessor.from_settings(self.image_settings)
+        
+        # プロバイダー別同時実行数制限
+        concurrency = get_concurrency_settings(self.image_settings)
+        self.provider_limiter = ProviderConcurrencyLimiter(concurrency['provider_limits'])
         
         # 出力管理クラス初期化
         self.output_manager = OutputManager()
@@ -65,6 +89,16 @@ class BlogImageGenerator:
         self.outputs_dir = Path('outputs')
         self.outputs_dir.mkdir(exist_ok=True)
     
+    @property
+    def google_client(self):
+        """Google GenAI クライアント（初回使用時に生成）"""
+        return self.clients.google
+    
+    @property
+    def openai_client(self):
+        """OpenAI クライアント（初回使用時に生成）"""
+        return self.clients.openai
+    
     def load_image_settings(self):
         """画像設定ファイルを読み込み"""
         try:
@@ -80,6 +114,7 @@ class BlogImageGenerator:
                         "enabled": True,
                         "target_max_size_kb": 500,
                         "target_dimensions": {"width": 1024, "height": 576},
+                        "aspect_fit": "extend",
                         "jpeg_quality": 85
                     }
                 },
@@ -94,61 +129,25 @@ class BlogImageGenerator:
             }
     
     def optimize_image(self, image_data: bytes, image_type: str = 'eyecatch') -> bytes:
-        """画像を最適化してファイルサイズを削減"""
+        """画像を最適化してファイルサイズを削減（ポストプロセスプールで実行）"""
         try:
             settings = self.image_settings.get(image_type, {}).get('optimization', {})
             
             if not settings.get('enabled', True):
                 return image_data
             
-            # PIL Imageで読み込み
-            image = Image.open(BytesIO(image_data))
+            # RGB変換・リサイズ・目標サイズJPEGエンコードをワーカープロセスで実行
+            output_data, info = self.postprocessor.run(optimize_image_bytes, image_data, settings)
+            if info.get('extended'):
+                width, height = info['dimensions']
+                print(f"📐 Extended {info['original_size'][0]}×{info['original_size'][1]} to {width}×{height} with edge blur padding")
             
-            # RGBA -> RGBに変換（JPEG保存のため）
-            if image.mode in ('RGBA', 'LA'):
-                # 白背景で合成
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'RGBA':
-                    background.paste(image, mask=image.split()[3])  # アルファチャンネルをマスクとして使用
-                else:
-                    background.paste(image)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # 目標サイズにリサイズ
-            target_dims = settings.get('target_dimensions', {})
-            if target_dims.get('width') and target_dims.get('height'):
-                target_size = (target_dims['width'], target_dims['height'])
-                image = image.resize(target_size, Image.Resampling.LANCZOS)
-            
-            # JPEG品質を段階的に調整してファイルサイズを最適化
-            target_size_kb = settings.get('target_max_size_kb', 500)
-            base_quality = settings.get('jpeg_quality', 85)
-            
-            for quality in range(base_quality, 50, -5):  # 85から50まで5刻みで下げる
-                output = BytesIO()
-                save_kwargs = {
-                    'format': 'JPEG',
-                    'quality': quality,
-                    'optimize': True,
-                    'progressive': True
-                }
-                image.save(output, **save_kwargs)
-                
-                output_size_kb = output.tell() / 1024
-                print(f"   Quality {quality}: {output_size_kb:.1f}KB")
-                
-                if output_size_kb <= target_size_kb:
-                    print(f"✅ Optimized to {output_size_kb:.1f}KB (quality: {quality})")
-                    return output.getvalue()
-            
-            # 最低品質でも目標サイズを超える場合は最低品質で保存
-            output = BytesIO()
-            image.save(output, format='JPEG', quality=50, optimize=True)
-            final_size_kb = output.tell() / 1024
-            print(f"⚠️  Final size: {final_size_kb:.1f}KB (minimum quality)")
-            return output.getvalue()
+            if info['within_target']:
+                print(f"✅ Optimized to {info['size_kb']:.1f}KB (quality: {info['quality']}, "
+                      f"full encodes: {info['full_encodes']}, trial encodes: {info['trial_encodes']})")
+            else:
+                print(f"⚠️  Final size: {info['size_kb']:.1f}KB (minimum quality, full encodes: {info['full_encodes']})")
+            return output_data
             
         except Exception as e:
             print(f"❌ Image optimization failed: {e}")
@@ -223,12 +222,21 @@ class BlogImageGenerator:
                 chapter_number = chapter_match.group(1) if chapter_match else '1'
                 content = content.replace('{{chapter_number}}', chapter_number)
             
+            # キャッシュチェック（テンプレート・アウトライン・対象章・モデルが同一なら再利用）
+            cache_key = PromptCache.make_key(template, outline_data['content'], target_chapter, self.gemini_text_model)
+            cached_text = self.prompt_cache.get_text(cache_key)
+            if cached_text is not None:
+                print(f"♻️  Prompt cache hit: {template_path.name}" + (f" ({target_chapter[:30]})" if target_chapter else ""))
+                return cached_text
+            
             # Gemini Text APIでプロンプト生成を実行
             try:
                 response = self.google_client.models.generate_content(
-                    model='gemini-2.0-flash-exp',
+                    model=self.gemini_text_model,
                     contents=content
                 )
+                if response.text:
+                    self.prompt_cache.set_text(cache_key, response.text)
                 return response.text
             except Exception as e:
                 print(f"Warning: Gemini text generation failed: {e}")
@@ -239,6 +247,68 @@ class BlogImageGenerator:
             print(f"Error generating prompt: {e}")
             return None
     
+    def generate_chapter_prompts(self, outline_data: Dict, chapters: List[str]) -> Dict[int, str]:
+        """
+        全章のサムネイル用プロンプトをGemini 1回の呼び出しで一括生成（アウトラインは1回だけ送信）
+        
+        キャッシュ済みの章は再利用し、一括応答から欠落・不正な章は結果に含めない
+        （generate_thumbnail が章ごとの生成にフォールバック）
+        
+        Returns:
+            {章番号(1始まり): Gemini生成テキスト}
+        """
+        if not chapters or not self.image_settings.get('prompt_batch', {}).get('enabled', True):
+            return {}
+        
+        try:
+            with open(project_root / 'templates' / 'thumbnail.md', 'r', encoding='utf-8') as f:
+                template = f.read()
+        except OSError as e:
+            print(f"Warning: Could not load thumbnail template: {e}")
+            return {}
+        
+        # キャッシュ済みの章を除外（キーは章ごとの生成と共通）
+        outline_content = outline_data['content']
+        prompts = {}
+        pending = []
+        for i, chapter in enumerate(chapters, 1):
+            cache_key = PromptCache.make_key(template, outline_content, chapter, self.gemini_text_model)
+            cached_text = self.prompt_cache.get_text(cache_key)
+            if cached_text is not None:
+                prompts[i] = cached_text
+            else:
+                pending.append((i, chapter, cache_key))
+        
+        if prompts:
+            print(f"♻️  Prompt cache hit: {len(prompts)}/{len(chapters)} chapters")
+        if len(pending) < 2:
+            # 1章以下は章ごとの生成と往復回数が変わらない
+            return prompts
+        
+        print(f"🧩 Generating {len(pending)} chapter prompts in one Gemini call...")
+        request = build_batch_request(template, outline_content, [chapter for _, chapter, _ in pending])
+        try:
+            from google.genai import types
+            response = self.google_client.models.generate_content(
+                model=self.gemini_text_model,
+                contents=request,
+                config=types.GenerateContentConfig(response_mime_type='application/json')
+            )
+            batch = parse_batch_response(response.text, len(pending))
+        except Exception as e:
+            print(f"Warning: Batched prompt generation failed: {e}")
+            batch = {}
+        
+        for position, (i, _, cache_key) in enumerate(pending, 1):
+            if position in batch:
+                prompts[i] = batch[position]
+                self.prompt_cache.set_text(cache_key, batch[position])
+        
+        missing = len(pending) - len(batch)
+        if missing:
+            print(f"⚠️  {missing} chapter prompt(s) missing from batched response, falling back to per-chapter calls")
+        return prompts
+    
     def extract_yaml_and_convert_to_prompt(self, generated_text: str) -> str:
         """生成されたテキストからYAML設定を抽出してImagen 3用プロンプトに変換"""
         try:
@@ -421,23 +491,36 @@ class BlogImageGenerator:
         
         return extracted_prompt
     
-    def generate_image_openai(self, prompt: str) -> Optional[bytes]:
+    def generate_image_openai(self, prompt: str, force_fresh: Optional[bool] = None) -> Optional[bytes]:
         """OpenAI gpt-image-1でアイキャッチ画像生成（日本語テキスト対応）"""
         try:
+            size = "1536x1024"  # gpt-image-1の横長サイズ
+            
+            # 生成画像キャッシュチェック
+            cache_key = ImageResultCache.make_key('openai', self.openai_image_model, prompt, size)
+            if not (self.force_fresh_images if force_fresh is None else force_fresh):
+                cached_image = self.image_cache.get_bytes(cache_key)
+                if cached_image is not None:
+                    print(f"♻️  Reusing cached OpenAI image ({len(cached_image) / 1024:.1f}KB): {prompt[:60]}...")
+                    return cached_image
+            
             print(f"🎨 Generating eyecatch with OpenAI: {prompt[:100]}...")
             
-            response = self.openai_client.images.generate(
-                model=self.openai_image_model,
-                prompt=prompt,
-                size="1536x1024",  # gpt-image-1の横長サイズ
-                quality="high",
-                n=1
-            )
+            with self.provider_limiter.limit('openai'):
+                response = self.openai_client.images.generate(
+                    model=self.openai_image_model,
+                    prompt=prompt,
+                    size=size,
+                    quality="high",
+                    n=1
+                )
             
             # base64データを取得（gpt-image-1はbase64を返す）
             if response.data and len(response.data) > 0:
                 image_base64 = response.data[0].b64_json
-                return base64.b64decode(image_base64)
+                image_bytes = base64.b64decode(image_base64)
+                self.image_cache.set_bytes(cache_key, image_bytes)
+                return image_bytes
             else:
                 print("No images generated by OpenAI")
                 return None
@@ -446,26 +529,40 @@ class BlogImageGenerator:
             print(f"Error generating image with OpenAI: {e}")
             return None
     
-    def generate_image_imagen(self, prompt: str) -> Optional[bytes]:
+    def generate_image_imagen(self, prompt: str, force_fresh: Optional[bool] = None) -> Optional[bytes]:
         """Imagen 3でサムネイル画像生成（テキストなし）"""
         try:
+            aspect_ratio = "16:9"  # ブログ用の比率
+            
+            # 生成画像キャッシュチェック
+            cache_key = ImageResultCache.make_key('imagen', self.imagen_model, prompt, aspect_ratio)
+            if not (self.force_fresh_images if force_fresh is None else force_fresh):
+                cached_image = self.image_cache.get_bytes(cache_key)
+                if cached_image is not None:
+                    print(f"♻️  Reusing cached Imagen image ({len(cached_image) / 1024:.1f}KB): {prompt[:60]}...")
+                    return cached_image
+            
             print(f"🎨 Generating thumbnail with Imagen 3: {prompt[:100]}...")
             
-            response = self.google_client.models.generate_images(
-                model=self.imagen_model,
-                prompt=prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                    aspect_ratio="16:9",  # ブログ用の比率
-                    safety_filter_level="block_low_and_above",
-                    person_generation="allow_adult"
+            from google.genai import types
+            with self.provider_limiter.limit('imagen'):
+                response = self.google_client.models.generate_images(
+                    model=self.imagen_model,
+                    prompt=prompt,
+                    config=types.GenerateImagesConfig(
+                        number_of_images=1,
+                        aspect_ratio=aspect_ratio,
+                        safety_filter_level="block_low_and_above",
+                        person_generation="allow_adult"
+                    )
                 )
-            )
             
             # 最初の画像を取得
             if response.generated_images:
                 generated_image = response.generated_images[0]
-                return generated_image.image.image_bytes
+                image_bytes = generated_image.image.image_bytes
+                self.image_cache.set_bytes(cache_key, image_bytes)
+                return image_bytes
             else:
                 print("No images generated by Imagen 3")
                 return None
@@ -477,50 +574,10 @@ class BlogImageGenerator:
     def extend_image_to_16_9(self, image: Image.Image) -> Image.Image:
         """1536×1024の画像を16:9（1920×1080）に拡張（ブラー延長）"""
         try:
-            # 現在のサイズと目標サイズ
             current_width, current_height = image.size
-            target_width, target_height = 1920, 1080
-            
-            print(f"📐 Extending image from {current_width}×{current_height} to {target_width}×{target_height}")
-            
-            # 新しいキャンバス作成
-            extended_image = Image.new('RGB', (target_width, target_height), (0, 0, 0))
+            print(f"📐 Extending image from {current_width}×{current_height} to 1920×1080")
             
-            # 元画像を中央に配置
-            x_offset = (target_width - current_width) // 2
-            y_offset = (target_height - current_height) // 2
-            extended_image.paste(image, (x_offset, y_offset))
-            
-            # 左右の拡張（ブラー）
-            if x_offset > 0:
-                # 左端を拡張
-                left_edge = image.crop((0, 0, 20, current_height))  # 左端20px
-                left_blurred = left_edge.filter(ImageFilter.GaussianBlur(radius=3))
-                left_stretched = left_blurred.resize((x_offset, current_height))
-                extended_image.paste(left_stretched, (0, y_offset))
-                
-                # 右端を拡張
-                right_edge = image.crop((current_width-20, 0, current_width, current_height))  # 右端20px
-                right_blurred = right_edge.filter(ImageFilter.GaussianBlur(radius=3))
-                right_stretched = right_blurred.resize((x_offset, current_height))
-                extended_image.paste(right_stretched, (x_offset + current_width, y_offset))
-            
-            # 上下の拡張（ブラー）
-            if y_offset > 0:
-                # 上端を拡張（全幅で）
-                top_edge = extended_image.crop((0, y_offset, target_width, y_offset + 20))  # 上端20px
-                top_blurred = top_edge.filter(ImageFilter.GaussianBlur(radius=5))
-                top_stretched = top_blurred.resize((target_width, y_offset))
-                extended_image.paste(top_stretched, (0, 0))
-                
-                # 下端を拡張（全幅で）
-                bottom_edge = extended_image.crop((0, y_offset + current_height - 20, target_width, y_offset + current_height))  # 下端20px
-                bottom_blurred = bottom_edge.filter(ImageFilter.GaussianBlur(radius=5))
-                bottom_stretched = bottom_blurred.resize((target_width, y_offset))
-                extended_image.paste(bottom_stretched, (0, y_offset + current_height))
-            
-            # 角の部分をさらにブラーで自然に
-            extended_image = extended_image.filter(ImageFilter.GaussianBlur(radius=0.5))
+            extended_image = blur_extend_to_16_9(image)
             
             print("✅ Image extended to 16:9 with blur padding")
             return extended_image
@@ -536,6 +593,7 @@ class BlogImageGenerator:
             try:
                 image = Image.open(BytesIO(image_data))
                 is_optimized_jpeg = image.format == 'JPEG'
+                image_size = image.size
             except:
                 is_optimized_jpeg = False
             
@@ -548,36 +606,24 @@ class BlogImageGenerator:
                     with open(filepath, 'wb') as f:
                         f.write(image_data)
             else:
-                # PNG画像の場合は従来の処理
-                image = Image.open(BytesIO(image_data))
-                original_size = image.size
-                
-                # アイキャッチ画像（1536×1024）の場合は16:9に拡張
-                if original_size == (1536, 1024):
-                    print(f"🎨 Detected OpenAI eyecatch image, extending to 16:9...")
-                    image = self.extend_image_to_16_9(image)
-                
-                # Web最適化
-                if image.size[0] > 1920:  # 幅が1920pxより大きい場合リサイズ
-                    ratio = 1920 / image.size[0]
-                    new_size = (1920, int(image.size[1] * ratio))
-                    image = image.resize(new_size, Image.Resampling.LANCZOS)
+                # PNG画像の場合は16:9拡張・リサイズ・PNG最適化をワーカープロセスで実行
+                png_data, info = self.postprocessor.run(prepare_png_bytes, image_data)
+                image_size = info['dimensions']
+                if info['extended']:
+                    print(f"🎨 Detected OpenAI eyecatch image, extended to 16:9")
                 
                 # 保存処理
                 if metadata:
                     # 新しい自動分類システムを使用
-                    img_bytes = BytesIO()
-                    image.save(img_bytes, 'PNG', optimize=True)
-                    img_bytes.seek(0)
-                    
-                    filepath = self.output_manager.save_binary(img_bytes.getvalue(), metadata, file_type, chapter)
+                    filepath = self.output_manager.save_binary(png_data, metadata, file_type, chapter)
                 else:
                     # 従来の方法（後方互換性）
                     filepath = self.outputs_dir / filename
-                    image.save(filepath, 'PNG', optimize=True)
+                    with open(filepath, 'wb') as f:
+                        f.write(png_data)
                 filepath = str(filepath)
             
-            print(f"✅ Image saved: {filepath} ({image.size[0]}x{image.size[1]})")
+            print(f"✅ Image saved: {filepath} ({image_size[0]}x{image_size[1]})")
             return filepath
             
         except Exception as e:
@@ -621,12 +667,14 @@ class BlogImageGenerator:
         }
         return self.save_image(image_data, '', metadata, 'eyecatch')
     
-    def generate_thumbnail(self, outline_data: Dict, chapter: str, chapter_num: int) -> Optional[str]:
-        """サムネイル画像生成（Imagen 3使用、テキストなし）"""
+    def generate_thumbnail(self, outline_data: Dict, chapter: str, chapter_num: int,
+                           prompt_text: Optional[str] = None) -> Optional[str]:
+        """サムネイル画像生成（Imagen 3使用、テキストなし。prompt_text は一括生成済みのGemini出力）"""
         print(f"🖼️  Generating thumbnail for chapter {chapter_num}: {chapter[:50]}...")
         
-        # プロンプト生成
-        prompt_text = self.generate_prompt_with_gemini('thumbnail.md', outline_data, chapter)
+        # プロンプト生成（一括生成で得られなかった章は個別に生成）
+        if prompt_text is None:
+            prompt_text = self.generate_prompt_with_gemini('thumbnail.md', outline_data, chapter)
         if not prompt_text:
             return None
         
@@ -658,8 +706,14 @@ class BlogImageGenerator:
         }
         return self.save_image(image_data, '', metadata, 'thumbnail', chapter_num)
     
-    def generate_all_images(self, outline_path: str) -> Dict:
-        """全画像生成"""
+    def generate_all_images(self, outline_path: str, max_concurrency: Optional[int] = None) -> Dict:
+        """
+        全画像生成
+        
+        Args:
+            outline_path: アウトラインファイルのパス
+            max_concurrency: 並列ワーカー数（Noneの場合はimage_settings.jsonの値、1で逐次実行）
+        """
         results = {
             'eyecatch': None,
             'thumbnails': [],
@@ -676,6 +730,11 @@ class BlogImageGenerator:
         chapters = self.extract_chapters(outline_data['content'])
         print(f"📚 Found {len(chapters)} chapters")
         
+        # 並列モード
+        max_workers = get_concurrency_settings(self.image_settings, max_concurrency)['max_workers']
+        if max_workers > 1:
+            return generate_images_concurrently(self, outline_data, chapters, max_workers)
+        
         # アイキャッチ生成
         print("\n" + "="*50)
         print("EYECATCH GENERATION")
@@ -696,9 +755,10 @@ class BlogImageGenerator:
         print("\n" + "="*50)
         print("THUMBNAIL GENERATION")
         print("="*50)
+        chapter_prompts = self.generate_chapter_prompts(outline_data, chapters)
         for i, chapter in enumerate(chapters, 1):
             try:
-                thumbnail_path = self.generate_thumbnail(outline_data, chapter, i)
+                thumbnail_path = self.generate_thumbnail(outline_data, chapter, i, chapter_prompts.get(i))
                 if thumbnail_path:
                     results['thumbnails'].append(thumbnail_path)
                     print(f"✅ Chapter {i} completed: {thumbnail_path}")
@@ -716,6 +776,9 @@ def main():
     parser.add_argument('--outline', required=True, help='Path to outline file')
     parser.add_argument('--mode', choices=['eyecatch', 'thumbnail', 'all'], default='all', help='Generation mode')
     parser.add_argument('--chapter', type=int, help='Chapter number for thumbnail mode')
+    parser.add_argument('--max-concurrency', type=int, help='Worker pool size for --mode all (1 = sequential)')
+    parser.add_argument('--no-prompt-cache', action='store_true', help='Always call Gemini for prompt generation')
+    parser.add_argument('--force-fresh', action='store_true', help='Ignore cached provider images and generate new ones')
     
     args = parser.parse_args()
     
@@ -723,10 +786,16 @@ def main():
         print("🚀 Blog Image Generator with Imagen 3")
         print("="*50)
         
-        generator = BlogImageGenerator()
+        # サムネイルのみの場合はOpenAIキー不要
+        credentials = [GOOGLE_API_KEY] if args.mode == 'thumbnail' else [GOOGLE_API_KEY, OPENAI_API_KEY]
+        require_credentials(credentials)
+        generator = BlogImageGenerator(
+            use_prompt_cache=not args.no_prompt_cache,
+            force_fresh_images=args.force_fresh
+        )
         
         if args.mode == 'all':
-            results = generator.generate_all_images(args.outline)
+            results = generator.generate_all_images(args.outline, args.max_concurrency)
             
             print("\n" + "="*50)
             print("GENERATION SUMMARY")
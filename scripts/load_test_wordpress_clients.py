@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+WordPressクライアント負荷試験
+ローカルのプラグインスタンドイン（wordpress_standin_server.py）を起動し、WordPressClient と
+WordPressUpdateClient で 画像アップロード → 記事作成 → 使用状況 → 記事取得 → 差分更新（バックアップ付き）
+→ 検索 → 分析 →（一定間隔で）復元 のワークフローを並列実行する
+操作ごとの件数・エラー数・スループット・p50/p95/p99 と、サーバー側で注入した障害の件数を表示する
+
+クライアントの履歴DB・記事カタログ・記事キャッシュ・アップロード台帳は一時ディレクトリに作成する（outputs/ を汚さない）
+
+Usage:
+    python scripts/load_test_wordpress_clients.py
+    python scripts/load_test_wordpress_clients.py --workers 16 --iterations 20 --latency-ms 30 --jitter-ms 20
+    python scripts/load_test_wordpress_clients.py --error-rate 0.02 --throttle-rate 0.02
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from scripts.wordpress_standin_server import (
+    DEFAULT_API_KEY, add_fault_arguments, fault_config_from_args, start_standin_server
+)
+
+OPERATIONS = ('upload_image', 'create_post', 'get_usage_stats', 'get_post', 'update_post',
+              'search_posts', 'get_analytics', 'restore')
+PARAGRAPHS = 40
+
+
+def make_content(token: str, rng: random.Random) -> str:
+    """見出し・段落ブロックからなる本文（約1万文字）"""
+    blocks = []
+    for i in range(PARAGRAPHS):
+        if i % 8 == 0:
+            blocks.append(f'<!-- wp:heading -->\n<h2>{token} 見出し {i // 8 + 1}</h2>\n<!-- /wp:heading -->')
+        sentence = ''.join(rng.choice('あいうえおかきくけこさしすせそ') for _ in range(60))
+        blocks.append(f'<!-- wp:paragraph -->\n<p>{sentence}。{sentence}。{sentence}。</p>\n<!-- /wp:paragraph -->')
+    return '\n\n'.join(blocks)
+
+
+def edit_content(content: str) -> str:
+    """1段落だけ書き換えた本文（差分更新・ブロックパッチ経路）"""
+    return content.replace('</p>', '（追記）</p>', 1)
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """最近接順位法によるパーセンタイル"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class LoadTestRecorder:
+    """操作ごとの所要時間・エラー数（スレッドセーフ）"""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def call(self, operation: str, func, *args, **kwargs):
+        """計測付き呼び出し（例外・空の結果はエラーとして記録しNoneを返す）"""
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            result = None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.timings[operation].append(elapsed)
+            if not result:
+                self.errors[operation] += 1
+        return result or None
+
+
+def run_workflow(worker: int, iteration: int, wp_client, update_client, recorder: LoadTestRecorder,
+                 image_dir: Path, restore_every: int):
+    """1記事分のワークフロー"""
+    rng = random.Random(worker * 100003 + iteration)
+    token = f"loadtest-{worker}-{iteration}"
+
+    image_path = image_dir / f"{token}.png"
+    image_path.write_bytes(os.urandom(32 * 1024))
+    uploaded = recorder.call('upload_image', wp_client.upload_image, str(image_path), f"{token} 画像")
+
+    content = make_content(token, rng)
+    created = recorder.call('create_post', wp_client.create_post, title=f"{token} 記事", content=content,
+                            featured_image_id=uploaded['attachment_id'] if uploaded else None)
+    recorder.call('get_usage_stats', wp_client.get_usage_stats)
+    if not created:
+        return
+    post_id = created['post_id']
+
+    recorder.call('get_post', update_client.get_post, post_id)
+    updated = recorder.call('update_post', update_client.update_post, post_id, content=edit_content(content))
+    recorder.call('search_posts', update_client.search_posts_by_title, token)
+    recorder.call('get_analytics', update_client.get_post_analytics, post_id)
+
+    if restore_every and iteration % restore_every == 0 and updated:
+        # バックアップは更新前に backup-post で作成され、更新履歴に記録される
+        history = update_client.get_update_history(post_id, limit=1)
+        if history and history[-1]['backup_id']:
+            recorder.call('restore', update_client.restore_from_backup, post_id, history[-1]['backup_id'])
+
+
+def print_report(recorder: LoadTestRecorder, wall_seconds: float, server_stats, workflows: int):
+    print(f"📊 WordPress client load test ({workflows} workflows, {wall_seconds:.2f} s)")
+    print("="*84)
+    print(f"{'operation':<16}{'count':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}")
+    for operation in OPERATIONS:
+        values = sorted(recorder.timings.get(operation, []))
+        if not values:
+            continue
+        ms = [v * 1000 for v in values]
+        print(f"{operation:<16}{len(values):>7}{recorder.errors[operation]:>8}"
+              f"{len(values) / wall_seconds:>9.1f}{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}"
+              f"{percentile(ms, 99):>10.1f}{ms[-1]:>10.1f}")
+
+    total_requests = sum(server_stats['requests'].values())
+    print("-"*84)
+    print(f"workflows/s       {workflows / wall_seconds:.1f}")
+    print(f"HTTP requests     {total_requests} ({total_requests / wall_seconds:.1f} req/s)")
+    print(f"by route          {dict(sorted(server_stats['requests'].items()))}")
+    print(f"by status         {dict(sorted(server_stats['statuses'].items()))}")
+    print(f"injected faults   {server_stats['injected'] or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test WordPressClient / WordPressUpdateClient against a local stand-in')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent workflows')
+    parser.add_argument('--iterations', type=int, default=10, help='Workflows per worker')
+    parser.add_argument('--restore-every', type=int, default=5,
+                        help='Restore from backup every N iterations (0 = never)')
+    parser.add_argument('--seed', type=int, default=0, help='Fault injection seed')
+    parser.add_argument('--compress', action='store_true', help='Enable gzip request bodies (API_REQUEST_COMPRESSION)')
+    parser.add_argument('--verbose', action='store_true', help='Show client output')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server, endpoint = start_standin_server(faults=fault_config_from_args(args), seed=args.seed)
+    os.environ['WORDPRESS_ENDPOINT'] = endpoint
+    os.environ['WORDPRESS_API_KEY'] = DEFAULT_API_KEY
+    if args.compress:
+        os.environ['API_REQUEST_COMPRESSION'] = 'true'
+
+    from scripts.wordpress_client import WordPressClient
+    from scripts.wordpress_update_client import WordPressUpdateClient
+    from utils.post_cache import PostCache
+
+    print(f"🧪 Stand-in: {endpoint}")
+    print(f"   workers={args.workers} iterations={args.iterations} faults={fault_config_from_args(args)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        image_dir = tmp_path / 'images'
+        image_dir.mkdir()
+
+        wp_client = WordPressClient(data_dir=tmp_path)
+        update_client = WordPressUpdateClient(data_dir=tmp_path)
+        update_client.post_cache = PostCache(tmp_path / 'wordpress_posts', enabled=update_client.post_cache.enabled)
+
+        recorder = LoadTestRecorder()
+        client_output = sys.stdout if args.verbose else open(os.devnull, 'w')
+        start = time.perf_counter()
+        with redirect_stdout(client_output), ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(run_workflow, worker, iteration, wp_client, update_client, recorder,
+                                image_dir, args.restore_every)
+                for iteration in range(1, args.iterations + 1)
+                for worker in range(args.workers)
+            ]
+            for future in futures:
+                future.result()
+        wall_seconds = time.perf_counter() - start
+        if client_output is not sys.stdout:
+            client_output.close()
+
+    print_report(recorder, wall_seconds, server.get_stats(), args.workers * args.iterations)
+    print(f"request bodies    create: {wp_client.body_encoder.format_stats()}")
+    print(f"                  update/backup: {update_client.body_encoder.format_stats()}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
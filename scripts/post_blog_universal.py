@@ -1,4 +1,4 @@
-#\!/usr/bin/env python3
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
 汎用WordPress記事投稿スクリプト（品質チェック統合版）
@@ -10,13 +10,16 @@ import sys
 import glob
 import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from scripts.wordpress_client import WordPressClient, convert_markdown_to_gutenberg, insert_chapter_images
+from scripts.wordpress_client import WordPressClient, convert_markdown_to_gutenberg_cached, insert_chapter_images
 from scripts.pre_wordpress_quality_checker import run_pre_wordpress_quality_check
+from utils.wordpress_session import get_wordpress_settings
+from utils.post_catalog import extract_intent_ids
 
 def find_latest_article_files(outputs_dir):
     """最新の記事ファイルと関連画像を検索（全フォーマット対応）"""
@@ -148,6 +151,57 @@ def generate_meta_description(title, content):
             return first_paragraph[:150] + "..."
         return first_paragraph or "専門家による詳細ガイド"
 
+def start_image_uploads(client, executor, title, eyecatch_file, thumbnail_files):
+    """
+    アイキャッチ・章別画像のアップロードを並行で開始
+
+    Returns:
+        (アイキャッチのFuture または None, [(章番号, Future), ...])
+    """
+    eyecatch_future = None
+    if eyecatch_file and os.path.exists(eyecatch_file):
+        print(f"\n📤 アイキャッチ画像をアップロード中: {os.path.basename(eyecatch_file)}")
+        eyecatch_future = executor.submit(client.upload_image, eyecatch_file, f"{title} - アイキャッチ画像")
+    
+    chapter_futures = []
+    if thumbnail_files:
+        print(f"\n📤 章別画像をアップロード中...")
+        for i, thumbnail_file in enumerate(thumbnail_files, 1):
+            if os.path.exists(thumbnail_file):
+                print(f"   第{i}章画像: {os.path.basename(thumbnail_file)}")
+                chapter_futures.append(
+                    (i, executor.submit(client.upload_image, thumbnail_file, f"第{i}章サムネイル画像"))
+                )
+    
+    return eyecatch_future, chapter_futures
+
+def wait_eyecatch_upload(eyecatch_future):
+    """アイキャッチ画像のアップロード完了を待ち、添付ファイルIDを返す"""
+    if eyecatch_future is None:
+        return None
+    result = eyecatch_future.result()
+    if result:
+        print(f"   ✅ アイキャッチ画像アップロード完了 (ID: {result['attachment_id']})")
+        return result['attachment_id']
+    print(f"   ❌ アイキャッチ画像アップロード失敗")
+    return None
+
+def wait_chapter_uploads(chapter_futures):
+    """章別画像のアップロード完了を章番号順に待ち、chapter_images リストを作成"""
+    chapter_images = []
+    for i, future in chapter_futures:
+        result = future.result()
+        if result:
+            chapter_images.append({
+                'chapter': f'chapter{i}',
+                'attachment_id': result['attachment_id'],
+                'url': result['url']
+            })
+            print(f"   ✅ 第{i}章画像アップロード完了 (ID: {result['attachment_id']})")
+        else:
+            print(f"   ❌ 第{i}章画像アップロード失敗")
+    return chapter_images
+
 def post_blog_universal_with_quality_check():
     """汎用WordPress記事投稿（品質チェック統合版）"""
     
@@ -184,85 +238,73 @@ def post_blog_universal_with_quality_check():
         meta_description = generate_meta_description(title, markdown_content)
         print(f"📄 メタディスクリプション: {meta_description}")
         
-        # アイキャッチ画像をアップロード
-        eyecatch_image_id = None
-        if eyecatch_file and os.path.exists(eyecatch_file):
-            print(f"\n📤 アイキャッチ画像をアップロード中: {os.path.basename(eyecatch_file)}")
-            result = client.upload_image(eyecatch_file, f"{title} - アイキャッチ画像")
-            if result:
-                eyecatch_image_id = result['attachment_id']
-                print(f"   ✅ アイキャッチ画像アップロード完了 (ID: {eyecatch_image_id})")
-            else:
-                print(f"   ❌ アイキャッチ画像アップロード失敗")
-        
-        # 章別画像をアップロード
-        chapter_images = []
-        if thumbnail_files:
-            print(f"\n📤 章別画像をアップロード中...")
-            for i, thumbnail_file in enumerate(thumbnail_files, 1):
-                if os.path.exists(thumbnail_file):
-                    print(f"   第{i}章画像: {os.path.basename(thumbnail_file)}")
-                    result = client.upload_image(thumbnail_file, f"第{i}章サムネイル画像")
-                    if result:
-                        chapter_images.append({
-                            'chapter': f'chapter{i}',
-                            'attachment_id': result['attachment_id'],
-                            'url': result['url']
-                        })
-                        print(f"   ✅ 第{i}章画像アップロード完了 (ID: {result['attachment_id']})")
-                    else:
-                        print(f"   ❌ 第{i}章画像アップロード失敗")
-        
-        # マークダウンをWordPress形式に変換
-        print(f"\n🔄 マークダウンをWordPress形式に変換中...")
-        
-        # コンテンツクリーニング
-        cleaned_content = markdown_content
-        
-        # Meta Description行を削除
-        cleaned_content = re.sub(r'\*\*Meta Description:\*\*[^\n]*\n?', '', cleaned_content)
-        
-        # ローカル画像パスを削除
-        cleaned_content = re.sub(r'\\!\[[^\]]*\]\([^)]*outputs/[^)]*\)', '', cleaned_content)
-        cleaned_content = re.sub(r'\\!\[[^\]]*\]\(\./[^)]*\)', '', cleaned_content)
-        cleaned_content = re.sub(r'\\!\[[^\]]*\]\([^)]*mnt/[^)]*\)', '', cleaned_content)
-        
-        # 連続する空行を削除
-        cleaned_content = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned_content).strip()
-        
-        # WordPress形式に変換
-        wp_content = convert_markdown_to_gutenberg(cleaned_content, debug=True)
+        # 画像アップロードを並行で開始（変換・品質チェックと並行して実行）
+        upload_concurrency = get_wordpress_settings()['upload_concurrency']
+        with ThreadPoolExecutor(max_workers=upload_concurrency) as upload_executor:
+            eyecatch_future, chapter_futures = start_image_uploads(
+                client, upload_executor, title, eyecatch_file, thumbnail_files
+            )
+            
+            # マークダウンをWordPress形式に変換
+            print(f"\n🔄 マークダウンをWordPress形式に変換中...")
+            
+            # コンテンツクリーニング
+            cleaned_content = markdown_content
+            
+            # Meta Description行を削除
+            cleaned_content = re.sub(r'\*\*Meta Description:\*\*[^\n]*\n?', '', cleaned_content)
+            
+            # ローカル画像パスを削除
+            cleaned_content = re.sub(r'!\[[^\]]*\]\([^)]*outputs/[^)]*\)', '', cleaned_content)
+            cleaned_content = re.sub(r'!\[[^\]]*\]\(\./[^)]*\)', '', cleaned_content)
+            cleaned_content = re.sub(r'!\[[^\]]*\]\([^)]*mnt/[^)]*\)', '', cleaned_content)
+            
+            # 連続する空行を削除
+            cleaned_content = re.sub(r'\n\s*\n\s*\n+', '\n\n', cleaned_content).strip()
+            
+            # WordPress形式に変換
+            wp_content = convert_markdown_to_gutenberg_cached(cleaned_content, debug=True)
+            
+            # =========================
+            # 🔍 WordPress投稿前品質チェック実行
+            # =========================
+            print(f"\n🔍 WordPress投稿前品質チェック・自動修正を実行中...")
+            
+            # 品質チェック実行（見出し・段落ブロックのみを検査するため、
+            # 章別画像ブロックの挿入前に実行してアップロードと並行させる）
+            corrected_wp_content, can_proceed = run_pre_wordpress_quality_check(
+                wp_content,
+                cleaned_content,
+                None,
+                title
+            )
+            
+            # 投稿可否判定
+            if not can_proceed:
+                # 未開始のアップロードは取り消す
+                for _, future in chapter_futures:
+                    future.cancel()
+                if eyecatch_future:
+                    eyecatch_future.cancel()
+                print(f"\n❌ 品質チェックでエラーが検出されました。")
+                print(f"📋 品質問題を解決後に再実行してください。")
+                print(f"💾 修正すべきコンテンツは tmp/quality_checks/ に保存されています。")
+                return False
+            
+            print(f"\n✅ 品質チェック合格！WordPressへの投稿を続行します...")
+            
+            # 修正後のコンテンツを使用
+            wp_content = corrected_wp_content
+            
+            # アップロード完了を待機
+            eyecatch_image_id = wait_eyecatch_upload(eyecatch_future)
+            chapter_images = wait_chapter_uploads(chapter_futures)
         
         # 章別画像を挿入
         if chapter_images:
             print(f"🖼️  {len(chapter_images)}個の章別画像を記事に挿入中...")
             wp_content = insert_chapter_images(wp_content, chapter_images)
         
-        # =========================
-        # 🔍 WordPress投稿前品質チェック実行
-        # =========================
-        print(f"\n🔍 WordPress投稿前品質チェック・自動修正を実行中...")
-        
-        # 品質チェック実行
-        corrected_wp_content, can_proceed = run_pre_wordpress_quality_check(
-            wp_content,
-            cleaned_content,
-            chapter_images,
-            title
-        )
-        
-        # 投稿可否判定
-        if not can_proceed:
-            print(f"\n❌ 品質チェックでエラーが検出されました。")
-            print(f"📋 品質問題を解決後に再実行してください。")
-            print(f"💾 修正すべきコンテンツは tmp/quality_checks/ に保存されています。")
-            return False
-        
-        print(f"\n✅ 品質チェック合格！WordPressへの投稿を続行します...")
-        
-        # 修正後のコンテンツを使用
-        wp_content = corrected_wp_content
-        
         # =========================
         # WordPress投稿実行
         # =========================
@@ -288,11 +330,13 @@ def post_blog_universal_with_quality_check():
             excerpt=excerpt,
             meta_description=meta_description,
             status="draft",
-            featured_image_id=eyecatch_image_id
+            featured_image_id=eyecatch_image_id,
+            # 検索意図ID（outputs/記事名-INT-01 等）を記事に記録し記事カタログで絞り込めるようにする
+            intent_ids=extract_intent_ids(os.path.relpath(markdown_file, outputs_dir))
         )
         
         if result:
-            print(f"\n🎉 記事投稿完了\!")
+            print(f"\n🎉 記事投稿完了!")
             print(f"📝 投稿ID: {result.get('post_id')}")
             print(f"🔗 編集URL: {result.get('edit_url')}")
             print(f"📊 ステータス: 下書き")
@@ -337,4 +381,3 @@ if __name__ == "__main__":
     else:
         print("\n❌ 処理が失敗しました。")
         print("📋 品質チェック結果を確認してください")
-EOF < /dev/null
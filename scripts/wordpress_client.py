@@ -11,19 +11,39 @@ Claude CodeからWordPressプラグインAPIを呼び出して記事を作成す
 """
 
 import os
+import sys
 import requests
 import json
 import re
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.wordpress_session import get_wordpress_session, get_wordpress_settings, wordpress_timeout
+from utils.upload_registry import DEFAULT_REGISTRY_PATH, UploadRegistry, site_from_endpoint
+from utils.conversion_cache import ConversionCache
+from utils.request_compression import RequestBodyEncoder
 
 # 環境変数読み込み
 load_dotenv()
 
+# Markdown→Gutenberg変換キャッシュ（初回変換時に生成）
+_conversion_cache: Optional[ConversionCache] = None
+
 class WordPressClient:
     """WordPressプラグインAPI クライアント"""
     
-    def __init__(self):
+    def __init__(self, data_dir: Optional[Union[str, Path]] = None):
+        """
+        初期化
+        
+        Args:
+            data_dir: アップロード台帳の保存先ディレクトリ（Noneの場合は outputs/）
+        """
         self.api_key = os.getenv('WORDPRESS_API_KEY')
         self.endpoint = os.getenv('WORDPRESS_ENDPOINT')
         
@@ -36,6 +56,21 @@ class WordPressClient:
             'Content-Type': 'application/json',
             'X-API-Key': self.api_key
         }
+        
+        # 共有HTTPセッション（keep-alive接続を再利用）
+        self.session = get_wordpress_session()
+        self.timeout = wordpress_timeout()
+        self.upload_timeout = wordpress_timeout(upload=True)
+        
+        # アップロード重複排除（SHA-256 → 添付ファイル）
+        settings = get_wordpress_settings()
+        self.site = site_from_endpoint(self.endpoint)
+        registry_path = Path(data_dir) / DEFAULT_REGISTRY_PATH.name if data_dir else DEFAULT_REGISTRY_PATH
+        self.upload_registry = UploadRegistry(registry_path) if settings['upload_dedupe'] else None
+        self.verify_existing_uploads = settings['upload_dedupe_verify']
+        
+        # 記事本文のgzip圧縮（プラグインの対応は初回送信時に /usage で確認）
+        self.body_encoder = RequestBodyEncoder.from_settings(settings)
     
     def create_post(self, 
                    title: str, 
@@ -43,7 +78,8 @@ class WordPressClient:
                    excerpt: str = "", 
                    meta_description: str = "",
                    status: str = "draft",
-                   featured_image_id: Optional[int] = None) -> Dict[str, Any]:
+                   featured_image_id: Optional[int] = None,
+                   intent_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         WordPressに記事を作成
         
@@ -54,6 +90,7 @@ class WordPressClient:
             meta_description: SEO用メタディスクリプション
             status: 投稿ステータス (draft, publish, private)
             featured_image_id: アイキャッチ画像のID
+            intent_ids: 検索意図ID（INT-01 形式、記事カタログの絞り込みに使用）
         
         Returns:
             作成結果とメタデータ
@@ -69,6 +106,8 @@ class WordPressClient:
         
         if featured_image_id:
             data['featured_image_id'] = featured_image_id
+        if intent_ids:
+            data['intent_ids'] = intent_ids
         
         try:
             print(f"📝 WordPress記事作成中...")
@@ -76,11 +115,16 @@ class WordPressClient:
             print(f"   ステータス: {status}")
             print(f"   エンドポイント: {self.endpoint}/create-post")
             
-            response = requests.post(
+            self.body_encoder.negotiate_with(self.session, self.endpoint, self.headers, self.timeout)
+            body, headers = self.body_encoder.encode(data, self.headers)
+            if 'Content-Encoding' in headers:
+                print(f"   送信サイズ: {len(body) / 1024:.1f}KB (gzip)")
+            
+            response = self.session.post(
                 f"{self.endpoint}/create-post",
-                headers=self.headers,
-                json=data,
-                timeout=30
+                headers=headers,
+                data=body,
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -107,20 +151,26 @@ class WordPressClient:
             使用統計データ
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.endpoint}/usage",
                 headers=self.headers,
-                timeout=10
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                return response.json()
+                usage = response.json()
+                self.body_encoder.negotiate(usage)
+                return usage
             else:
                 raise Exception(f"使用状況取得エラー: {response.status_code}")
                 
         except requests.exceptions.RequestException as e:
             raise Exception(f"接続エラー: {str(e)}")
     
+    def get_transfer_stats(self) -> Dict[str, Any]:
+        """送信量統計（raw_bytes: 圧縮前, wire_bytes: 実送信, compressed: gzip送信件数, saved_ratio）"""
+        return self.body_encoder.get_stats()
+    
     def test_connection(self) -> bool:
         """
         WordPress プラグインへの接続テスト
@@ -147,10 +197,28 @@ class WordPressClient:
             print("4. WordPressサイトがアクセス可能か")
             return False
 
+    def attachment_exists(self, attachment_id: int) -> bool:
+        """
+        メディアライブラリに添付ファイルが残っているか（WordPress標準API、IDのみ取得）
+        
+        確認できない場合はFalse（再アップロード側に倒す）
+        """
+        try:
+            response = self.session.get(
+                f"{self.site}/wp-json/wp/v2/media/{attachment_id}",
+                params={'_fields': 'id'},
+                timeout=self.timeout
+            )
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
     def upload_image(self, image_path: str, alt_text: str = "") -> Optional[Dict[str, Any]]:
         """
         画像をWordPressにアップロード（WordPress Media API互換）
         
+        同じ内容（SHA-256）の画像がアップロード済みの場合は既存の添付ファイルを返す
+        
         Args:
             image_path: ローカル画像ファイルのパス
             alt_text: 画像のalt属性
@@ -170,47 +238,68 @@ class WordPressClient:
             print(f"   エンドポイント: {upload_endpoint}")
             
             with open(image_path, 'rb') as f:
-                files = {
-                    'file': (os.path.basename(image_path), f, 'image/png')
-                }
-                headers = {
-                    'X-API-Key': self.api_key
-                }
-                
-                response = requests.post(
-                    upload_endpoint,
-                    headers=headers,
-                    files=files,
-                    timeout=60
+                image_data = f.read()
+            
+            # 同じ内容の画像がアップロード済みなら再利用
+            image_hash = None
+            if self.upload_registry:
+                image_hash = UploadRegistry.hash_bytes(image_data)
+                existing = self.upload_registry.lookup(
+                    image_hash, self.site,
+                    exists=self.attachment_exists if self.verify_existing_uploads else None
                 )
+                if existing:
+                    print(f"♻️  アップロード済みの画像を再利用 (ID: {existing['attachment_id']})")
+                    return {
+                        'attachment_id': existing['attachment_id'],
+                        'url': existing['url']
+                    }
+            
+            files = {
+                'file': (os.path.basename(image_path), image_data, 'image/png')
+            }
+            headers = {
+                'X-API-Key': self.api_key
+            }
+            
+            response = self.session.post(
+                upload_endpoint,
+                headers=headers,
+                files=files,
+                timeout=self.upload_timeout
+            )
+            
+            print(f"   レスポンスコード: {response.status_code}")
+            
+            if response.status_code == 200:
+                result = response.json()
+                print(f"✅ 画像アップロード成功!")
                 
-                print(f"   レスポンスコード: {response.status_code}")
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    print(f"✅ 画像アップロード成功!")
-                    
-                    # CozeのJSコードと同じレスポンス形式を期待
-                    if 'source_url' in result and 'id' in result:
-                        print(f"   画像ID: {result.get('id')}")
-                        print(f"   URL: {result.get('source_url')}")
-                        return {
-                            'attachment_id': result.get('id'),
-                            'url': result.get('source_url')
-                        }
-                    # 従来のレスポンス形式もサポート
-                    elif 'attachment_id' in result:
-                        print(f"   画像ID: {result.get('attachment_id')}")
-                        print(f"   URL: {result.get('url')}")
-                        return result
-                    else:
-                        print(f"❌ 予期しないレスポンス形式: {result}")
-                        return None
+                # CozeのJSコードと同じレスポンス形式を期待
+                if 'source_url' in result and 'id' in result:
+                    print(f"   画像ID: {result.get('id')}")
+                    print(f"   URL: {result.get('source_url')}")
+                    result = {
+                        'attachment_id': result.get('id'),
+                        'url': result.get('source_url')
+                    }
+                # 従来のレスポンス形式もサポート
+                elif 'attachment_id' in result:
+                    print(f"   画像ID: {result.get('attachment_id')}")
+                    print(f"   URL: {result.get('url')}")
                 else:
-                    error_text = response.text
-                    print(f"❌ 画像アップロード失敗: {response.status_code}")
-                    print(f"   エラー詳細: {error_text}")
+                    print(f"❌ 予期しないレスポンス形式: {result}")
                     return None
+                
+                if image_hash:
+                    self.upload_registry.record(image_hash, self.site, result['attachment_id'],
+                                                result.get('url'), os.path.basename(image_path))
+                return result
+            else:
+                error_text = response.text
+                print(f"❌ 画像アップロード失敗: {response.status_code}")
+                print(f"   エラー詳細: {error_text}")
+                return None
                     
         except Exception as e:
             print(f"❌ 画像アップロードエラー: {str(e)}")
@@ -625,6 +714,17 @@ def convert_markdown_to_gutenberg(markdown_content: str, debug: bool = False) ->
     
     return content
 
+def convert_markdown_to_gutenberg_cached(markdown_content: str, debug: bool = False) -> str:
+    """
+    convert_markdown_to_gutenberg の変換キャッシュ付き版
+    
+    同じMarkdown・同じ変換器の結果はディスクキャッシュ（tmp/cache/gutenberg_conversions）から返す
+    """
+    global _conversion_cache
+    if _conversion_cache is None:
+        _conversion_cache = ConversionCache.from_settings(get_wordpress_settings())
+    return _conversion_cache.convert(markdown_content, convert_markdown_to_gutenberg, debug=debug)
+
 def insert_chapter_images(wp_content: str, chapter_images: list) -> str:
     """
     WordPressブロック形式のコンテンツに章別画像を挿入
@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+WordPressプラグイン スタンドインサーバー
+blog-generator.php の REST ルート（create-post, upload-image, update-post, patch-post, get-post,
+backup-post, restore-post, search-posts, list-posts, analytics, usage、gzip圧縮された本文）と、クライアントが確認に使う
+WordPress標準API（/wp/v2/media/{id}, /wp/v2/posts/{id}）を同じリクエスト・レスポンス形式で
+インメモリ実装する。ライブサイトなしでクライアントの性能計測・回帰確認に使う
+
+遅延・エラー率・429（ランダム / レート制限）を注入できる
+
+Usage:
+    python scripts/wordpress_standin_server.py --port 8080 --latency-ms 40 --error-rate 0.01
+    # 別ターミナルで WORDPRESS_ENDPOINT=http://127.0.0.1:8080/wp-json/blog-generator/v1
+    #               WORDPRESS_API_KEY=standin を設定してクライアントを実行
+"""
+
+import re
+import sys
+import gzip
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import default as default_email_policy
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.content_diff import apply_block_patch, content_hash
+
+PLUGIN_NAMESPACE = '/wp-json/blog-generator/v1'
+DEFAULT_API_KEY = 'standin'
+
+# (メソッド, パス, ハンドラー名)
+ROUTES = [
+    (('POST',), PLUGIN_NAMESPACE + r'/create-post', 'create_post'),
+    (('GET',), PLUGIN_NAMESPACE + r'/usage', 'get_usage'),
+    (('POST',), PLUGIN_NAMESPACE + r'/upload-image', 'upload_image'),
+    (('PUT', 'POST'), PLUGIN_NAMESPACE + r'/update-post/(?P<id>\d+)', 'update_post'),
+    (('POST',), PLUGIN_NAMESPACE + r'/patch-post/(?P<id>\d+)', 'patch_post'),
+    (('GET',), PLUGIN_NAMESPACE + r'/get-post/(?P<id>\d+)', 'get_post'),
+    (('POST',), PLUGIN_NAMESPACE + r'/backup-post/(?P<id>\d+)', 'backup_post'),
+    (('POST',), PLUGIN_NAMESPACE + r'/restore-post/(?P<id>\d+)', 'restore_post'),
+    (('GET',), PLUGIN_NAMESPACE + r'/search-posts', 'search_posts'),
+    (('GET',), PLUGIN_NAMESPACE + r'/list-posts', 'list_posts'),
+    (('GET',), PLUGIN_NAMESPACE + r'/analytics/(?P<id>\d+)', 'get_analytics'),
+    (('GET',), r'/wp-json/wp/v2/media/(?P<id>\d+)', 'wp_get_media'),
+    (('GET',), r'/wp-json/wp/v2/posts/(?P<id>\d+)', 'wp_get_post'),
+]
+COMPILED_ROUTES = [(methods, re.compile(pattern + r'$'), name) for methods, pattern, name in ROUTES]
+
+# 認証不要のWordPress標準API
+PUBLIC_ROUTES = ('wp_get_media', 'wp_get_post')
+
+
+class StandInError(Exception):
+    """WP_Error 相当（code, message, status）"""
+
+    def __init__(self, code: str, message: str, status: int, **data):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.data = data
+
+
+@dataclass
+class FaultConfig:
+    """注入する障害"""
+    latency_ms: float = 0.0      # 全リクエストに加える遅延
+    jitter_ms: float = 0.0       # 遅延のゆらぎ（0〜jitter_ms を一様に加算）
+    error_rate: float = 0.0      # 500 を返す割合
+    throttle_rate: float = 0.0   # 429 を返す割合
+    rate_limit: float = 0.0      # 1秒あたりの許容リクエスト数（超過分は429、0で無制限）
+
+
+def _now() -> Tuple[float, str]:
+    """(UNIX時刻, WordPress形式の日時)"""
+    now = time.time()
+    return now, datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class StandInState:
+    """記事・添付ファイル・バックアップ・使用状況のインメモリ状態（ルート処理を実装）"""
+
+    def __init__(self, site: str = 'http://127.0.0.1'):
+        self.site = site
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.attachments: Dict[int, Dict[str, Any]] = {}
+        self.backups: Dict[str, Dict[str, Any]] = {}
+        self.usage = {'today_count': 0, 'total_count': 0, 'last_used': ''}
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+    def _allocate_id(self) -> int:
+        post_id = self._next_id
+        self._next_id += 1
+        return post_id
+
+    def _require_post(self, post_id: int) -> Dict[str, Any]:
+        post = self.posts.get(post_id)
+        if post is None:
+            raise StandInError('post_not_found', '指定された記事が見つかりません', 404)
+        return post
+
+    def _touch(self, post: Dict[str, Any]):
+        post['modified_ts'], post['modified'] = _now()
+        post['modified_gmt'] = datetime.fromtimestamp(post['modified_ts'], timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    def add_post(self, title: str, content: str, status: str = 'draft', **fields) -> int:
+        """記事を直接追加（負荷試験の初期データ用）"""
+        return self.create_post({'title': title, 'content': content, 'status': status, **fields},
+                                count_usage=False)['post_id']
+
+    # ---- blog-generator/v1 ----
+
+    def create_post(self, params: Dict[str, Any], count_usage: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            post_id = self._allocate_id()
+            title = params.get('title') or ''
+            post = {
+                'id': post_id,
+                'title': title,
+                'content': params.get('content') or '',
+                'excerpt': params.get('excerpt') or '',
+                'status': params.get('status') or 'draft',
+                'created': None,
+                'author': '1',
+                'slug': re.sub(r'\s+', '-', title.strip().lower()),
+                'meta_description': params.get('meta_description') or '',
+                'featured_image_id': int(params.get('featured_image_id') or 0),
+                'intent_ids': [intent_id for intent_id in params.get('intent_ids') or []
+                               if re.fullmatch(r'INT-\d+', str(intent_id))]
+            }
+            self._touch(post)
+            post['created'] = post['modified']
+            self.posts[post_id] = post
+            if count_usage:
+                self.usage['today_count'] += 1
+                self.usage['total_count'] += 1
+                self.usage['last_used'] = post['modified']
+        return {
+            'success': True,
+            'post_id': post_id,
+            'edit_url': f"{self.site}/wp-admin/post.php?action=edit&post={post_id}",
+            'preview_url': f"{self.site}/?p={post_id}&preview=true"
+        }
+
+    def get_usage(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.usage, request_encodings=['gzip'])
+
+    def upload_image(self, params: Dict[str, Any], files: Dict[str, Tuple[str, bytes]]) -> Dict[str, Any]:
+        if 'file' not in files:
+            raise StandInError('no_file', 'ファイルがアップロードされていません', 400)
+        filename, data = files['file']
+        alt_text = params.get('alt_text') or ''
+        with self._lock:
+            attachment_id = self._allocate_id()
+            url = f"{self.site}/wp-content/uploads/{attachment_id}-{filename}"
+            self.attachments[attachment_id] = {'id': attachment_id, 'url': url, 'size': len(data),
+                                               'alt_text': alt_text}
+        return {'success': True, 'attachment_id': attachment_id, 'url': url, 'alt_text': alt_text}
+
+    def update_post(self, post_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            post = self._require_post(post_id)
+            backup_id = None
+            if params.get('backup') is True:
+                backup_id = self._create_backup(post_id, post, {})['backup_id']
+
+            for field in ('title', 'content', 'excerpt', 'status', 'meta_description'):
+                if params.get(field) is not None:
+                    post[field] = params[field]
+            featured_image_id = params.get('featured_image_id')
+            if featured_image_id is not None and str(featured_image_id).lstrip('-').isdigit():
+                post['featured_image_id'] = max(0, int(featured_image_id))
+            self._touch(post)
+
+            featured_id = post['featured_image_id']
+            featured_url = self.attachments.get(featured_id, {}).get('url') if featured_id else None
+            return {
+                'success': True,
+                'post_id': post_id,
+                'backup_id': backup_id,
+                'modified_time': post['modified'],
+                'edit_link': f"{self.site}/wp-admin/post.php?action=edit&post={post_id}",
+                'preview_url': f"{self.site}/?p={post_id}&preview=true",
+                'update_strategy': params.get('update_strategy') or 'full',
+                'featured_image': {
+                    'id': featured_id,
+                    'url': featured_url,
+                    'updated': featured_image_id is not None
+                }
+            }
+
+    def patch_post(self, post_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            post = self._require_post(post_id)
+            base_hash = params.get('base_hash')
+            patches = params.get('patches')
+            if not isinstance(base_hash, str) or not isinstance(patches, list):
+                raise StandInError('invalid_patch', 'base_hash と patches を指定してください', 400)
+
+            current_hash = content_hash(post['content'])
+            if current_hash != base_hash:
+                raise StandInError('update_conflict', '記事が取得時点から更新されています', 409,
+                                   current_hash=current_hash)
+            try:
+                content = apply_block_patch(post['content'], params)
+            except ValueError as e:
+                raise StandInError('update_conflict', str(e), 409)
+
+            result = self.update_post(post_id, dict(params, content=content))
+            result['patched_blocks'] = len(patches)
+            result['content_hash'] = content_hash(post['content'])
+            return result
+
+    def _post_data(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """get-post のレスポンスデータ"""
+        data = {key: post[key] for key in ('id', 'title', 'content', 'excerpt', 'status', 'modified',
+                                           'created', 'author', 'slug')}
+        if post['meta_description']:
+            data['meta_description'] = post['meta_description']
+        featured_id = post['featured_image_id']
+        data['featured_media'] = featured_id
+        if featured_id:
+            data['featured_image_id'] = featured_id
+            data['featured_image_url'] = self.attachments.get(featured_id, {}).get('url')
+        return data
+
+    def get_post(self, post_id: int, headers) -> Tuple[int, Optional[Dict[str, Any]], Dict[str, str]]:
+        """記事取得（ETag / Last-Modified による条件付きGET）"""
+        with self._lock:
+            post = self._require_post(post_id)
+            data = self._post_data(post)
+            modified_ts = post['modified_ts']
+
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        response_headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(modified_ts, usegmt=True),
+            'Cache-Control': 'private, no-cache'
+        }
+
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match is not None:
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(',')]
+        else:
+            from email.utils import parsedate_to_datetime
+            since = headers.get('If-Modified-Since')
+            try:
+                not_modified = since is not None and int(modified_ts) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                not_modified = False
+        return (304, None, response_headers) if not_modified else (200, data, response_headers)
+
+    def _create_backup(self, post_id: int, post: Dict[str, Any], additional_data: Dict[str, Any]) -> Dict[str, Any]:
+        _, created_at = _now()
+        backup_id = f"backup_{post_id}_{int(time.time())}_{random.getrandbits(32):08x}"
+        self.backups[backup_id] = {
+            'post_id': post_id,
+            'post': dict(post),
+            'backup_created': created_at,
+            'additional_data': additional_data
+        }
+        return {'backup_id': backup_id, 'created_at': created_at, 'post_title': post['title']}
+
+    def backup_post(self, post_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return self._create_backup(post_id, self._require_post(post_id), params)
+
+    def restore_post(self, post_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        backup_id = params.get('backup_id')
+        if not backup_id:
+            raise StandInError('invalid_backup', 'バックアップIDが指定されていません', 400)
+        with self._lock:
+            backup = self.backups.get(backup_id)
+            if backup is None:
+                raise StandInError('restore_failed', 'バックアップの復元に失敗しました: バックアップが見つかりません', 500)
+            if backup['post_id'] != post_id:
+                raise StandInError('restore_failed', 'バックアップの復元に失敗しました: バックアップの記事IDが一致しません', 500)
+            post = self._require_post(post_id)
+            for field in ('title', 'content', 'excerpt', 'status', 'meta_description', 'featured_image_id'):
+                post[field] = backup['post'][field]
+            self._touch(post)
+            return {
+                'post_id': post_id,
+                'backup_id': backup_id,
+                'restored_time': post['modified'],
+                'restored_title': post['title']
+            }
+
+    def search_posts(self, params: Dict[str, Any]) -> list:
+        title = params.get('title')
+        if not title:
+            return []
+        fuzzy = params.get('fuzzy') != 'false'
+        results = []
+        with self._lock:
+            for post in sorted(self.posts.values(), key=lambda p: p['modified_ts'], reverse=True):
+                if post['status'] not in ('publish', 'draft'):
+                    continue
+                if title in post['title'] or title in post['content'] or (fuzzy and title in post['meta_description']):
+                    plain = re.sub(r'<[^>]+>', ' ', post['content'])
+                    results.append({
+                        'id': post['id'],
+                        'title': post['title'],
+                        'status': post['status'],
+                        'modified': post['modified'],
+                        'excerpt': ' '.join(plain.split()[:20])
+                    })
+                    if len(results) == 10:
+                        break
+        return results
+
+    def list_posts(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """(modified_gmt, id) が (modified_after, after_id) より後の記事を更新日時順に返す"""
+        per_page = min(100, max(1, int(params.get('per_page') or 100)))
+        cursor = (params.get('modified_after') or '', int(params.get('after_id') or 0))
+        with self._lock:
+            posts = sorted((post for post in self.posts.values() if (post['modified_gmt'], post['id']) > cursor),
+                           key=lambda post: (post['modified_gmt'], post['id']))
+            page = [{
+                'id': post['id'],
+                'title': post['title'],
+                'slug': post['slug'],
+                'status': post['status'],
+                'modified': post['modified'],
+                'modified_gmt': post['modified_gmt'],
+                'featured_media': post['featured_image_id'],
+                'meta_description': post['meta_description'],
+                'intent_ids': list(post['intent_ids']),
+                'content': post['content']
+            } for post in posts[:per_page]]
+        return {'posts': page, 'has_more': len(posts) > per_page}
+
+    def get_analytics(self, post_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            post = self._require_post(post_id)
+            content = post['content']
+            plain = re.sub(r'<[^>]+>', '', content)
+            return {
+                'post_id': post_id,
+                'word_count': len(re.findall(r'[A-Za-z\'-]+', plain)),
+                'character_count': len(plain),
+                'paragraph_count': content.count('</p>'),
+                'last_modified': post['modified'],
+                'status': post['status'],
+                'heading_count': {level: content.count(f'<{level}') for level in ('h2', 'h3', 'h4')},
+                'has_featured_image': bool(post['featured_image_id'])
+            }
+
+    # ---- wp/v2 ----
+
+    def wp_get_media(self, attachment_id: int) -> Dict[str, Any]:
+        with self._lock:
+            attachment = self.attachments.get(attachment_id)
+        if attachment is None:
+            raise StandInError('rest_post_invalid_id', '投稿 ID が無効です。', 404)
+        return {'id': attachment_id, 'source_url': attachment['url']}
+
+    def wp_get_post(self, post_id: int) -> Dict[str, Any]:
+        with self._lock:
+            post = self.posts.get(post_id)
+            if post is None or post['status'] != 'publish':
+                raise StandInError('rest_post_invalid_id', '投稿 ID が無効です。', 404)
+            return {'id': post_id, 'title': {'rendered': post['title']},
+                    'featured_media': post['featured_image_id'], 'modified': post['modified']}
+
+
+class FaultInjector:
+    """遅延・500・429 の注入とレート制限（トークンバケット）"""
+
+    def __init__(self, config: FaultConfig, seed: Optional[int] = None):
+        self.config = config
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = config.rate_limit
+        self._refilled_at = time.monotonic()
+
+    def delay(self):
+        if self.config.latency_ms or self.config.jitter_ms:
+            with self._lock:
+                jitter = self._random.uniform(0, self.config.jitter_ms)
+            time.sleep((self.config.latency_ms + jitter) / 1000)
+
+    def _rate_limited(self) -> bool:
+        if not self.config.rate_limit:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.config.rate_limit,
+                           self._tokens + (now - self._refilled_at) * self.config.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def choose(self) -> Optional[str]:
+        """注入する障害（'rate_limit' / 'throttle' / 'error'）またはNone"""
+        with self._lock:
+            if self._rate_limited():
+                return 'rate_limit'
+            roll = self._random.random()
+        if roll < self.config.throttle_rate:
+            return 'throttle'
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return 'error'
+        return None
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """ルーティング・認証・障害注入"""
+
+    protocol_version = 'HTTP/1.1'
+    # keep-alive接続での遅延ACK待ちを避ける（本番の nginx tcp_nodelay 相当）
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def _handle(self, method: str):
+        server = self.server
+        started = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        url = urlsplit(self.path)
+        route = next(((name, match) for methods, pattern, name in COMPILED_ROUTES
+                      if method in methods for match in [pattern.match(url.path)] if match), None)
+        route_name = route[0] if route else 'unknown'
+
+        server.faults.delay()
+        fault = server.faults.choose()
+        try:
+            if fault in ('rate_limit', 'throttle'):
+                raise StandInError('rest_too_many_requests', 'リクエストが多すぎます', 429)
+            if fault == 'error':
+                raise StandInError('internal_server_error', 'サーバーエラーが発生しました（注入）', 500)
+            if route is None:
+                raise StandInError('rest_no_route', 'URL とリクエストメソッドに一致するルートが見つかりません。', 404)
+            if route_name not in PUBLIC_ROUTES and self.headers.get('X-API-Key') != server.api_key:
+                raise StandInError('unauthorized', 'Invalid API key', 401)
+            body = self._decode_body(body)
+            status, payload, headers = self._dispatch(route_name, route[1], url, body)
+        except StandInError as e:
+            status, headers = e.status, {'Retry-After': '1'} if e.status == 429 else {}
+            payload = {'code': e.code, 'message': str(e), 'data': dict(e.data, status=e.status)}
+        except Exception as e:
+            status, headers = 500, {}
+            payload = {'code': 'internal_server_error', 'message': str(e), 'data': {'status': 500}}
+
+        self._send(status, payload, headers)
+        server.record(route_name, status, fault, time.perf_counter() - started)
+
+    def _dispatch(self, route_name: str, match, url, body: bytes):
+        state: StandInState = self.server.state
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        files = {}
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/json') and body:
+            params.update(json.loads(body))
+        elif content_type.startswith('multipart/form-data'):
+            params_from_form, files = self._parse_multipart(content_type, body)
+            params.update(params_from_form)
+
+        resource_id = int(match.group('id')) if 'id' in match.groupdict() else None
+        if route_name == 'get_post':
+            return state.get_post(resource_id, self.headers)
+        if route_name == 'upload_image':
+            return 200, state.upload_image(params, files), {}
+        if route_name in ('wp_get_media', 'wp_get_post'):
+            return 200, getattr(state, route_name)(resource_id), {}
+        handler = getattr(state, route_name)
+        result = handler(resource_id, params) if resource_id is not None else handler(params)
+        return 200, result, {}
+
+    def _decode_body(self, body: bytes) -> bytes:
+        """Content-Encoding: gzip の本文を展開（プラグインの decode_request_body 相当）"""
+        encoding = self.headers.get('Content-Encoding', '').strip().lower()
+        if encoding in ('', 'identity'):
+            return body
+        if encoding != 'gzip':
+            raise StandInError('unsupported_encoding', f'対応していないContent-Encodingです: {encoding}', 415)
+        try:
+            return gzip.decompress(body)
+        except (OSError, EOFError):
+            raise StandInError('invalid_encoding', 'リクエスト本文のgzip展開に失敗しました', 400)
+
+    @staticmethod
+    def _parse_multipart(content_type: str, body: bytes):
+        """multipart/form-data を (フォーム値, {name: (filename, bytes)}) に分解"""
+        message = BytesParser(policy=default_email_policy).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode('latin-1') + body
+        )
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            if part.get_filename() is not None:
+                files[name] = (part.get_filename(), part.get_payload(decode=True))
+            else:
+                fields[name] = part.get_content()
+        return fields, files
+
+    def _send(self, status: int, payload, headers: Dict[str, str]):
+        body = b'' if status == 304 else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """状態・障害設定・リクエスト統計を持つスタンドインサーバー"""
+
+    daemon_threads = True
+
+    def __init__(self, address, state: StandInState, faults: FaultInjector, api_key: str):
+        super().__init__(address, StandInRequestHandler)
+        self.state = state
+        self.faults = faults
+        self.api_key = api_key
+        self._stats_lock = threading.Lock()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.injected = Counter()
+        self.server_seconds = 0.0
+
+    def record(self, route_name: str, status: int, fault: Optional[str], elapsed: float):
+        with self._stats_lock:
+            self.requests[route_name] += 1
+            self.statuses[status] += 1
+            if fault:
+                self.injected[fault] += 1
+            self.server_seconds += elapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ルート別リクエスト数・ステータス別件数・注入した障害"""
+        with self._stats_lock:
+            return {'requests': dict(self.requests), 'statuses': dict(self.statuses),
+                    'injected': dict(self.injected), 'server_seconds': self.server_seconds}
+
+
+def start_standin_server(host: str = '127.0.0.1', port: int = 0, api_key: str = DEFAULT_API_KEY,
+                         faults: Optional[FaultConfig] = None, seed: Optional[int] = None):
+    """
+    スタンドインサーバーをバックグラウンドスレッドで起動
+
+    Returns:
+        (server, WORDPRESS_ENDPOINT に設定するURL)
+    """
+    state = StandInState()
+    server = StandInServer((host, port), state, FaultInjector(faults or FaultConfig(), seed), api_key)
+    state.site = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{state.site}{PLUGIN_NAMESPACE}"
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """障害注入オプション（負荷試験スクリプトと共通）"""
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform random extra latency (0..N ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help='Requests per second before answering 429 (0 = unlimited)')
+
+
+def fault_config_from_args(args: argparse.Namespace) -> FaultConfig:
+    return FaultConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                       throttle_rate=args.throttle_rate, rate_limit=args.rate_limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the blog-generator WordPress plugin')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--api-key', default=DEFAULT_API_KEY)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server, endpoint = start_standin_server(args.host, args.port, args.api_key, fault_config_from_args(args))
+    print("🧪 WordPress plugin stand-in running")
+    print(f"   WORDPRESS_ENDPOINT={endpoint}")
+    print(f"   WORDPRESS_API_KEY={args.api_key}")
+    print("   Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(server.get_stats(), ensure_ascii=False)}")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
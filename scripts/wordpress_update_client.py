@@ -7,13 +7,32 @@ POSTメソッド使用（WordPressの仕様に準拠）
 """
 
 import os
+import sys
 import requests
 import json
 import re
+import time
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union
 from dotenv import load_dotenv
-from difflib import SequenceMatcher
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from utils.wordpress_session import get_wordpress_session, get_wordpress_settings, wordpress_timeout
+from utils.content_diff import calculate_diff_ratio, build_block_patch
+from utils.post_cache import PostCache
+from utils.post_catalog import DEFAULT_CATALOG_PATH, PostCatalog
+from utils.request_compression import RequestBodyEncoder
+from utils.update_history import DEFAULT_HISTORY_PATH, UpdateHistoryStore
+from utils.upload_registry import site_from_endpoint
 
 # 環境変数読み込み
 load_dotenv()
@@ -34,15 +53,23 @@ class UpdateConflictError(WordPressUpdateError):
     """更新競合エラー"""
     pass
 
-class WordPressUpdateClient:
-    """次世代WordPress記事更新クライアント - Worker3拡張版"""
+class WordPressUpdateClientBase:
+    """
+    WordPress記事更新クライアント共通処理
+    更新戦略の判定・更新データ構築・履歴・エラー判定・Markdown変換など通信以外の処理を
+    同期版（WordPressUpdateClient）と非同期版（AsyncWordPressUpdateClient）で共有する
+    """
     
-    def __init__(self, integration_mode: bool = False):
+    # update_post で更新できる項目
+    UPDATE_FIELDS = ('title', 'content', 'excerpt', 'meta_description', 'status', 'featured_image_id')
+    
+    def __init__(self, integration_mode: bool = False, data_dir: Optional[Union[str, Path]] = None):
         """
         初期化
         
         Args:
             integration_mode: post_blog_universal.pyとの統合モード
+            data_dir: 更新履歴DB・記事カタログの保存先ディレクトリ（Noneの場合は outputs/）
         """
         self.api_key = os.getenv('WORDPRESS_API_KEY')
         self.endpoint = os.getenv('WORDPRESS_ENDPOINT')
@@ -57,21 +84,311 @@ class WordPressUpdateClient:
             'X-API-Key': self.api_key
         }
         
-        # 更新履歴管理
-        self.update_history = []
-        
         # 統合モード設定
         self.integration_mode = integration_mode
         
+        # 差分更新をブロックパッチ（patch-post）で送信（プラグイン未対応の場合は全体更新に切り替え）
+        self.block_patch_supported = True
+        
+        # 記事キャッシュ（get-post を条件付きGETで再検証）
+        self.site = site_from_endpoint(self.endpoint)
+        self.post_cache = PostCache.from_settings(get_wordpress_settings())
+        
+        # 記事本文を含むリクエストのgzip圧縮（プラグインの対応は初回送信時に /usage で確認）
+        self.body_encoder = RequestBodyEncoder.from_settings(get_wordpress_settings())
+        
+        # 更新履歴管理（outputs/update_history.db に追記、本文はハッシュのみ）
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.history_store = UpdateHistoryStore(self._data_path(DEFAULT_HISTORY_PATH))
+        
+        # 記事カタログ（outputs/post_catalog.db、sync_post_catalog で前回同期以降の更新分のみ取得）
+        self.post_catalog = PostCatalog(self._data_path(DEFAULT_CATALOG_PATH))
+        
         # Worker3拡張機能
         self.image_cache = {}
-        self.conversion_cache = {}
         self.validation_rules = {
             'title': {'min_length': 5, 'max_length': 200},
             'content': {'min_length': 500, 'max_length': 100000},
             'excerpt': {'max_length': 300}
         }
     
+    def _data_path(self, default_path: Path) -> Path:
+        """保存先ディレクトリ指定時はその中の同名ファイル"""
+        return self.data_dir / default_path.name if self.data_dir else default_path
+    
+    def _prepare_update_data(self, current_post: Optional[Dict[str, Any]], diff_update: bool,
+                             diff_ratio: Optional[float] = None, **fields) -> Dict[str, Any]:
+        """
+        差分更新判定と更新データ構築
+        
+        Args:
+            diff_ratio: 計算済みの変更率（Noneの場合はここで計算）
+        
+        Returns:
+            更新データ（update_strategy・timestamp付き）
+        """
+        # 4. 差分更新判定
+        content = fields.get('content')
+        update_strategy = "full"
+        if diff_update and content and current_post:
+            if diff_ratio is None:
+                diff_ratio = self._calculate_diff_ratio(current_post.get('content', ''), content)
+            if diff_ratio < 0.3:  # 30%未満の変更
+                update_strategy = "diff"
+                print(f"🔄 差分更新モード: 変更率 {diff_ratio:.1%}")
+            else:
+                print(f"📝 全体更新モード: 変更率 {diff_ratio:.1%}")
+        
+        # 5. 更新データ構築
+        update_data = self._build_update_data(**fields)
+        
+        if not update_data:
+            raise ValueError("更新するデータが指定されていません")
+        
+        update_data['update_strategy'] = update_strategy
+        update_data['timestamp'] = datetime.now().isoformat()
+        return update_data
+    
+    def _prepare_patch_data(self, current_post: Optional[Dict[str, Any]],
+                            update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        差分更新データをブロックパッチに変換
+        
+        Returns:
+            content の代わりに base_hash・block_count・patches を持つ更新データ
+            （差分更新でない、またはパッチを作成できない場合はNone）
+        """
+        if (not self.block_patch_supported or update_data.get('update_strategy') != 'diff'
+                or not update_data.get('content') or not current_post):
+            return None
+        
+        patch = build_block_patch(current_post.get('content', ''), update_data['content'])
+        if patch is None:
+            return None
+        
+        patch_data = {key: value for key, value in update_data.items() if key != 'content'}
+        patch_data.update(patch)
+        
+        full_size = len(json.dumps(update_data, ensure_ascii=False).encode('utf-8'))
+        patch_size = len(json.dumps(patch_data, ensure_ascii=False).encode('utf-8'))
+        print(f"🧩 ブロックパッチ: {len(patch['patches'])}件の変更 "
+              f"({patch_size / 1024:.1f}KB / 全体更新 {full_size / 1024:.1f}KB)")
+        return patch_data
+    
+    def _is_missing_route(self, response) -> bool:
+        """プラグインにエンドポイントがない（404 rest_no_route）か"""
+        if response.status_code != 404:
+            return False
+        try:
+            return response.json().get('code') == 'rest_no_route'
+        except ValueError:
+            return False
+    
+    def _complete_update(self, post_id: int, update_data: Dict[str, Any], result: Dict[str, Any],
+                         backup_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """更新成功時の履歴記録・結果表示"""
+        self._record_update_history(post_id, update_data, result, backup_result)
+        self.post_cache.forget(self.site, post_id)
+        
+        print(f"✅ 記事更新成功!")
+        print(f"   投稿ID: {result.get('post_id', post_id)}")
+        print(f"   更新時刻: {result.get('modified_time', 'Unknown')}")
+        print(f"   更新URL: {result.get('edit_link', 'N/A')}")
+        
+        return result
+    
+    def _read_markdown_update(self, markdown_file: str, image_dir: str = None):
+        """
+        Markdownファイルからタイトル・本文（WordPress形式）を取得
+        
+        Returns:
+            (タイトル, 本文)
+        """
+        print(f"📝 Markdownから記事更新: {markdown_file}")
+        
+        # Markdown読み込み
+        if not os.path.exists(markdown_file):
+            raise FileNotFoundError(f"Markdownファイルが見つかりません: {markdown_file}")
+        
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            markdown_content = f.read()
+        
+        # タイトル抽出
+        title_match = re.search(r'^#\s+(.+)$', markdown_content, re.MULTILINE)
+        title = title_match.group(1).strip() if title_match else None
+        
+        # コンテンツ変換（統合モード対応）
+        if self.integration_mode:
+            content = self._convert_markdown_integrated(markdown_content, image_dir)
+        else:
+            content = self._convert_markdown_basic(markdown_content)
+        
+        return title, content
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """記事キャッシュ統計（not_modified: 304で再利用, fetched: 本文を取得, revalidation_rate）"""
+        return self.post_cache.get_stats()
+    
+    def get_transfer_stats(self) -> Dict[str, Any]:
+        """送信量統計（raw_bytes: 圧縮前, wire_bytes: 実送信, compressed: gzip送信件数, saved_ratio）"""
+        return self.body_encoder.get_stats()
+    
+    def _print_cache_stats(self):
+        """記事キャッシュの再検証結果・送信量を表示"""
+        stats = self.get_cache_stats()
+        if stats['not_modified'] or stats['fetched']:
+            print(f"   記事キャッシュ: 304 {stats['not_modified']}件 / 取得 {stats['fetched']}件 "
+                  f"(再検証率 {stats['revalidation_rate']:.0%})")
+        if self.body_encoder.stats['requests']:
+            print(f"   送信量: {self.body_encoder.format_stats()}")
+    
+    def get_update_history(self, post_id: Optional[int] = None, since: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        更新履歴取得（古い順、本文は {'sha256', 'length'}）
+        
+        Args:
+            post_id: 投稿ID（Noneの場合は全記事）
+            since: この日時（ISO形式）以降の更新のみ
+            limit: 新しい方から最大件数（Noneで無制限）
+        """
+        return self.history_store.get_history(self.site, post_id, since=since, limit=limit)
+    
+    def _build_update_data(self, **kwargs) -> Dict[str, Any]:
+        """更新データ構築"""
+        update_data = {}
+        
+        for key, value in kwargs.items():
+            if value is not None:
+                update_data[key] = value
+        
+        return update_data
+    
+    def _calculate_diff_ratio(self, old_content: str, new_content: str) -> float:
+        """変更率計算"""
+        return calculate_diff_ratio(old_content, new_content)
+    
+    def _record_update_history(self, post_id: int, update_data: Dict[str, Any], 
+                              result: Dict[str, Any], backup_result: Optional[Dict[str, Any]]):
+        """更新履歴記録（記録失敗は更新結果に影響させない）"""
+        try:
+            self.history_store.record(
+                self.site, post_id, update_data, result,
+                backup_id=backup_result.get('backup_id') if backup_result else None
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️  更新履歴の記録失敗: {e}")
+    
+    def _handle_api_error(self, response):
+        """APIエラーハンドリング（requests / httpx のレスポンス共通）"""
+        try:
+            error_data = response.json()
+            error_code = error_data.get('code', 'unknown')
+            error_message = error_data.get('message', 'Unknown error')
+        except:
+            error_code = 'http_error'
+            error_message = response.text
+        
+        print(f"❌ API エラー: {response.status_code}")
+        print(f"   エラーコード: {error_code}")
+        print(f"   メッセージ: {error_message}")
+        
+        if response.status_code == 404:
+            raise PostNotFoundError(error_message)
+        elif response.status_code == 403:
+            raise InsufficientPermissionError(error_message)
+        elif response.status_code == 409:
+            raise UpdateConflictError(error_message)
+        else:
+            raise WordPressUpdateError(f"{error_code}: {error_message}")
+    
+    def validate_content(self, content_type: str, content: str) -> bool:
+        """
+        コンテンツ検証（Worker3品質管理機能）
+        """
+        if content_type not in self.validation_rules:
+            return True
+        
+        rules = self.validation_rules[content_type]
+        content_length = len(content.strip())
+        
+        if 'min_length' in rules and content_length < rules['min_length']:
+            raise ValueError(f"{content_type} が短すぎます: {content_length} < {rules['min_length']}")
+        
+        if 'max_length' in rules and content_length > rules['max_length']:
+            raise ValueError(f"{content_type} が長すぎます: {content_length} > {rules['max_length']}")
+        
+        return True
+    
+    def _convert_markdown_integrated(self, markdown_content: str, image_dir: str = None) -> str:
+        """
+        統合Markdown変換（post_blog_universal.py連携）
+        変換結果は post_blog_universal.py と共有のディスクキャッシュから再利用する
+        """
+        try:
+            # post_blog_universal.pyの変換機能を使用
+            sys.path.append('/mnt/c/home/hiroshi/blog_generator/scripts')
+            from scripts.wordpress_client import convert_markdown_to_gutenberg_cached, insert_chapter_images
+            
+            # 基本変換（キャッシュ付き）
+            gutenberg_content = convert_markdown_to_gutenberg_cached(markdown_content)
+            
+            # 画像挿入
+            if image_dir and os.path.exists(image_dir):
+                gutenberg_content = insert_chapter_images(gutenberg_content, image_dir)
+                print(f"🖼️  章画像挿入完了: {image_dir}")
+            
+            return gutenberg_content
+            
+        except ImportError as e:
+            print(f"⚠️  統合変換失敗、基本変換を使用: {e}")
+            return self._convert_markdown_basic(markdown_content)
+    
+    def _convert_markdown_basic(self, markdown_content: str) -> str:
+        """
+        基本Markdown変換
+        """
+        # 簡易的なMarkdown→HTML変換
+        content = markdown_content
+        
+        # 見出し変換
+        content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
+        content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
+        content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
+        
+        # 段落変換
+        paragraphs = content.split('\n\n')
+        converted_paragraphs = []
+        
+        for para in paragraphs:
+            para = para.strip()
+            if para and not para.startswith('<'):
+                para = f'<p>{para}</p>'
+            converted_paragraphs.append(para)
+        
+        return '\n\n'.join(converted_paragraphs)
+
+class WordPressUpdateClient(WordPressUpdateClientBase):
+    """次世代WordPress記事更新クライアント - Worker3拡張版"""
+    
+    def __init__(self, integration_mode: bool = False, data_dir: Optional[Union[str, Path]] = None):
+        """
+        初期化
+        
+        Args:
+            integration_mode: post_blog_universal.pyとの統合モード
+            data_dir: 更新履歴DB・記事カタログの保存先ディレクトリ（Noneの場合は outputs/）
+        """
+        super().__init__(integration_mode, data_dir)
+        
+        # 共有HTTPセッション（keep-alive接続を再利用）
+        self.session = get_wordpress_session()
+        self.timeout = wordpress_timeout()
+        
+        # 一括更新の差分計算プロセスプール（diff_workers 指定時のみ初回使用時に起動し、以降の呼び出しで再利用）
+        self._diff_pool: Optional[ProcessPoolExecutor] = None
+        self._diff_pool_lock = threading.Lock()
+    
     def update_post(self, 
                    post_id: int,
                    title: Optional[str] = None,
@@ -107,36 +424,15 @@ class WordPressUpdateClient:
             raise ValueError("有効な投稿IDを指定してください")
         
         # 2. 既存記事の取得
-        current_post = None
-        if diff_update or backup:
-            try:
-                current_post = self.get_post(post_id)
-                print(f"📖 既存記事取得完了: {current_post.get('title', 'Unknown')}")
-            except Exception as e:
-                print(f"⚠️  既存記事取得失敗: {str(e)}")
+        current_post = self._fetch_current_post(post_id) if diff_update or backup else None
         
         # 3. バックアップ作成（オプション）
-        backup_result = None
-        if backup and current_post:
-            try:
-                backup_result = self._create_backup(post_id, current_post)
-                print(f"📋 バックアップ作成完了: ID {backup_result.get('backup_id')}")
-            except Exception as e:
-                print(f"⚠️  バックアップ作成失敗: {str(e)}")
-        
-        # 4. 差分更新判定
-        update_strategy = "full"
-        if diff_update and content and current_post:
-            current_content = current_post.get('content', '')
-            diff_ratio = self._calculate_diff_ratio(current_content, content)
-            if diff_ratio < 0.3:  # 30%未満の変更
-                update_strategy = "diff"
-                print(f"🔄 差分更新モード: 変更率 {diff_ratio:.1%}")
-            else:
-                print(f"📝 全体更新モード: 変更率 {diff_ratio:.1%}")
+        backup_result = self._backup_current_post(post_id, current_post) if backup and current_post else None
         
-        # 5. 更新データ構築
-        update_data = self._build_update_data(
+        # 4-5. 差分更新判定・更新データ構築
+        update_data = self._prepare_update_data(
+            current_post,
+            diff_update,
             title=title,
             content=content,
             excerpt=excerpt,
@@ -145,34 +441,68 @@ class WordPressUpdateClient:
             featured_image_id=featured_image_id
         )
         
-        if not update_data:
-            raise ValueError("更新するデータが指定されていません")
-        
         # 6. API呼び出し実行
+        return self._send_update(post_id, update_data, backup_result, current_post)
+    
+    def _fetch_current_post(self, post_id: int) -> Optional[Dict[str, Any]]:
+        """既存記事の取得（失敗時はNone）"""
         try:
-            update_data['update_strategy'] = update_strategy
-            update_data['timestamp'] = datetime.now().isoformat()
-            
-            print(f"✏️  記事更新実行中... (戦略: {update_strategy})")
+            current_post = self.get_post(post_id)
+            print(f"📖 既存記事取得完了: {current_post.get('title', 'Unknown')}")
+            return current_post
+        except Exception as e:
+            print(f"⚠️  既存記事取得失敗: {str(e)}")
+            return None
+    
+    def _backup_current_post(self, post_id: int, current_post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """バックアップ作成（失敗時はNone）"""
+        try:
+            backup_result = self._create_backup(post_id, current_post)
+            print(f"📋 バックアップ作成完了: ID {backup_result.get('backup_id')}")
+            return backup_result
+        except Exception as e:
+            print(f"⚠️  バックアップ作成失敗: {str(e)}")
+            return None
+    
+    def _send_update(self, post_id: int, update_data: Dict[str, Any],
+                     backup_result: Optional[Dict[str, Any]],
+                     current_post: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        更新APIの呼び出し
+        
+        差分更新は変更ブロックのみ patch-post に送信し、取得時点から記事が更新されていた場合は
+        UpdateConflictError（409）
+        """
+        try:
+            print(f"✏️  記事更新実行中... (戦略: {update_data['update_strategy']})")
             print(f"   更新項目: {list(update_data.keys())}")
             
-            response = requests.post(
+            patch_data = self._prepare_patch_data(current_post, update_data)
+            if patch_data is not None:
+                body, headers = self._encode_json(patch_data)
+                response = self.session.post(
+                    f"{self.endpoint}/patch-post/{post_id}",
+                    headers=headers,
+                    data=body,
+                    timeout=self.timeout
+                )
+                if response.status_code == 200:
+                    return self._complete_update(post_id, update_data, response.json(), backup_result)
+                if not self._is_missing_route(response):
+                    self._handle_api_error(response)
+                print("⚠️  プラグインがブロックパッチ未対応のため全体送信に切り替え")
+                self.block_patch_supported = False
+            
+            body, headers = self._encode_json(update_data)
+            response = self.session.post(
                 f"{self.endpoint}/update-post/{post_id}",
-                headers=self.headers,
-                json=update_data,
-                timeout=30
+                headers=headers,
+                data=body,
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                result = response.json()
-                self._record_update_history(post_id, update_data, result, backup_result)
-                
-                print(f"✅ 記事更新成功!")
-                print(f"   投稿ID: {result.get('post_id', post_id)}")
-                print(f"   更新時刻: {result.get('modified_time', 'Unknown')}")
-                print(f"   更新URL: {result.get('edit_link', 'N/A')}")
-                
-                return result
+                return self._complete_update(post_id, update_data, response.json(), backup_result)
             else:
                 self._handle_api_error(response)
                 
@@ -181,17 +511,24 @@ class WordPressUpdateClient:
             print(f"❌ {error_msg}")
             raise WordPressUpdateError(error_msg)
     
+    def _encode_json(self, data: Dict[str, Any]):
+        """JSON本文のエンコード（初回はプラグインのgzip対応を /usage で確認）"""
+        self.body_encoder.negotiate_with(self.session, self.endpoint, self.headers, self.timeout)
+        return self.body_encoder.encode(data, self.headers)
+    
     def get_post(self, post_id: int) -> Dict[str, Any]:
-        """記事データ取得"""
+        """記事データ取得（キャッシュ済みの記事は条件付きGETで再検証）"""
         try:
-            response = requests.get(
+            headers, cached = self.post_cache.conditional_headers(self.site, post_id, self.headers)
+            response = self.session.get(
                 f"{self.endpoint}/get-post/{post_id}",
-                headers=self.headers,
-                timeout=15
+                headers=headers,
+                timeout=self.timeout
             )
             
-            if response.status_code == 200:
-                return response.json()
+            post = self.post_cache.resolve(self.site, post_id, response, cached)
+            if post is not None:
+                return post
             elif response.status_code == 404:
                 raise PostNotFoundError(f"投稿ID {post_id} が見つかりません")
             else:
@@ -200,42 +537,154 @@ class WordPressUpdateClient:
         except requests.exceptions.RequestException as e:
             raise WordPressUpdateError(f"記事取得に失敗: {str(e)}")
     
-    def batch_update_posts(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """複数記事の一括更新"""
-        print(f"🔄 バッチ更新開始: {len(updates)}件の記事")
+    def batch_update_posts(self, updates: List[Dict[str, Any]],
+                           max_concurrency: Optional[int] = None,
+                           diff_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        複数記事の一括更新
+        
+        記事ごとに 取得 → バックアップ（diff_workers 指定時は差分計算をワーカープロセスで並行）→ 更新 を実行し、
+        複数記事を並行して処理する。失敗した記事は他の記事の処理を妨げない
+        
+        Args:
+            updates: [{'post_id': int, ...update_postの引数}]（呼び出し側のdictは変更しない）
+            max_concurrency: 並行処理する記事数（Noneの場合は batch_concurrency 設定値）
+            diff_workers: 差分計算プロセス数（0でスレッド内で計算、Noneの場合は diff_workers 設定値）
+                プールは初回指定時に起動して再利用する（不要になったら shutdown_diff_pool）
         
-        results = []
-        for i, update_config in enumerate(updates, 1):
-            post_id = update_config.pop('post_id')
-            print(f"\n📝 [{i}/{len(updates)}] 記事ID {post_id} 更新中...")
+        Returns:
+            入力順の [{'post_id', 'success', 'result' または 'error'/'stage', 'timings'}]
+            timings は工程ごとの秒数（diff はスレッド内では計算時間、ワーカー使用時は投入から結果取得まで）
+        """
+        settings = get_wordpress_settings()
+        max_concurrency = max(1, max_concurrency or settings['batch_concurrency'])
+        diff_workers = settings['diff_workers'] if diff_workers is None else diff_workers
+        
+        print(f"🔄 バッチ更新開始: {len(updates)}件の記事（同時実行数 {max_concurrency}）")
+        
+        diff_pool = None
+        if diff_workers > 0 and any(u.get('content') and u.get('diff_update', True) for u in updates):
+            diff_pool = self._get_diff_pool(diff_workers)
+        
+        def submit_diff(old_content: str, new_content: str):
+            if diff_pool is not None:
+                try:
+                    return diff_pool.submit(calculate_diff_ratio, old_content, new_content)
+                except (BrokenProcessPool, RuntimeError) as e:
+                    print(f"⚠️  差分計算プール利用不可、スレッド内で計算: {e}")
+                    self.shutdown_diff_pool(wait=False)
+            return None
+        
+        def update_one(update_config: Dict[str, Any]) -> Dict[str, Any]:
+            fields = dict(update_config)
+            post_id = fields.pop('post_id', None)
+            backup = fields.pop('backup', True)
+            diff_update = fields.pop('diff_update', True)
+            timings = {}
+            stage = 'validate'
+            
+            def timed(name, func, *args):
+                start = time.perf_counter()
+                try:
+                    return func(*args)
+                finally:
+                    timings[name] = round(time.perf_counter() - start, 4)
             
             try:
-                result = self.update_post(post_id, **update_config)
-                results.append({"post_id": post_id, "success": True, "result": result})
+                if not isinstance(post_id, int) or post_id <= 0:
+                    raise ValueError("有効な投稿IDを指定してください")
+                unknown = set(fields) - set(self.UPDATE_FIELDS)
+                if unknown:
+                    raise TypeError(f"未対応の更新項目: {', '.join(sorted(unknown))}")
+                
+                stage = 'fetch'
+                current_post = None
+                if diff_update or backup:
+                    current_post = timed('fetch', self._fetch_current_post, post_id)
+                
+                # 差分計算をワーカーに投入し（プール使用時）、完了を待つ間にバックアップを作成
+                diff_future = None
+                diff_started = time.perf_counter()
+                needs_diff = bool(diff_update and fields.get('content') and current_post)
+                if needs_diff:
+                    diff_future = submit_diff(current_post.get('content', ''), fields['content'])
+                
+                stage = 'backup'
+                backup_result = None
+                if backup and current_post:
+                    backup_result = timed('backup', self._backup_current_post, post_id, current_post)
+                
+                stage = 'diff'
+                diff_ratio = None
+                if needs_diff:
+                    try:
+                        diff_ratio = diff_future.result() if diff_future else None
+                    except BrokenProcessPool:
+                        self.shutdown_diff_pool(wait=False)
+                        diff_ratio = None
+                    if diff_ratio is None:
+                        # スレッド内計算（バックアップの時間を含めない）
+                        diff_started = time.perf_counter()
+                        diff_ratio = self._calculate_diff_ratio(current_post.get('content', ''), fields['content'])
+                    timings['diff'] = round(time.perf_counter() - diff_started, 4)
+                
+                stage = 'update'
+                update_data = self._prepare_update_data(current_post, diff_update, diff_ratio=diff_ratio, **fields)
+                result = timed('update', self._send_update, post_id, update_data, backup_result, current_post)
+                return {"post_id": post_id, "success": True, "result": result, "timings": timings}
+                
             except Exception as e:
                 error_msg = str(e)
-                print(f"❌ 記事ID {post_id} 更新失敗: {error_msg}")
-                results.append({"post_id": post_id, "success": False, "error": error_msg})
+                print(f"❌ 記事ID {post_id} 更新失敗 ({stage}): {error_msg}")
+                return {"post_id": post_id, "success": False, "error": error_msg,
+                        "stage": stage, "timings": timings}
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='post-update') as executor:
+            results = list(executor.map(update_one, updates))
         
         success_count = sum(1 for r in results if r["success"])
         print(f"\n🎉 バッチ更新完了: {success_count}/{len(updates)} 件成功")
         
+        # 工程ごとの平均所要時間
+        for name in ('fetch', 'backup', 'diff', 'update'):
+            values = [r['timings'][name] for r in results if name in r['timings']]
+            if values:
+                print(f"   {name}: 平均 {sum(values) / len(values):.3f}秒 ({len(values)}件)")
+        self._print_cache_stats()
+        
         return results
     
+    def _get_diff_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """差分計算プロセスプール（初回使用時に起動し、以降の一括更新で再利用）"""
+        with self._diff_pool_lock:
+            if self._diff_pool is None:
+                # spawnを既定とし、スレッド実行中のfork（ロック競合）を避ける
+                self._diff_pool = ProcessPoolExecutor(max_workers=max_workers,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+            return self._diff_pool
+    
+    def shutdown_diff_pool(self, wait: bool = True):
+        """差分計算プロセスプール終了（次回の一括更新で必要なら再起動）"""
+        with self._diff_pool_lock:
+            pool, self._diff_pool = self._diff_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+    
     def restore_from_backup(self, post_id: int, backup_id: str) -> Dict[str, Any]:
         """バックアップからの復元"""
         print(f"🔄 記事復元開始: ID {post_id}, バックアップ {backup_id}")
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.endpoint}/restore-post/{post_id}",
                 headers=self.headers,
                 json={"backup_id": backup_id},
-                timeout=30
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
                 result = response.json()
+                self.post_cache.forget(self.site, post_id)
                 print(f"✅ 記事復元完了: {result.get('restored_time')}")
                 return result
             else:
@@ -244,22 +693,6 @@ class WordPressUpdateClient:
         except requests.exceptions.RequestException as e:
             raise WordPressUpdateError(f"復元失敗: {str(e)}")
     
-    def get_update_history(self, post_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """更新履歴取得"""
-        if post_id:
-            return [h for h in self.update_history if h.get('post_id') == post_id]
-        return self.update_history
-    
-    def _build_update_data(self, **kwargs) -> Dict[str, Any]:
-        """更新データ構築"""
-        update_data = {}
-        
-        for key, value in kwargs.items():
-            if value is not None:
-                update_data[key] = value
-        
-        return update_data
-    
     def _create_backup(self, post_id: int, current_post: Dict[str, Any]) -> Dict[str, Any]:
         """記事のバックアップ作成"""
         backup_data = {
@@ -269,11 +702,12 @@ class WordPressUpdateClient:
         }
         
         try:
-            response = requests.post(
+            body, headers = self._encode_json(backup_data)
+            response = self.session.post(
                 f"{self.endpoint}/backup-post/{post_id}",
-                headers=self.headers,
-                json=backup_data,
-                timeout=15
+                headers=headers,
+                data=body,
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -284,54 +718,6 @@ class WordPressUpdateClient:
         except requests.exceptions.RequestException as e:
             raise WordPressUpdateError(f"バックアップ作成失敗: {str(e)}")
     
-    def _calculate_diff_ratio(self, old_content: str, new_content: str) -> float:
-        """変更率計算"""
-        if not old_content:
-            return 1.0
-        
-        similarity = SequenceMatcher(None, old_content, new_content).ratio()
-        return 1.0 - similarity
-    
-    def _record_update_history(self, post_id: int, update_data: Dict[str, Any], 
-                              result: Dict[str, Any], backup_result: Optional[Dict[str, Any]]):
-        """更新履歴記録"""
-        history_entry = {
-            "post_id": post_id,
-            "updated_at": datetime.now().isoformat(),
-            "update_data": update_data,
-            "result": result,
-            "backup_id": backup_result.get('backup_id') if backup_result else None
-        }
-        
-        self.update_history.append(history_entry)
-        
-        # 履歴の上限管理（最新100件まで）
-        if len(self.update_history) > 100:
-            self.update_history = self.update_history[-100:]
-    
-    def _handle_api_error(self, response: requests.Response):
-        """APIエラーハンドリング"""
-        try:
-            error_data = response.json()
-            error_code = error_data.get('code', 'unknown')
-            error_message = error_data.get('message', 'Unknown error')
-        except:
-            error_code = 'http_error'
-            error_message = response.text
-        
-        print(f"❌ API エラー: {response.status_code}")
-        print(f"   エラーコード: {error_code}")
-        print(f"   メッセージ: {error_message}")
-        
-        if response.status_code == 404:
-            raise PostNotFoundError(error_message)
-        elif response.status_code == 403:
-            raise InsufficientPermissionError(error_message)
-        elif response.status_code == 409:
-            raise UpdateConflictError(error_message)
-        else:
-            raise WordPressUpdateError(f"{error_code}: {error_message}")
-    
     def update_post_from_markdown(self, post_id: int, markdown_file: str, 
                                  image_dir: str = None, **kwargs) -> Dict[str, Any]:
         """
@@ -343,24 +729,7 @@ class WordPressUpdateClient:
             image_dir: 画像ディレクトリ
             **kwargs: 追加のupdate_post引数
         """
-        print(f"📝 Markdownから記事更新: {markdown_file}")
-        
-        # Markdown読み込み
-        if not os.path.exists(markdown_file):
-            raise FileNotFoundError(f"Markdownファイルが見つかりません: {markdown_file}")
-        
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-        
-        # タイトル抽出
-        title_match = re.search(r'^#\s+(.+)$', markdown_content, re.MULTILINE)
-        title = title_match.group(1).strip() if title_match else None
-        
-        # コンテンツ変換（統合モード対応）
-        if self.integration_mode:
-            content = self._convert_markdown_integrated(markdown_content, image_dir)
-        else:
-            content = self._convert_markdown_basic(markdown_content)
+        title, content = self._read_markdown_update(markdown_file, image_dir)
         
         # 記事更新実行
         return self.update_post(
@@ -370,35 +739,23 @@ class WordPressUpdateClient:
             **kwargs
         )
     
-    def validate_content(self, content_type: str, content: str) -> bool:
-        """
-        コンテンツ検証（Worker3品質管理機能）
-        """
-        if content_type not in self.validation_rules:
-            return True
-        
-        rules = self.validation_rules[content_type]
-        content_length = len(content.strip())
-        
-        if 'min_length' in rules and content_length < rules['min_length']:
-            raise ValueError(f"{content_type} が短すぎます: {content_length} < {rules['min_length']}")
-        
-        if 'max_length' in rules and content_length > rules['max_length']:
-            raise ValueError(f"{content_type} が長すぎます: {content_length} > {rules['max_length']}")
-        
-        return True
-    
-    def search_posts_by_title(self, title: str, fuzzy: bool = True) -> List[Dict[str, Any]]:
+    def search_posts_by_title(self, title: str, fuzzy: bool = True, local: bool = False) -> List[Dict[str, Any]]:
         """
         タイトルによる記事検索（Worker3検索機能）
+        
+        Args:
+            local: 同期済みの記事カタログから検索（リクエストなし）
         """
+        if local:
+            return self.post_catalog.search_titles(self.site, title, fuzzy)
+        
         try:
             params = {'title': title, 'fuzzy': fuzzy}
-            response = requests.get(
+            response = self.session.get(
                 f"{self.endpoint}/search-posts",
                 headers=self.headers,
                 params=params,
-                timeout=15
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -409,15 +766,21 @@ class WordPressUpdateClient:
         except requests.exceptions.RequestException:
             return []
     
-    def get_post_analytics(self, post_id: int) -> Dict[str, Any]:
+    def get_post_analytics(self, post_id: int, local: bool = False) -> Dict[str, Any]:
         """
         記事分析データ取得（Worker3分析機能）
+        
+        Args:
+            local: 同期済みの記事カタログから取得（リクエストなし）
         """
+        if local:
+            return self.post_catalog.get_analytics(self.site, post_id)
+        
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.endpoint}/analytics/{post_id}",
                 headers=self.headers,
-                timeout=15
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
@@ -428,60 +791,58 @@ class WordPressUpdateClient:
         except requests.exceptions.RequestException:
             return {}
     
-    def _convert_markdown_integrated(self, markdown_content: str, image_dir: str = None) -> str:
-        """
-        統合Markdown変換（post_blog_universal.py連携）
+    def sync_post_catalog(self, full: bool = False, per_page: int = 100) -> Dict[str, Any]:
         """
-        # キャッシュチェック
-        cache_key = hash(markdown_content)
-        if cache_key in self.conversion_cache:
-            print("📋 キャッシュからコンテンツ取得")
-            return self.conversion_cache[cache_key]
+        記事カタログ同期（前回同期以降に更新された記事のみ取得）
         
-        try:
-            # post_blog_universal.pyの変換機能を使用
-            sys.path.append('/mnt/c/home/hiroshi/blog_generator/scripts')
-            from scripts.wordpress_client import convert_markdown_to_gutenberg, insert_chapter_images
-            
-            # 基本変換
-            gutenberg_content = convert_markdown_to_gutenberg(markdown_content)
-            
-            # 画像挿入
-            if image_dir and os.path.exists(image_dir):
-                gutenberg_content = insert_chapter_images(gutenberg_content, image_dir)
-                print(f"🖼️  章画像挿入完了: {image_dir}")
+        Args:
+            full: 全記事を取得し直し、WordPress側で削除された記事をカタログから除く
+            per_page: 1リクエストあたりの記事数（最大100）
+        
+        Returns:
+            {'fetched': 取得件数, 'requests': リクエスト数, 'removed': 削除件数, 'elapsed': 秒}
+        """
+        start = time.time()
+        state = None if full else self.post_catalog.get_sync_state(self.site)
+        # modified_gmt は秒単位のため、前回位置と同じ秒に更新された記事も取り直す
+        cursor = (state['cursor_modified_gmt'], 0) if state else ('', 0)
+        print(f"🗂️  記事カタログ同期開始 ({f'{cursor[0]} 以降の更新分' if state else '全件'})")
+        
+        fetched, requests_made, seen_ids = 0, 0, set()
+        while True:
+            try:
+                response = self.session.get(
+                    f"{self.endpoint}/list-posts",
+                    headers=self.headers,
+                    params={'modified_after': cursor[0], 'after_id': cursor[1], 'per_page': per_page},
+                    timeout=self.timeout
+                )
+            except requests.exceptions.RequestException as e:
+                raise WordPressUpdateError(f"記事カタログ同期失敗: {str(e)}")
+            requests_made += 1
             
-            # キャッシュ保存
-            self.conversion_cache[cache_key] = gutenberg_content
-            return gutenberg_content
+            if response.status_code != 200:
+                if self._is_missing_route(response):
+                    raise WordPressUpdateError("プラグインが記事一覧（list-posts）に未対応です。blog-generator.php を更新してください")
+                self._handle_api_error(response)
             
-        except ImportError as e:
-            print(f"⚠️  統合変換失敗、基本変換を使用: {e}")
-            return self._convert_markdown_basic(markdown_content)
-    
-    def _convert_markdown_basic(self, markdown_content: str) -> str:
-        """
-        基本Markdown変換
-        """
-        # 簡易的なMarkdown→HTML変換
-        content = markdown_content
-        
-        # 見出し変換
-        content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-        content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-        content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
-        
-        # 段落変換
-        paragraphs = content.split('\n\n')
-        converted_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if para and not para.startswith('<'):
-                para = f'<p>{para}</p>'
-            converted_paragraphs.append(para)
-        
-        return '\n\n'.join(converted_paragraphs)
+            page = response.json()
+            posts = page.get('posts', [])
+            if posts:
+                cursor = (posts[-1]['modified_gmt'], posts[-1]['id'])
+            # ページごとに同期位置を保存（中断しても次回は続きから取得）
+            self.post_catalog.apply_page(self.site, posts, cursor)
+            fetched += len(posts)
+            seen_ids.update(post['id'] for post in posts)
+            if not page.get('has_more'):
+                break
+        
+        removed = self.post_catalog.prune(self.site, seen_ids) if full else 0
+        result = {'fetched': fetched, 'requests': requests_made, 'removed': removed,
+                  'elapsed': time.time() - start}
+        print(f"✅ 記事カタログ同期完了: {fetched}件取得 / {requests_made}リクエスト"
+              f"{f' / {removed}件削除' if removed else ''} ({result['elapsed']:.2f}秒)")
+        return result
 
 
 def main():
@@ -498,6 +859,7 @@ def main():
         print("   - batch_update_posts(): 一括更新")
         print("   - restore_from_backup(): バックアップ復元")
         print("   - get_update_history(): 更新履歴取得")
+        print("   - sync_post_catalog(): 記事カタログ同期（検索・分析をローカルで実行）")
         
         return client
         
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+章サムネイルプロンプトの一括生成
+thumbnail.md テンプレートを全章分まとめた1リクエストに変換し（アウトラインは1回だけ送信）、
+Geminiの構造化（JSON）応答を章ごとのYAMLブロックに分割する
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+# テンプレート変数
+OUTLINE_VARIABLE = '{{outline}}'
+TARGET_H2_VARIABLE = '{{target_h2}}'
+CHAPTER_NUMBER_VARIABLE = '{{chapter_number}}'
+
+# 一括生成用の出力指示（テンプレート末尾に追加）
+BATCH_OUTPUT_INSTRUCTION = """
+
+## 一括出力形式（厳守）
+上記の「対象章」に列挙したすべての章について、章ごとに独立した章サムネイル画像生成YAML設定を作成してください。
+出力は次の形式のJSONのみとし、説明文やコードフェンスは含めないでください。
+
+{"chapters": [{"index": 1, "yaml": "style: \\"...\\"\\ntheme_color: \\"...\\"\\n..."}, ...]}
+
+- index: 「対象章」の [番号]
+- yaml: 上記「出力形式」のYAML本文（```yaml で囲まない）
+- 全{count}章分を index 順に出力すること
+"""
+
+
+def _replace_all_but_last(text: str, variable: str, placeholder: str, value: str) -> str:
+    """最後の出現箇所のみ value に置換し、それ以前は placeholder に置換（大きな値の重複送信を回避）"""
+    count = text.count(variable)
+    if count == 0:
+        return text
+    text = text.replace(variable, placeholder, count - 1)
+    return text.replace(variable, value)
+
+
+def build_batch_request(template: str, outline_content: str, chapters: List[str]) -> str:
+    """
+    thumbnail.md テンプレートから全章分の一括生成リクエストを作成
+
+    Args:
+        template: thumbnail.md の内容
+        outline_content: アウトライン本文
+        chapters: 章タイトル（H2）のリスト
+
+    Returns:
+        Geminiに送信するリクエスト本文
+    """
+    chapter_list = '\n'.join(f"[{i}] {chapter}" for i, chapter in enumerate(chapters, 1))
+
+    content = _replace_all_but_last(template, OUTLINE_VARIABLE, '下記の入力データ', outline_content)
+    content = _replace_all_but_last(content, TARGET_H2_VARIABLE, '下記の各対象章', chapter_list)
+    content = content.replace(CHAPTER_NUMBER_VARIABLE, 'N')
+
+    return content + BATCH_OUTPUT_INSTRUCTION.replace('{count}', str(len(chapters)))
+
+
+def parse_batch_response(text: Optional[str], chapter_count: int) -> Dict[int, str]:
+    """
+    一括生成の応答を章ごとのテキスト（```yaml ブロック）に分割
+
+    不正な応答・欠落した章は結果に含めない（呼び出し側で章ごとの生成にフォールバック）
+
+    Returns:
+        {章番号(1始まり): "```yaml\\n...\\n```"}
+    """
+    if not text:
+        return {}
+
+    # コードフェンスで囲まれた場合も許容
+    body = text.strip()
+    fence = re.match(r'^```(?:json)?\s*(.*?)\s*```$', body, re.DOTALL)
+    if fence:
+        body = fence.group(1)
+
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError:
+        return {}
+
+    entries = data.get('chapters') if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+
+    prompts = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get('index')
+        yaml_content = entry.get('yaml')
+        if not isinstance(index, int) or not 1 <= index <= chapter_count:
+            continue
+        if not isinstance(yaml_content, str) or 'style:' not in yaml_content:
+            continue
+        yaml_content = re.sub(r'^```(?:yaml)?\s*|\s*```$', '', yaml_content.strip())
+        prompts.setdefault(index, f"```yaml\n{yaml_content}\n```")
+
+    return prompts
@@ -1,4 +1,4 @@
-#\!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 設定一元管理システム
 ハードコーディングされた設定値を環境変数から動的に生成
@@ -42,8 +42,38 @@ class ConfigManager:
             "wordpress_settings": {
                 "endpoint_base": endpoint,
                 "timeout": int(os.getenv('API_TIMEOUT', '30')),
+                "connect_timeout": int(os.getenv('API_CONNECT_TIMEOUT', '10')),
+                "upload_timeout": int(os.getenv('API_UPLOAD_TIMEOUT', '60')),
                 "retry_attempts": int(os.getenv('API_RETRY_ATTEMPTS', '3')),
-                "retry_delay": int(os.getenv('API_RETRY_DELAY', '2'))
+                "retry_delay": int(os.getenv('API_RETRY_DELAY', '2')),
+                # HTTP接続プール（keep-alive）: ホスト数 / ホストあたりの最大接続数
+                "pool_connections": int(os.getenv('API_POOL_CONNECTIONS', '4')),
+                "pool_maxsize": int(os.getenv('API_POOL_MAXSIZE', '8')),
+                # 記事投稿時の画像アップロード同時実行数
+                "upload_concurrency": int(os.getenv('API_UPLOAD_CONCURRENCY', '4')),
+                # 非同期クライアント（AsyncWordPressUpdateClient）の同時リクエスト数
+                "async_concurrency": int(os.getenv('API_ASYNC_CONCURRENCY', '16')),
+                # 一括更新（batch_update_posts）の並行記事数 / 差分計算プロセス数（0でスレッド内計算）
+                "batch_concurrency": int(os.getenv('API_BATCH_CONCURRENCY', '4')),
+                "diff_workers": int(os.getenv('API_DIFF_WORKERS', '0')),
+                # 同一内容の画像は再アップロードせず既存の添付ファイルを再利用 / 再利用前に存在確認
+                "upload_dedupe": os.getenv('API_UPLOAD_DEDUPE', 'true').lower() in ('1', 'true', 'yes'),
+                "upload_dedupe_verify": os.getenv('API_UPLOAD_DEDUPE_VERIFY', 'true').lower() in ('1', 'true', 'yes'),
+                # get-post の記事キャッシュ（ETag / Last-Modified で再検証、未変更は304のみ）
+                "post_cache": {
+                    "enabled": os.getenv('API_POST_CACHE', 'true').lower() in ('1', 'true', 'yes'),
+                    "max_entries": int(os.getenv('API_POST_CACHE_MAX_ENTRIES', '500'))
+                },
+                # Markdown→Gutenberg変換キャッシュ（Markdown本文 + 変換器のハッシュで再利用）
+                "conversion_cache": {
+                    "enabled": os.getenv('CONVERSION_CACHE', 'true').lower() in ('1', 'true', 'yes'),
+                    "max_entries": int(os.getenv('CONVERSION_CACHE_MAX_ENTRIES', '1000'))
+                },
+                # 記事作成・更新・バックアップの本文をgzip圧縮（/usage でプラグインの対応を確認）
+                "request_compression": {
+                    "enabled": os.getenv('API_REQUEST_COMPRESSION', 'false').lower() in ('1', 'true', 'yes'),
+                    "min_bytes": int(os.getenv('API_REQUEST_COMPRESSION_MIN_BYTES', '8192'))
+                }
             },
             "update_strategies": {
                 "proven_method": {
@@ -67,4 +97,3 @@ if __name__ == "__main__":
         print(f"エンドポイント: {config['wordpress_settings']['endpoint_base']}")
     except Exception as e:
         print(f"❌ エラー: {e}")
-EOF < /dev/null
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+記事本文の差分計算（Gutenbergブロック単位）
+本文をトップレベルのブロックに分割してハッシュ列で対応付け、置換されたブロックの組のみ
+文単位のハッシュ列で比較する（記事全体への SequenceMatcher は3万〜10万文字で数秒〜数十秒かかるため）
+一括更新ではワーカープロセスから呼び出すため、依存の少ないモジュールに配置
+
+ブロックパッチ（build_block_patch / apply_block_patch）の分割・適用規則は
+blog-generator.php の patch-post エンドポイントと同一に保つこと
+"""
+
+import re
+import time
+import hashlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+# 置換ブロックの文単位比較に使える時間（超過分の置換ブロックは全面変更として扱う）
+DEFAULT_TIME_BUDGET_SECONDS = 0.2
+
+# ブロック区切り: <!-- wp:name {...} -->, <!-- /wp:name -->, <!-- wp:name {...} /-->
+# （PHPのPCREと同じ結果になるよう \s はASCII空白のみ）
+BLOCK_DELIMITER_PATTERN = re.compile(
+    r'<!--\s+(?P<closer>/)?wp:(?P<name>[a-z][a-z0-9_-]*(?:/[a-z][a-z0-9_-]*)?)'
+    r'(?:\s+\{.*?\})?\s+(?P<void>/)?-->',
+    re.DOTALL | re.ASCII
+)
+# ブロック形式でない本文の分割（空行区切り）
+FREEFORM_SPLIT_PATTERN = re.compile(r'\n\s*\n', re.ASCII)
+# ブロック前後から除く空白（全角スペースは本文として残す）
+BLOCK_WHITESPACE = ' \t\n\r\x0b\x0c'
+# ブロックパッチで挿入するブロック間の区切り
+PATCH_BLOCK_SEPARATOR = '\n\n'
+# ブロック内の文の区切り（句点・改行・リスト項目・表の行の直後）
+SEGMENT_SPLIT_PATTERN = re.compile(r'(?<=[。．！？!?\n])|(?<=</li>)|(?<=</tr>)')
+
+
+def _block_spans(content: str) -> List[Tuple[str, int, int]]:
+    """
+    本文をトップレベルのブロックに分割（1回の走査）
+
+    ブロック外のテキストは空行で区切って 'freeform' ブロックとする
+
+    Returns:
+        [(ブロック名, 開始位置, 終了位置), ...]
+    """
+    spans = []
+
+    def add_chunk(start: int, end: int):
+        chunk = content[start:end]
+        stripped = chunk.lstrip(BLOCK_WHITESPACE).rstrip(BLOCK_WHITESPACE)
+        if stripped:
+            start += len(chunk) - len(chunk.lstrip(BLOCK_WHITESPACE))
+            spans.append(('freeform', start, start + len(stripped)))
+
+    def add_freeform(start: int, end: int):
+        chunk_start = start
+        for separator in FREEFORM_SPLIT_PATTERN.finditer(content, start, end):
+            add_chunk(chunk_start, separator.start())
+            chunk_start = separator.end()
+        add_chunk(chunk_start, end)
+
+    depth = 0
+    block_start = 0
+    block_name = None
+    position = 0
+    for match in BLOCK_DELIMITER_PATTERN.finditer(content):
+        if depth == 0:
+            add_freeform(position, match.start())
+            if match.group('closer'):
+                # 対応する開始のない終了区切りは本文として扱う
+                add_chunk(match.start(), match.end())
+                position = match.end()
+                continue
+            if match.group('void'):
+                spans.append((match.group('name'), match.start(), match.end()))
+                position = match.end()
+                continue
+            block_start = match.start()
+            block_name = match.group('name')
+            depth = 1
+        elif match.group('closer'):
+            depth -= 1
+            if depth == 0:
+                spans.append((block_name, block_start, match.end()))
+                position = match.end()
+        elif not match.group('void'):
+            depth += 1
+
+    if depth > 0:
+        # 閉じられていないブロックは末尾までを1ブロックとする
+        spans.append((block_name, block_start, len(content.rstrip(BLOCK_WHITESPACE))))
+    else:
+        add_freeform(position, len(content))
+    return spans
+
+
+def split_blocks(content: str) -> List[Tuple[str, str]]:
+    """
+    本文をトップレベルのブロックに分割
+
+    Returns:
+        [(ブロック名, ブロック本文), ...]
+    """
+    return [(name, content[start:end]) for name, start, end in _block_spans(content)]
+
+
+def _block_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def block_hashes(content: str) -> List[str]:
+    """トップレベルブロックごとのハッシュ（差分の対応付け・記事カタログで共通）"""
+    return [_block_hash(text) for _, text in split_blocks(content or '')]
+
+
+def content_hash(text: str) -> str:
+    """本文・ブロックのSHA-256（パッチの基準版・アンカーに使用、PHPの hash('sha256') と同じ値）"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _matched_segment_chars(old_text: str, new_text: str) -> int:
+    """置換されたブロックの組で一致する文の文字数（文のハッシュ列を対応付け）"""
+    old_segments = [segment for segment in SEGMENT_SPLIT_PATTERN.split(old_text) if segment]
+    new_segments = [segment for segment in SEGMENT_SPLIT_PATTERN.split(new_text) if segment]
+    matcher = SequenceMatcher(None, [_block_hash(segment) for segment in old_segments],
+                              [_block_hash(segment) for segment in new_segments], autojunk=False)
+    return sum(
+        sum(len(segment) for segment in old_segments[i:i + size])
+        for i, _, size in matcher.get_matching_blocks()
+    )
+
+
+def diff_content(old_content: str, new_content: str,
+                 time_budget: Optional[float] = DEFAULT_TIME_BUDGET_SECONDS) -> Dict[str, Any]:
+    """
+    ブロック単位の差分
+
+    Args:
+        old_content: 現在の本文
+        new_content: 新しい本文
+        time_budget: 置換ブロックの文単位比較に使う時間の上限（秒、Noneで無制限）
+
+    Returns:
+        {
+            'ratio': 変更率（0.0〜1.0、SequenceMatcher と同じく 1 - 2×一致文字数/総文字数）,
+            'changed_blocks': [{'op': 'replace'|'insert'|'delete', 'old_index', 'new_index', 'name'}],
+            'old_block_count', 'new_block_count',
+            'budget_exceeded': 時間上限により一部を全面変更として扱ったか
+        }
+    """
+    old_blocks = split_blocks(old_content or '')
+    new_blocks = split_blocks(new_content or '')
+    result = {
+        'ratio': 1.0,
+        'changed_blocks': [],
+        'old_block_count': len(old_blocks),
+        'new_block_count': len(new_blocks),
+        'budget_exceeded': False
+    }
+
+    total_chars = sum(len(text) for _, text in old_blocks) + sum(len(text) for _, text in new_blocks)
+    if not old_blocks or total_chars == 0:
+        result['changed_blocks'] = [
+            {'op': 'insert', 'old_index': None, 'new_index': i, 'name': name}
+            for i, (name, _) in enumerate(new_blocks)
+        ]
+        return result
+
+    # ブロックのハッシュ列で対応付け（ブロック数は本文長よりはるかに小さい）
+    old_hashes = [_block_hash(text) for _, text in old_blocks]
+    new_hashes = [_block_hash(text) for _, text in new_blocks]
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    matched_chars = 0
+    changed_blocks = result['changed_blocks']
+
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            matched_chars += sum(len(text) for _, text in old_blocks[i1:i2])
+            continue
+
+        paired = min(i2 - i1, j2 - j1) if op == 'replace' else 0
+        for k in range(paired):
+            old_name, old_text = old_blocks[i1 + k]
+            new_name, new_text = new_blocks[j1 + k]
+            changed_blocks.append({'op': 'replace', 'old_index': i1 + k, 'new_index': j1 + k, 'name': new_name})
+            if old_name != new_name:
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                result['budget_exceeded'] = True
+                continue
+            # 置換されたブロックの組のみ文単位で比較
+            matched_chars += _matched_segment_chars(old_text, new_text)
+
+        for i in range(i1 + paired, i2):
+            changed_blocks.append({'op': 'delete', 'old_index': i, 'new_index': None, 'name': old_blocks[i][0]})
+        for j in range(j1 + paired, j2):
+            changed_blocks.append({'op': 'insert', 'old_index': None, 'new_index': j, 'name': new_blocks[j][0]})
+
+    result['ratio'] = 1.0 - 2.0 * matched_chars / total_chars
+    return result
+
+
+def calculate_diff_ratio(old_content: str, new_content: str) -> float:
+    """
+    変更率計算
+
+    Returns:
+        0.0（同一）〜 1.0（全面変更）
+    """
+    if not old_content:
+        return 1.0
+    return diff_content(old_content, new_content)['ratio']
+
+
+def build_block_patch(old_content: str, new_content: str) -> Optional[Dict[str, Any]]:
+    """
+    変更ブロックのみを送るパッチを作成
+
+    index は基準版（old_content）のブロック番号。insert は index のブロックの前
+    （ブロック数と同じ場合は末尾）に挿入する
+
+    Returns:
+        {
+            'base_hash': 基準版本文のSHA-256,
+            'block_count': 基準版のブロック数,
+            'patches': [{'op': 'replace'|'delete', 'index', 'anchor', ('content')},
+                        {'op': 'insert', 'index', 'content'}]
+        }
+        適用結果が new_content と同じブロック列にならない場合は None（全体更新）
+    """
+    old_blocks = split_blocks(old_content or '')
+    new_blocks = split_blocks(new_content or '')
+    matcher = SequenceMatcher(None, [_block_hash(text) for _, text in old_blocks],
+                              [_block_hash(text) for _, text in new_blocks], autojunk=False)
+
+    patches = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1) if op == 'replace' else 0
+        for k in range(paired):
+            patches.append({'op': 'replace', 'index': i1 + k, 'anchor': content_hash(old_blocks[i1 + k][1]),
+                            'content': new_blocks[j1 + k][1]})
+        for i in range(i1 + paired, i2):
+            patches.append({'op': 'delete', 'index': i, 'anchor': content_hash(old_blocks[i][1])})
+        if j1 + paired < j2:
+            patches.append({'op': 'insert', 'index': i2,
+                            'content': PATCH_BLOCK_SEPARATOR.join(text for _, text in new_blocks[j1 + paired:j2])})
+
+    patch = {'base_hash': content_hash(old_content or ''), 'block_count': len(old_blocks), 'patches': patches}
+    if split_blocks(apply_block_patch(old_content or '', patch)) != new_blocks:
+        return None
+    return patch
+
+
+def apply_block_patch(content: str, patch: Dict[str, Any]) -> str:
+    """
+    パッチを適用（ブロック間の既存の区切りは保持）
+
+    Raises:
+        ValueError: ブロック数・アンカーが基準版と一致しない、または不正な操作
+    """
+    spans = _block_spans(content)
+    if patch.get('block_count', len(spans)) != len(spans):
+        raise ValueError(f"ブロック数が一致しません: {patch.get('block_count')} != {len(spans)}")
+
+    replacements = {}
+    deletions = set()
+    inserts = {}
+    for item in patch.get('patches', []):
+        op = item.get('op')
+        index = item.get('index')
+        if not isinstance(index, int) or index < 0 or index > len(spans) or (op != 'insert' and index == len(spans)):
+            raise ValueError(f"ブロック番号が範囲外です: {index}")
+        if op == 'insert':
+            inserts.setdefault(index, []).append(item.get('content', ''))
+            continue
+        if op not in ('replace', 'delete'):
+            raise ValueError(f"未対応の操作: {op}")
+        _, start, end = spans[index]
+        if item.get('anchor') != content_hash(content[start:end]):
+            raise ValueError(f"ブロック {index} が基準版と一致しません")
+        if op == 'replace':
+            replacements[index] = item.get('content', '')
+        else:
+            deletions.add(index)
+
+    if not spans:
+        return PATCH_BLOCK_SEPARATOR.join(inserts.get(0, [])) + content
+
+    pieces = [content[:spans[0][1]]]
+    for i, (_, start, end) in enumerate(spans):
+        following = content[end:spans[i + 1][1] if i + 1 < len(spans) else len(content)]
+        for inserted in inserts.get(i, []):
+            pieces.append(inserted + PATCH_BLOCK_SEPARATOR)
+        if i not in deletions:
+            pieces.append(replacements.get(i, content[start:end]))
+        if i + 1 == len(spans):
+            for inserted in inserts.get(len(spans), []):
+                pieces.append(PATCH_BLOCK_SEPARATOR + inserted)
+            pieces.append(following)
+        elif i not in deletions:
+            # 削除したブロックの後ろの区切りは除く
+            pieces.append(following)
+    return ''.join(pieces)
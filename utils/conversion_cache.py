@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Markdown→Gutenberg変換キャッシュ
+Markdown本文と変換器の定義ファイルのハッシュをキーに変換結果をディスクに保存する
+（変換器を修正するとキーが変わり古い結果は使われない）
+post_blog_universal・記事更新クライアント・一括処理でプロセスをまたいで共有する
+"""
+
+import inspect
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from utils.disk_cache import DiskLRUCache, DEFAULT_CACHE_ROOT, content_hash
+
+# デフォルトキャッシュ設定
+DEFAULT_CONVERSION_CACHE_SETTINGS = {
+    "enabled": True,
+    "ttl_hours": 720,
+    "max_entries": 1000,
+    "max_size_mb": 100
+}
+
+
+@lru_cache(maxsize=None)
+def _file_fingerprint(path: str) -> str:
+    return content_hash('converter_source', Path(path).read_bytes())
+
+
+def converter_fingerprint(converter: Callable) -> str:
+    """変換器の定義ファイル（同じファイルの補助関数を含む）のハッシュ"""
+    return _file_fingerprint(inspect.getsourcefile(converter))
+
+
+class ConversionCache(DiskLRUCache):
+    """Markdown→Gutenberg変換結果のディスクキャッシュ"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_ROOT / 'gutenberg_conversions', **kwargs):
+        super().__init__(cache_dir, suffix='.html', **kwargs)
+
+    @staticmethod
+    def make_key(markdown_content: str, fingerprint: str) -> str:
+        """(Markdown本文, 変換器フィンガープリント) からキャッシュキーを生成"""
+        return content_hash('gutenberg_conversion', markdown_content, fingerprint)
+
+    @classmethod
+    def from_settings(cls, wordpress_settings: Dict[str, Any], enabled: bool = True) -> 'ConversionCache':
+        """wordpress_settings の conversion_cache 設定からキャッシュを生成"""
+        return super().from_settings(wordpress_settings.get('conversion_cache', {}),
+                                     DEFAULT_CONVERSION_CACHE_SETTINGS, enabled)
+
+    def convert(self, markdown_content: str, converter: Callable[..., str], **kwargs) -> str:
+        """
+        キャッシュ付き変換
+
+        Args:
+            markdown_content: Markdown本文
+            converter: 変換関数（markdown_content, **kwargs）
+            **kwargs: 変換関数の追加引数（debug 等、出力に影響しないもののみ）
+        """
+        key = self.make_key(markdown_content, converter_fingerprint(converter))
+        cached = self.get_text(key)
+        if cached is not None:
+            print("📋 変換キャッシュからコンテンツ取得")
+            return cached
+
+        converted = converter(markdown_content, **kwargs)
+        self.set_text(key, converted)
+        return converted
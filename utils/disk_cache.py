@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+ディスクキャッシュ基盤
+TTL・エントリ数・容量制限付きのコンテンツアドレス型キャッシュ（LRU削除）
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, Union
+
+# プロジェクト共通のキャッシュ配置先
+project_root = Path(__file__).parent.parent
+DEFAULT_CACHE_ROOT = project_root / 'tmp' / 'cache'
+
+
+def content_hash(*parts: Union[str, bytes, None]) -> str:
+    """複数要素から安定したSHA-256キーを生成（要素境界を区別）"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            data = b'\x00none'
+        elif isinstance(part, bytes):
+            data = part
+        else:
+            data = str(part).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """
+    TTL・容量制限付きディスクキャッシュ
+
+    ファイルのmtimeを作成時刻（TTL判定）、atimeを最終アクセス時刻（LRU判定）として扱う
+    """
+
+    def __init__(self, cache_dir: Union[str, Path],
+                 ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None,
+                 max_size_bytes: Optional[int] = None,
+                 suffix: str = '.bin',
+                 enabled: bool = True):
+        """
+        初期化
+
+        Args:
+            cache_dir: キャッシュディレクトリ
+            ttl_seconds: 有効期限（秒）。Noneの場合は無期限
+            max_entries: 最大エントリ数。Noneの場合は無制限
+            max_size_bytes: 最大合計サイズ（バイト）。Noneの場合は無制限
+            suffix: キャッシュファイルの拡張子
+            enabled: Falseの場合は常にミス扱い・書き込みなし
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.suffix = suffix
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, settings_section: Dict[str, Any], defaults: Dict[str, Any],
+                      enabled: bool = True) -> 'DiskLRUCache':
+        """
+        設定セクションからキャッシュを生成
+
+        Args:
+            settings_section: キャッシュの設定（enabled, ttl_hours, max_entries, max_size_mb）
+            defaults: 設定セクションにない項目の既定値
+            enabled: Falseの場合は設定にかかわらず無効
+        """
+        settings = dict(defaults)
+        settings.update(settings_section or {})
+
+        return cls(
+            ttl_seconds=settings['ttl_hours'] * 3600 if settings.get('ttl_hours') else None,
+            max_entries=settings.get('max_entries'),
+            max_size_bytes=int(settings['max_size_mb'] * 1024 * 1024) if settings.get('max_size_mb') else None,
+            enabled=enabled and settings.get('enabled', True)
+        )
+
+    def _path_for(self, key: str) -> Path:
+        """キーに対応するファイルパス（先頭2文字でシャーディング）"""
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """キャッシュ取得（ヒット時は最終アクセス時刻を更新）"""
+        if not self.enabled:
+            return None
+
+        path = self._path_for(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+
+        if self.ttl_seconds is not None and time.time() - stat.st_mtime > self.ttl_seconds:
+            self._remove(path)
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        try:
+            data = path.read_bytes()
+            os.utime(path, (time.time(), stat.st_mtime))  # LRU用アクセス時刻のみ更新
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return data
+
+    def set_bytes(self, key: str, data: bytes):
+        """キャッシュ保存（一時ファイル経由のアトミック書き込み、失敗時は警告のみ）"""
+        if not self.enabled:
+            return
+
+        path = self._path_for(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # キャッシュ書き込み失敗は本処理を止めない
+            print(f"⚠️  キャッシュ保存失敗 ({self.cache_dir.name}): {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._count("writes")
+        self._evict()
+
+    def get_text(self, key: str) -> Optional[str]:
+        """テキストとしてキャッシュ取得"""
+        data = self.get_bytes(key)
+        return data.decode('utf-8') if data is not None else None
+
+    def set_text(self, key: str, text: str):
+        """テキストとしてキャッシュ保存"""
+        self.set_bytes(key, text.encode('utf-8'))
+
+    def contains(self, key: str) -> bool:
+        """有効期限内のエントリが存在するか（アクセス時刻は更新しない）"""
+        if not self.enabled:
+            return False
+        try:
+            stat = self._path_for(key).stat()
+        except FileNotFoundError:
+            return False
+        return self.ttl_seconds is None or time.time() - stat.st_mtime <= self.ttl_seconds
+
+    def delete(self, key: str):
+        """エントリ削除"""
+        self._remove(self._path_for(key))
+
+    def clear(self):
+        """全エントリ削除"""
+        for path in self._iter_entries():
+            self._remove(path)
+
+    def _iter_entries(self) -> Iterable[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return self.cache_dir.glob(f"*/*{self.suffix}")
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """期限切れ削除と、エントリ数・容量超過分のLRU削除"""
+        if self.ttl_seconds is None and self.max_entries is None and self.max_size_bytes is None:
+            return
+
+        now = time.time()
+        entries = []
+        for path in self._iter_entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self.ttl_seconds is not None and now - stat.st_mtime > self.ttl_seconds:
+                self._remove(path)
+                self._count("expired")
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        entries.sort(key=lambda entry: entry[0])  # 古いアクセス順
+        total_size = sum(size for _, size, _ in entries)
+
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries) or
+            (self.max_size_bytes is not None and total_size > self.max_size_bytes)
+        ):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_size -= size
+            self._count("evictions")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュ統計取得"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
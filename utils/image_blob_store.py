@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+画像ブロブストア
+画像バイトを完全なSHA-256をキーに保存するコンテンツアドレス型ストア（重複排除）
+バージョン管理から参照され、再生成なしでの画像復元に使用する
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+# プロジェクトルート基準（実行ディレクトリに依存しない）
+DEFAULT_BLOB_DIR = Path(__file__).parent.parent / 'outputs' / 'image_blobs'
+
+# 参照登録前の書き込み直後のブロブをGCから保護する猶予時間
+DEFAULT_GC_GRACE_SECONDS = 3600
+
+
+class ImageBlobStore:
+    """SHA-256キーの画像ブロブストア（outputs/image_blobs/ab/abcdef....bin）"""
+
+    SUFFIX = '.bin'
+
+    def __init__(self, root_dir: Union[str, Path] = DEFAULT_BLOB_DIR):
+        self.root_dir = Path(root_dir)
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """画像バイトのSHA-256（16進64文字）"""
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, sha256: str) -> Path:
+        """ハッシュに対応するファイルパス（先頭2文字でシャーディング）"""
+        return self.root_dir / sha256[:2] / f"{sha256}{self.SUFFIX}"
+
+    def put(self, data: bytes) -> str:
+        """
+        画像バイトを保存（既存の場合は書き込まない）
+
+        Returns:
+            SHA-256
+        """
+        sha256 = self.hash_bytes(data)
+        path = self.path_for(sha256)
+        if path.exists():
+            # GC猶予判定のため最終書き込み時刻を更新
+            os.utime(path)
+            return sha256
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return sha256
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        """画像バイト取得（内容がハッシュと一致しない場合はNone）"""
+        try:
+            data = self.path_for(sha256).read_bytes()
+        except FileNotFoundError:
+            return None
+        if self.hash_bytes(data) != sha256:
+            print(f"⚠️  ブロブ破損: {sha256[:16]}")
+            return None
+        return data
+
+    def exists(self, sha256: str) -> bool:
+        """ブロブが存在するか"""
+        return self.path_for(sha256).exists()
+
+    def iter_hashes(self) -> Iterator[str]:
+        """保存済みブロブのハッシュ一覧"""
+        if not self.root_dir.exists():
+            return
+        for path in self.root_dir.glob(f"*/*{self.SUFFIX}"):
+            yield path.stem
+
+    def collect_garbage(self, referenced: Iterable[str],
+                        grace_seconds: float = DEFAULT_GC_GRACE_SECONDS) -> Dict[str, int]:
+        """
+        参照されていないブロブを削除
+
+        Args:
+            referenced: バージョン管理から参照されているSHA-256
+            grace_seconds: 書き込みからこの時間内のブロブは削除しない（参照登録前の書き込み保護）
+
+        Returns:
+            {'removed', 'freed_bytes', 'kept'}
+        """
+        referenced = set(referenced)
+        now = time.time()
+        result = {"removed": 0, "freed_bytes": 0, "kept": 0}
+
+        for sha256 in list(self.iter_hashes()):
+            path = self.path_for(sha256)
+            if sha256 in referenced:
+                result["kept"] += 1
+                continue
+            try:
+                stat = path.stat()
+                if now - stat.st_mtime < grace_seconds:
+                    result["kept"] += 1
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            result["removed"] += 1
+            result["freed_bytes"] += stat.st_size
+
+        return result
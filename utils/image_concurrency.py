@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+画像生成並列実行システム
+アイキャッチ・章別サムネイル生成や複数記事の画像更新をワーカープールで並列化し、
+プロバイダー（OpenAI / Imagen / WordPress）ごとの同時実行数を制限する
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+# デフォルト並列設定
+DEFAULT_CONCURRENCY_SETTINGS = {
+    "max_workers": 4,
+    "provider_limits": {
+        "openai": 1,
+        "imagen": 2,
+        "wordpress": 4
+    }
+}
+
+
+def get_concurrency_settings(image_settings: Dict[str, Any],
+                             max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    image_settings.jsonの並列設定を取得（CLI指定値で上書き）
+
+    Args:
+        image_settings: 画像設定辞書
+        max_concurrency: --max-concurrency で指定されたワーカー数
+
+    Returns:
+        {'max_workers': int, 'provider_limits': {provider: int}}
+    """
+    configured = image_settings.get('concurrency', {})
+    provider_limits = dict(DEFAULT_CONCURRENCY_SETTINGS['provider_limits'])
+    provider_limits.update(configured.get('provider_limits', {}))
+
+    max_workers = configured.get('max_workers', DEFAULT_CONCURRENCY_SETTINGS['max_workers'])
+    if max_concurrency is not None:
+        max_workers = max_concurrency
+
+    return {
+        "max_workers": max(1, int(max_workers)),
+        "provider_limits": {name: max(1, int(limit)) for name, limit in provider_limits.items()}
+    }
+
+
+class ProviderConcurrencyLimiter:
+    """プロバイダー別の同時実行数制限"""
+
+    def __init__(self, provider_limits: Dict[str, int]):
+        self.provider_limits = dict(provider_limits)
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self.provider_limits.items()
+        }
+
+    @contextmanager
+    def limit(self, provider: str):
+        """プロバイダー呼び出し区間の同時実行数を制限（未登録プロバイダーは無制限）"""
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            yield
+            return
+
+        with semaphore:
+            yield
+
+
+def generate_images_concurrently(generator: Any, outline_data: Dict, chapters: List[str],
+                                 max_workers: int) -> Dict[str, Any]:
+    """
+    アイキャッチと全章サムネイルを並列生成
+
+    Args:
+        generator: generate_eyecatch / generate_chapter_prompts / generate_thumbnail を持つ画像生成インスタンス
+        outline_data: load_outline() の戻り値
+        chapters: extract_chapters() の戻り値
+        max_workers: ワーカープールの最大スレッド数
+
+    Returns:
+        逐次実行と同じ {'eyecatch', 'thumbnails', 'errors'} 形式（章順）
+    """
+    results = {
+        'eyecatch': None,
+        'thumbnails': [],
+        'errors': []
+    }
+
+    print("\n" + "="*50)
+    print(f"CONCURRENT GENERATION (workers: {max_workers})")
+    print("="*50)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-gen') as executor:
+        eyecatch_future = executor.submit(generator.generate_eyecatch, outline_data)
+
+        # 章プロンプトはアイキャッチ生成と並行して1回の呼び出しで一括生成
+        chapter_prompts = generator.generate_chapter_prompts(outline_data, chapters)
+        thumbnail_futures = [
+            executor.submit(generator.generate_thumbnail, outline_data, chapter, i, chapter_prompts.get(i))
+            for i, chapter in enumerate(chapters, 1)
+        ]
+
+        # 完了順ではなく投入順（アイキャッチ → 章順）で結果を回収
+        try:
+            eyecatch_path = eyecatch_future.result()
+            results['eyecatch'] = eyecatch_path
+            if eyecatch_path:
+                print(f"✅ Eyecatch completed: {eyecatch_path}")
+            else:
+                print("❌ Eyecatch generation failed")
+        except Exception as e:
+            error_msg = f"Eyecatch generation failed: {e}"
+            results['errors'].append(error_msg)
+            print(f"❌ {error_msg}")
+
+        for i, future in enumerate(thumbnail_futures, 1):
+            try:
+                thumbnail_path = future.result()
+                if thumbnail_path:
+                    results['thumbnails'].append(thumbnail_path)
+                    print(f"✅ Chapter {i} completed: {thumbnail_path}")
+                else:
+                    print(f"❌ Chapter {i} generation failed")
+            except Exception as e:
+                error_msg = f"Thumbnail {i} generation failed: {e}"
+                results['errors'].append(error_msg)
+                print(f"❌ {error_msg}")
+
+    return results
+
+
+def refresh_images_concurrently(manager: Any, items: List[Dict[str, Any]],
+                                max_workers: int) -> List[Dict[str, Any]]:
+    """
+    複数記事の画像更新を並列実行
+
+    各項目は 取得 → 生成 → 最適化 → アップロード → 設定 → 検証 を順に進み、
+    工程ごとの同時実行数はプロバイダー制限（openai / imagen / wordpress）で抑えるため、
+    ある記事のアップロード中に別の記事の画像生成が進む
+
+    Args:
+        manager: refresh_post_image を持つ画像管理インスタンス
+        items: [{'post_id', 'type', 'chapter_num', 'resume'（任意、前回の失敗結果）}]
+        max_workers: ワーカープールの最大スレッド数
+
+    Returns:
+        入力順の結果リスト（例外は status='failed' の結果に変換）
+    """
+    print("\n" + "="*50)
+    print(f"BATCH IMAGE UPDATE ({len(items)} items, workers: {max_workers})")
+    print("="*50)
+
+    def refresh(item: Dict[str, Any]) -> Dict[str, Any]:
+        return manager.refresh_post_image(item['post_id'], item.get('type', 'eyecatch'),
+                                          item.get('chapter_num'), resume=item.get('resume'))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='image-update') as executor:
+        futures = [executor.submit(refresh, item) for item in items]
+        for item, future in zip(items, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    'post_id': item['post_id'],
+                    'type': item.get('type', 'eyecatch'),
+                    'chapter_num': item.get('chapter_num'),
+                    'status': 'failed',
+                    'stage': 'error',
+                    'error': str(e),
+                    'attachment_id': None,
+                    'version_id': None,
+                    'prompt': None,
+                    'local_path': None
+                }
+            results.append(result)
+
+    return results
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+画像ポストプロセスステージ
+Pillowによるリサイズ・RGBA合成・JPEGエンコード・16:9拡張・PNG保存を
+プロセスプールで実行し、プロバイダー呼び出し（ネットワーク待ち）と並行させる
+
+ワーカーに渡す関数はpickle可能なモジュールレベル関数とし、
+生バイトを受け取って (最適化後バイト, メタデータ) を返す
+"""
+
+import os
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Tuple, Callable, Optional
+
+from PIL import Image, ImageFilter
+
+from utils.jpeg_optimizer import encode_jpeg_to_target
+
+# デフォルト設定
+DEFAULT_POSTPROCESS_SETTINGS = {
+    "use_process_pool": True,
+    "max_workers": 2,
+    "start_method": "spawn"
+}
+
+# OpenAI gpt-image-1 の横長出力サイズ
+OPENAI_EYECATCH_SIZE = (1536, 1024)
+
+# 16:9拡張の基準値（1920×1080出力時の端の帯幅・ブラー半径）
+EXTENSION_REFERENCE_WIDTH = 1920
+EDGE_STRIP_PX = 20
+SIDE_BLUR_RADIUS = 3
+TOP_BOTTOM_BLUR_RADIUS = 5
+
+
+def to_rgb(image: Image.Image) -> Image.Image:
+    """RGBA/LAは白背景で合成し、その他のモードはRGBに変換（JPEG保存用）"""
+    if image.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'RGBA':
+            background.paste(image, mask=image.split()[3])  # アルファチャンネルをマスクとして使用
+        else:
+            background.paste(image)
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def optimize_image_bytes(image_data: bytes, settings: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    生画像バイトをWeb用JPEGに最適化（ワーカープロセスで実行）
+
+    Args:
+        image_data: プロバイダーが返した生画像バイト
+        settings: image_settings.json の optimization セクション
+
+    Returns:
+        (JPEGバイト, encode_jpeg_to_target のメタデータ + 'original_size' / 'dimensions' / 'extended')
+    """
+    image = Image.open(BytesIO(image_data))
+    original_size = image.size
+    image = to_rgb(image)
+
+    # 目標サイズにリサイズ（aspect_fit: "extend" は縦横比を保ち端のブラー延長で目標サイズに直接拡張）
+    extended = False
+    target_dims = settings.get('target_dimensions', {})
+    if target_dims.get('width') and target_dims.get('height'):
+        target_size = (target_dims['width'], target_dims['height'])
+        if settings.get('aspect_fit', 'stretch') == 'extend' and _aspect_differs(image.size, target_size):
+            image = extend_to_size(image, target_size, allow_upscale=True)
+            extended = True
+        elif image.size != target_size:
+            image = image.resize(target_size, Image.Resampling.LANCZOS)
+
+    output_data, info = encode_jpeg_to_target(
+        image,
+        target_size_kb=settings.get('target_max_size_kb', 500),
+        max_quality=settings.get('jpeg_quality', 85),
+        min_quality=settings.get('min_jpeg_quality', 50),
+        progressive=settings.get('progressive', True),
+        optimize=settings.get('optimize', True)
+    )
+    info['original_size'] = original_size
+    info['dimensions'] = image.size
+    info['extended'] = extended
+    return output_data, info
+
+
+def _aspect_differs(size: Tuple[int, int], target_size: Tuple[int, int], tolerance: float = 0.01) -> bool:
+    """縦横比が許容誤差を超えて異なるか"""
+    aspect = size[0] / size[1]
+    target_aspect = target_size[0] / target_size[1]
+    return abs(aspect - target_aspect) / target_aspect > tolerance
+
+
+def extend_to_size(image: Image.Image, target_size: Tuple[int, int],
+                   allow_upscale: bool = False) -> Image.Image:
+    """
+    縦横比を保ったまま画像を target_size のキャンバスに収め、余白を端の帯のブラー延長で埋める
+
+    ブラーは端の細い帯にのみ適用し、全面ブラーは行わない（元画像の鮮明さを保持）。
+    目標サイズへ直接描画するため、中間キャンバス（1920×1080等）を経由しない
+
+    Args:
+        image: RGB画像
+        target_size: 出力サイズ (幅, 高さ)
+        allow_upscale: 目標より小さい画像を拡大して余白を減らすか
+
+    Returns:
+        target_size のRGB画像
+    """
+    target_width, target_height = target_size
+    scale = min(target_width / image.width, target_height / image.height)
+    if not allow_upscale:
+        scale = min(scale, 1.0)
+
+    # 元画像は目標サイズに合わせて1回だけリサイズ
+    content_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    if content_size != image.size:
+        image = image.resize(content_size, Image.Resampling.LANCZOS)
+    content_width, content_height = content_size
+
+    extended_image = Image.new('RGB', target_size, (0, 0, 0))
+    x_offset = (target_width - content_width) // 2
+    y_offset = (target_height - content_height) // 2
+    extended_image.paste(image, (x_offset, y_offset))
+
+    # 帯幅・ブラー半径は1920×1080基準の値を出力サイズに比例させる
+    unit = max(target_width, target_height) / EXTENSION_REFERENCE_WIDTH
+    strip = max(2, round(EDGE_STRIP_PX * unit))
+
+    # 左右の拡張（ブラー）
+    right_width = target_width - content_width - x_offset
+    if x_offset > 0 or right_width > 0:
+        side_radius = SIDE_BLUR_RADIUS * unit
+        side_strip = min(strip, content_width)
+        if x_offset > 0:
+            left_edge = image.crop((0, 0, side_strip, content_height))
+            left_blurred = left_edge.filter(ImageFilter.GaussianBlur(radius=side_radius))
+            extended_image.paste(left_blurred.resize((x_offset, content_height)), (0, y_offset))
+        if right_width > 0:
+            right_edge = image.crop((content_width - side_strip, 0, content_width, content_height))
+            right_blurred = right_edge.filter(ImageFilter.GaussianBlur(radius=side_radius))
+            extended_image.paste(right_blurred.resize((right_width, content_height)),
+                                 (x_offset + content_width, y_offset))
+
+    # 上下の拡張（ブラー、左右の拡張部分を含む全幅で）
+    bottom_height = target_height - content_height - y_offset
+    if y_offset > 0 or bottom_height > 0:
+        top_bottom_radius = TOP_BOTTOM_BLUR_RADIUS * unit
+        row_strip = min(strip, content_height)
+        if y_offset > 0:
+            top_edge = extended_image.crop((0, y_offset, target_width, y_offset + row_strip))
+            top_blurred = top_edge.filter(ImageFilter.GaussianBlur(radius=top_bottom_radius))
+            extended_image.paste(top_blurred.resize((target_width, y_offset)), (0, 0))
+        if bottom_height > 0:
+            content_bottom = y_offset + content_height
+            bottom_edge = extended_image.crop((0, content_bottom - row_strip, target_width, content_bottom))
+            bottom_blurred = bottom_edge.filter(ImageFilter.GaussianBlur(radius=top_bottom_radius))
+            extended_image.paste(bottom_blurred.resize((target_width, bottom_height)), (0, content_bottom))
+
+    return extended_image
+
+
+def extend_image_to_16_9(image: Image.Image) -> Image.Image:
+    """1536×1024の画像を16:9（1920×1080）に拡張（ブラー延長）"""
+    return extend_to_size(to_rgb(image), (EXTENSION_REFERENCE_WIDTH, 1080))
+
+
+def prepare_png_bytes(image_data: bytes) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    未最適化画像を保存用PNGに変換（ワーカープロセスで実行）
+
+    OpenAIアイキャッチ（1536×1024）は16:9に拡張し、幅1920px超は縮小する
+
+    Returns:
+        (PNGバイト, {'original_size', 'dimensions', 'extended'})
+    """
+    image = Image.open(BytesIO(image_data))
+    original_size = image.size
+
+    extended = original_size == OPENAI_EYECATCH_SIZE
+    if extended:
+        image = extend_image_to_16_9(image)
+
+    # Web最適化
+    if image.size[0] > 1920:  # 幅が1920pxより大きい場合リサイズ
+        ratio = 1920 / image.size[0]
+        new_size = (1920, int(image.size[1] * ratio))
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+
+    output = BytesIO()
+    image.save(output, 'PNG', optimize=True)
+    return output.getvalue(), {
+        "original_size": original_size,
+        "dimensions": image.size,
+        "extended": extended
+    }
+
+
+class ImagePostProcessor:
+    """ポストプロセス用プロセスプール（初回使用時に起動、障害時はインライン実行へフォールバック）"""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 use_process_pool: bool = True,
+                 start_method: str = 'spawn'):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.use_process_pool = use_process_pool
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, image_settings: Dict[str, Any]) -> 'ImagePostProcessor':
+        """image_settings.jsonの postprocess 設定からプロセッサーを生成"""
+        settings = dict(DEFAULT_POSTPROCESS_SETTINGS)
+        settings.update(image_settings.get('postprocess', {}))
+        return cls(
+            max_workers=settings.get('max_workers'),
+            use_process_pool=settings.get('use_process_pool', True),
+            start_method=settings.get('start_method', 'spawn')
+        )
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self.use_process_pool and self._executor is None:
+                # spawnを既定とし、スレッド実行中のfork（ロック競合）を避ける
+                context = multiprocessing.get_context(self.start_method)
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor if self.use_process_pool else None
+
+    def submit(self, func: Callable, *args) -> Future:
+        """ポストプロセス処理を投入（プール無効時は同期実行した結果のFutureを返す）"""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(func, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._disable_pool(e)
+
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, func: Callable, *args):
+        """ポストプロセス処理を実行して結果を待つ"""
+        future = self.submit(func, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            self._disable_pool(e)
+            return func(*args)
+
+    def _disable_pool(self, error: Exception):
+        print(f"⚠️  Post-processing pool unavailable, running inline: {error}")
+        with self._lock:
+            self.use_process_pool = False
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """プロセスプール終了"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+生成画像キャッシュ
+(プロバイダー, モデル, 最終プロンプト, サイズ/アスペクト比) をキーに
+OpenAI / Imagen が返した生画像バイトをディスクに保存する
+保存・アップロード失敗後の再実行で有料の再生成を避けるために使用
+"""
+
+from typing import Dict, Any
+
+from utils.disk_cache import DiskLRUCache, DEFAULT_CACHE_ROOT, content_hash
+
+# デフォルトキャッシュ設定
+DEFAULT_IMAGE_CACHE_SETTINGS = {
+    "enabled": True,
+    "ttl_hours": 168,
+    "max_entries": 200,
+    "max_size_mb": 500
+}
+
+
+class ImageResultCache(DiskLRUCache):
+    """プロバイダー生成画像（生バイト）のディスクキャッシュ"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_ROOT / 'generated_images', **kwargs):
+        super().__init__(cache_dir, suffix='.img', **kwargs)
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, size: str) -> str:
+        """(プロバイダー, モデル, プロンプト, サイズ/アスペクト比) からキャッシュキーを生成"""
+        return content_hash('generated_image', provider, model, prompt, size)
+
+    @classmethod
+    def from_settings(cls, image_settings: Dict[str, Any], enabled: bool = True) -> 'ImageResultCache':
+        """image_settings.jsonの image_cache 設定からキャッシュを生成"""
+        return super().from_settings(image_settings.get('image_cache', {}),
+                                     DEFAULT_IMAGE_CACHE_SETTINGS, enabled)
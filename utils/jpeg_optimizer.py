@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+JPEG目標サイズエンコーダー
+縮小画像での試行エンコードから品質を推定し、フル解像度のエンコード回数を
+上限付きの二分探索で抑えながら target_max_size_kb 以下に収める
+"""
+
+from io import BytesIO
+from typing import Dict, Any, Tuple
+
+from PIL import Image
+
+# デフォルト設定（config/image_settings.json の optimization セクションと互換）
+DEFAULT_MIN_QUALITY = 50
+DEFAULT_MAX_FULL_ENCODES = 3
+TRIAL_SCALE = 0.5
+
+
+def _estimate_quality(image: Image.Image, target_bytes: float,
+                      min_quality: int, max_quality: int) -> Tuple[int, int]:
+    """
+    縮小画像の試行エンコードから目標サイズに収まる品質を推定
+
+    縮小画像は画素あたりの情報量が多いため推定サイズは大きめに出る（安全側の推定）
+
+    Returns:
+        (推定品質, 試行エンコード回数)
+    """
+    width, height = image.size
+    small_size = (max(1, int(width * TRIAL_SCALE)), max(1, int(height * TRIAL_SCALE)))
+    small = image.resize(small_size, Image.Resampling.BILINEAR)
+    area_ratio = (width * height) / (small_size[0] * small_size[1])
+
+    def fits(quality: int) -> bool:
+        buffer = BytesIO()
+        small.save(buffer, format='JPEG', quality=quality)
+        return buffer.tell() * area_ratio <= target_bytes
+
+    # 上限品質で収まる場合（最も多いケース）は1回で確定
+    if fits(max_quality):
+        return max_quality, 1
+
+    lo, hi = min_quality, max_quality - 1
+    estimate = min_quality
+    trials = 1
+    while lo <= hi:
+        quality = (lo + hi) // 2
+        trials += 1
+        if fits(quality):
+            estimate = quality
+            lo = quality + 1
+        else:
+            hi = quality - 1
+
+    return estimate, trials
+
+
+def encode_jpeg_to_target(image: Image.Image, target_size_kb: float,
+                          max_quality: int = 85,
+                          min_quality: int = DEFAULT_MIN_QUALITY,
+                          max_full_encodes: int = DEFAULT_MAX_FULL_ENCODES,
+                          progressive: bool = True,
+                          optimize: bool = True,
+                          use_estimate: bool = True) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    目標ファイルサイズ以下で最も高い品質のJPEGを生成
+
+    Args:
+        image: RGB画像
+        target_size_kb: 目標最大サイズ（target_max_size_kb）
+        max_quality: 上限品質（jpeg_quality）
+        min_quality: 下限品質
+        max_full_encodes: 二分探索でのフル解像度エンコード上限回数
+        progressive: プログレッシブJPEG
+        optimize: ハフマンテーブル最適化
+        use_estimate: 縮小画像による初期品質推定の使用有無
+
+    Returns:
+        (JPEGバイト, {'quality', 'size_kb', 'within_target', 'full_encodes', 'trial_encodes'})
+    """
+    target_bytes = target_size_kb * 1024
+    min_quality = min(min_quality, max_quality)
+    encoded: Dict[int, bytes] = {}
+
+    def full_encode(quality: int) -> bytes:
+        if quality not in encoded:
+            buffer = BytesIO()
+            image.save(buffer, format='JPEG', quality=quality,
+                       optimize=optimize, progressive=progressive)
+            encoded[quality] = buffer.getvalue()
+        return encoded[quality]
+
+    # 初期品質（推定値または上限品質）
+    trial_encodes = 0
+    quality = max_quality
+    if use_estimate:
+        quality, trial_encodes = _estimate_quality(image, target_bytes, min_quality, max_quality)
+
+    # 上限回数付き二分探索（フィットした最高品質を保持）
+    lo, hi = min_quality, max_quality
+    best_quality = None
+    while lo <= hi and len(encoded) < max_full_encodes:
+        data = full_encode(quality)
+        if len(data) <= target_bytes:
+            best_quality = quality
+            lo = quality + 1
+        else:
+            hi = quality - 1
+        quality = (lo + hi + 1) // 2
+
+    # 目標に収まらない場合は下限品質を使用
+    within_target = best_quality is not None
+    if not within_target:
+        best_quality = min_quality
+    data = full_encode(best_quality)
+
+    return data, {
+        "quality": best_quality,
+        "size_kb": len(data) / 1024,
+        "within_target": within_target or len(data) <= target_bytes,
+        "full_encodes": len(encoded),
+        "trial_encodes": trial_encodes
+    }
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+WordPress記事キャッシュ
+get-post の応答を ETag / Last-Modified とともにディスクに保存し、次回は条件付きGET
+（If-None-Match / If-Modified-Since）で再検証する。未変更の記事は 304 のみで済む
+requests / httpx のレスポンスを同じ手順で扱う
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from utils.disk_cache import DiskLRUCache, DEFAULT_CACHE_ROOT, content_hash
+
+# デフォルトキャッシュ設定
+DEFAULT_POST_CACHE_SETTINGS = {
+    "enabled": True,
+    "ttl_hours": 168,
+    "max_entries": 500,
+    "max_size_mb": 200
+}
+
+
+class PostCache(DiskLRUCache):
+    """get-post 応答（記事データ + 検証子）のディスクキャッシュ"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_ROOT / 'wordpress_posts', **kwargs):
+        super().__init__(cache_dir, suffix='.json', **kwargs)
+        # 再検証の結果: not_modified（304でキャッシュを使用）/ fetched（200で本文を取得）
+        self.stats.update({"not_modified": 0, "fetched": 0})
+
+    @staticmethod
+    def make_key(site: str, post_id: int) -> str:
+        """(サイトURL, 投稿ID) からキャッシュキーを生成"""
+        return content_hash('wordpress_post', site, str(post_id))
+
+    @classmethod
+    def from_settings(cls, wordpress_settings: Dict[str, Any], enabled: bool = True) -> 'PostCache':
+        """wordpress_settings の post_cache 設定からキャッシュを生成"""
+        return super().from_settings(wordpress_settings.get('post_cache', {}),
+                                     DEFAULT_POST_CACHE_SETTINGS, enabled)
+
+    def conditional_headers(self, site: str, post_id: int,
+                            headers: Dict[str, str]) -> Tuple[Dict[str, str], Optional[Dict[str, Any]]]:
+        """
+        条件付きGETのリクエストヘッダー
+
+        Returns:
+            (検証子を追加したヘッダー, キャッシュエントリ または None)
+        """
+        cached = self.get_text(self.make_key(site, post_id))
+        if cached is None:
+            return headers, None
+
+        entry = json.loads(cached)
+        headers = dict(headers)
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers, entry
+
+    def resolve(self, site: str, post_id: int, response,
+                entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        get-post のレスポンスから記事データを取得
+
+        304 はキャッシュの記事データ、200 は応答の記事データ（検証子とともに保存）を返す
+
+        Returns:
+            記事データ（それ以外のステータスはNone）
+        """
+        if response.status_code == 304 and entry is not None:
+            self._count("not_modified")
+            return entry['post']
+
+        if response.status_code != 200:
+            return None
+
+        post = response.json()
+        self._count("fetched")
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.set_text(self.make_key(site, post_id), json.dumps({
+                'etag': etag,
+                'last_modified': last_modified,
+                'post': post
+            }, ensure_ascii=False))
+        return post
+
+    def forget(self, site: str, post_id: int):
+        """記事のキャッシュを削除（更新・復元後）"""
+        self.delete(self.make_key(site, post_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュ統計取得（revalidation_rate: 取得のうち304で済んだ割合）"""
+        stats = super().get_stats()
+        requests_made = stats["not_modified"] + stats["fetched"]
+        stats["revalidation_rate"] = stats["not_modified"] / requests_made if requests_made else 0.0
+        return stats
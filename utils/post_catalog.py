@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+WordPress記事カタログ（ローカルミラー）
+プラグインの list-posts から前回同期以降に更新された記事のみを取得して SQLite（WAL）に保存する
+記事ID・タイトル・更新日時・アイキャッチ・ブロックハッシュ・検索意図ID（INT-01 形式）と本文の統計を持ち、
+タイトルのあいまい検索・キーワード / 検索意図での絞り込み・分析・リライト候補の選定をリクエストなしで行う
+"""
+
+import re
+import sqlite3
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from utils.content_diff import block_hashes, content_hash
+from utils.update_history import DEFAULT_HISTORY_PATH
+
+# プロジェクトルート基準（実行ディレクトリに依存しない）
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / 'outputs' / 'post_catalog.db'
+
+# 検索意図ID（outputs/記事名-INT-01 / *_INT-01.md など）
+INTENT_ID_PATTERN = re.compile(r'(?<![A-Za-z0-9])INT-(\d+)')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+# PHP str_word_count 相当（analytics ルートと同じ数え方）
+WORD_PATTERN = re.compile(r"[A-Za-z'-]+")
+
+# タイトル検索の対象（search-posts と同じ）
+SEARCHABLE_STATUSES = ('publish', 'draft')
+FUZZY_MATCH_THRESHOLD = 0.5
+# trigram 全文検索は3文字以上のキーワードのみ
+MIN_FULL_TEXT_CHARS = 3
+
+
+def extract_intent_ids(*texts: Optional[str]) -> List[str]:
+    """テキスト（ファイルパス・タイトル・スラッグ等）から検索意図ID（INT-01 形式）を抽出"""
+    intent_ids = set()
+    for text in texts:
+        for number in INTENT_ID_PATTERN.findall(text or ''):
+            intent_ids.add(f"INT-{int(number):02d}")
+    return sorted(intent_ids)
+
+
+def content_statistics(content: str) -> Dict[str, Any]:
+    """本文の統計（プラグインの analytics ルートと同じ値）"""
+    plain = TAG_PATTERN.sub('', content)
+    return {
+        'word_count': len(WORD_PATTERN.findall(plain)),
+        'character_count': len(plain),
+        'paragraph_count': content.count('</p>'),
+        'heading_count': {level: content.count(f'<{level}') for level in ('h2', 'h3', 'h4')}
+    }
+
+
+class PostCatalog:
+    """記事カタログ（site, post_id 単位、同期位置は (modified_gmt, post_id)）"""
+
+    BUSY_TIMEOUT_SECONDS = 30
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_CATALOG_PATH):
+        self.db_path = Path(db_path)
+        # post_text が FTS5（trigram）か（未対応のSQLiteでは通常テーブルで LIKE 検索）
+        self.full_text = False
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を作成（スレッド・プロセス間で共有せず操作ごとに使用）"""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """スキーマ作成・WALモード設定"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    site TEXT NOT NULL,
+                    post_id INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    slug TEXT,
+                    status TEXT NOT NULL,
+                    modified TEXT,
+                    modified_gmt TEXT NOT NULL,
+                    featured_media INTEGER NOT NULL DEFAULT 0,
+                    meta_description TEXT,
+                    content_hash TEXT NOT NULL,
+                    block_count INTEGER NOT NULL,
+                    word_count INTEGER NOT NULL,
+                    character_count INTEGER NOT NULL,
+                    paragraph_count INTEGER NOT NULL,
+                    h2_count INTEGER NOT NULL,
+                    h3_count INTEGER NOT NULL,
+                    h4_count INTEGER NOT NULL,
+                    excerpt TEXT,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (site, post_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_posts_modified
+                    ON posts (site, modified_gmt);
+                CREATE TABLE IF NOT EXISTS post_blocks (
+                    site TEXT NOT NULL,
+                    post_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    block_hash TEXT NOT NULL,
+                    PRIMARY KEY (site, post_id, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_post_blocks_hash
+                    ON post_blocks (site, block_hash);
+                CREATE TABLE IF NOT EXISTS post_intents (
+                    site TEXT NOT NULL,
+                    post_id INTEGER NOT NULL,
+                    intent_id TEXT NOT NULL,
+                    PRIMARY KEY (site, post_id, intent_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_post_intents_intent
+                    ON post_intents (site, intent_id);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    site TEXT PRIMARY KEY,
+                    cursor_modified_gmt TEXT NOT NULL,
+                    cursor_post_id INTEGER NOT NULL,
+                    last_synced_at TEXT NOT NULL
+                );
+            """)
+            # 全文検索用テキスト（rowid = posts.rowid）
+            try:
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS post_text "
+                             "USING fts5(title, body, tokenize='trigram')")
+            except sqlite3.OperationalError:
+                conn.execute("CREATE TABLE IF NOT EXISTS post_text (title TEXT, body TEXT)")
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'post_text'").fetchone()
+            self.full_text = 'fts5' in row['sql'].lower()
+        finally:
+            conn.close()
+
+    def get_sync_state(self, site: str) -> Optional[Dict[str, Any]]:
+        """同期位置（cursor_modified_gmt, cursor_post_id, last_synced_at、未同期はNone）"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM sync_state WHERE site = ?", (site,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def apply_page(self, site: str, posts: Iterable[Dict[str, Any]], cursor: Tuple[str, int]):
+        """
+        list-posts の1ページ分を反映し同期位置を更新（1トランザクション）
+
+        Args:
+            site: サイトURL
+            posts: list-posts の記事データ
+            cursor: 次回の取得開始位置 (modified_gmt, post_id)
+        """
+        synced_at = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for post in posts:
+                self._upsert_post(conn, site, post, synced_at)
+            conn.execute(
+                "INSERT INTO sync_state (site, cursor_modified_gmt, cursor_post_id, last_synced_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (site) DO UPDATE SET "
+                "cursor_modified_gmt = excluded.cursor_modified_gmt, "
+                "cursor_post_id = excluded.cursor_post_id, last_synced_at = excluded.last_synced_at",
+                (site, cursor[0], int(cursor[1]), synced_at)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _upsert_post(self, conn: sqlite3.Connection, site: str, post: Dict[str, Any], synced_at: str):
+        """記事1件の保存（ブロックハッシュ・検索意図・全文検索テキストを置き換え）"""
+        post_id = int(post['id'])
+        content = post.get('content') or ''
+        plain = ' '.join(TAG_PATTERN.sub(' ', content).split())
+        stats = content_statistics(content)
+        hashes = block_hashes(content)
+        intent_ids = set(post.get('intent_ids') or []) | set(extract_intent_ids(post.get('title'), post.get('slug')))
+
+        conn.execute(
+            "INSERT INTO posts (site, post_id, title, slug, status, modified, modified_gmt, featured_media, "
+            "meta_description, content_hash, block_count, word_count, character_count, paragraph_count, "
+            "h2_count, h3_count, h4_count, excerpt, synced_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (site, post_id) DO UPDATE SET "
+            "title = excluded.title, slug = excluded.slug, status = excluded.status, "
+            "modified = excluded.modified, modified_gmt = excluded.modified_gmt, "
+            "featured_media = excluded.featured_media, meta_description = excluded.meta_description, "
+            "content_hash = excluded.content_hash, block_count = excluded.block_count, "
+            "word_count = excluded.word_count, character_count = excluded.character_count, "
+            "paragraph_count = excluded.paragraph_count, h2_count = excluded.h2_count, "
+            "h3_count = excluded.h3_count, h4_count = excluded.h4_count, excerpt = excluded.excerpt, "
+            "synced_at = excluded.synced_at",
+            (site, post_id, post.get('title') or '', post.get('slug'), post.get('status') or 'draft',
+             post.get('modified'), post.get('modified_gmt') or '', int(post.get('featured_media') or 0),
+             post.get('meta_description') or '', content_hash(content), len(hashes),
+             stats['word_count'], stats['character_count'], stats['paragraph_count'],
+             stats['heading_count']['h2'], stats['heading_count']['h3'], stats['heading_count']['h4'],
+             plain[:120], synced_at)
+        )
+        rowid = conn.execute("SELECT rowid FROM posts WHERE site = ? AND post_id = ?",
+                             (site, post_id)).fetchone()[0]
+
+        conn.execute("DELETE FROM post_blocks WHERE site = ? AND post_id = ?", (site, post_id))
+        conn.executemany(
+            "INSERT INTO post_blocks (site, post_id, position, block_hash) VALUES (?, ?, ?, ?)",
+            [(site, post_id, position, block_hash) for position, block_hash in enumerate(hashes)]
+        )
+        conn.execute("DELETE FROM post_intents WHERE site = ? AND post_id = ?", (site, post_id))
+        conn.executemany(
+            "INSERT INTO post_intents (site, post_id, intent_id) VALUES (?, ?, ?)",
+            [(site, post_id, intent_id) for intent_id in sorted(intent_ids)]
+        )
+        conn.execute("DELETE FROM post_text WHERE rowid = ?", (rowid,))
+        conn.execute("INSERT INTO post_text (rowid, title, body) VALUES (?, ?, ?)",
+                     (rowid, post.get('title') or '', plain))
+
+    def prune(self, site: str, keep_post_ids: Iterable[int]) -> int:
+        """
+        keep_post_ids にない記事を削除（全件同期でWordPress側から削除された記事を除く）
+
+        Returns:
+            削除件数
+        """
+        keep = {int(post_id) for post_id in keep_post_ids}
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = [(row['rowid'], row['post_id']) for row in
+                       conn.execute("SELECT rowid, post_id FROM posts WHERE site = ?", (site,))
+                       if row['post_id'] not in keep]
+            for rowid, post_id in removed:
+                conn.execute("DELETE FROM post_text WHERE rowid = ?", (rowid,))
+                for table in ('posts', 'post_blocks', 'post_intents'):
+                    conn.execute(f"DELETE FROM {table} WHERE site = ? AND post_id = ?", (site, post_id))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(removed)
+
+    def search_titles(self, site: str, title: str, fuzzy: bool = True, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        タイトル検索（search-posts と同じ形式）
+
+        部分一致を優先し、fuzzy の場合はメタディスクリプションの部分一致と
+        タイトルの類似度（SequenceMatcher）が FUZZY_MATCH_THRESHOLD 以上の記事も含める
+        """
+        if not title:
+            return []
+        needle = title.lower()
+        columns = "p.post_id, p.title, p.status, p.modified, p.modified_gmt, p.excerpt, p.meta_description"
+        conditions = f"p.site = ? AND p.status IN ({', '.join('?' * len(SEARCHABLE_STATUSES))})"
+        params = [site, *SEARCHABLE_STATUSES]
+        conn = self._connect()
+        try:
+            if fuzzy and self.full_text and len(needle) >= MIN_FULL_TEXT_CHARS:
+                # 検索語と共通の3文字を含むタイトル（trigram索引）とメタディスクリプションの部分一致に候補を絞る
+                trigrams = sorted({needle[i:i + 3] for i in range(len(needle) - 2)})
+                expression = 'title : (' + ' OR '.join('"' + gram.replace('"', '""') + '"' for gram in trigrams) + ')'
+                rows = conn.execute(
+                    f"SELECT {columns} FROM posts p "
+                    f"WHERE {conditions} AND p.rowid IN (SELECT rowid FROM post_text WHERE post_text MATCH ?) "
+                    f"UNION SELECT {columns} FROM posts p WHERE {conditions} AND p.meta_description LIKE ?",
+                    (*params, expression, *params, f"%{title}%")
+                ).fetchall()
+            elif not fuzzy:
+                rows = conn.execute(f"SELECT {columns} FROM posts p WHERE {conditions} AND p.title LIKE ?",
+                                    (*params, f"%{title}%")).fetchall()
+            else:
+                rows = conn.execute(f"SELECT {columns} FROM posts p WHERE {conditions}", params).fetchall()
+        finally:
+            conn.close()
+
+        # 検索語側（seq2）の前処理を全タイトルで共有
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(needle)
+        scored = []
+        for row in rows:
+            candidate = row['title'].lower()
+            if needle in candidate:
+                score = 2.0 + len(needle) / len(candidate)
+            elif not fuzzy:
+                continue
+            elif needle in (row['meta_description'] or '').lower():
+                score = 1.0
+            else:
+                matcher.set_seq1(candidate)
+                if matcher.real_quick_ratio() < FUZZY_MATCH_THRESHOLD or matcher.quick_ratio() < FUZZY_MATCH_THRESHOLD:
+                    continue
+                score = matcher.ratio()
+                if score < FUZZY_MATCH_THRESHOLD:
+                    continue
+            scored.append((score, row['modified_gmt'], row))
+
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [
+            {'id': row['post_id'], 'title': row['title'], 'status': row['status'],
+             'modified': row['modified'], 'excerpt': row['excerpt']}
+            for _, _, row in scored[:limit]
+        ]
+
+    def find_posts(self, site: str, keyword: Optional[str] = None, intent_id: Optional[str] = None,
+                   statuses: Optional[Iterable[str]] = SEARCHABLE_STATUSES, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        キーワード（タイトル・本文）/ 検索意図IDで記事を絞り込み（更新が新しい順）
+
+        Args:
+            keyword: タイトル・本文に含まれる語（3文字以上は全文検索、それ未満は LIKE）
+            intent_id: 検索意図ID（INT-03 など）
+            statuses: 対象ステータス（Noneで全ステータス）
+            limit: 最大件数（Noneで無制限）
+        """
+        conditions, params = ["p.site = ?"], [site]
+        if keyword:
+            if self.full_text and len(keyword) >= MIN_FULL_TEXT_CHARS:
+                conditions.append("p.rowid IN (SELECT rowid FROM post_text WHERE post_text MATCH ?)")
+                params.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                conditions.append("p.rowid IN (SELECT rowid FROM post_text WHERE title LIKE ? OR body LIKE ?)")
+                params.extend([f"%{keyword}%"] * 2)
+        if intent_id:
+            conditions.append("p.post_id IN (SELECT post_id FROM post_intents WHERE site = ? AND intent_id = ?)")
+            params.extend([site, intent_id])
+        if statuses is not None:
+            statuses = tuple(statuses)
+            conditions.append(f"p.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+
+        query = (f"SELECT p.*, (SELECT group_concat(intent_id) FROM post_intents i "
+                 f"WHERE i.site = p.site AND i.post_id = p.post_id) AS intent_ids "
+                 f"FROM posts p WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY p.modified_gmt DESC, p.post_id DESC")
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_summary(row) for row in rows]
+
+    def find_posts_with_block(self, site: str, block_hash: str) -> List[int]:
+        """指定ハッシュのブロックを含む記事ID（定型ブロックの一括差し替え対象の確認等）"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT post_id FROM post_blocks WHERE site = ? AND block_hash = ? ORDER BY post_id",
+                (site, block_hash)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row['post_id'] for row in rows]
+
+    def get_block_hashes(self, site: str, post_id: int) -> List[str]:
+        """記事のブロックハッシュ（ブロック順）"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT block_hash FROM post_blocks WHERE site = ? AND post_id = ? ORDER BY position",
+                (site, int(post_id))
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row['block_hash'] for row in rows]
+
+    def get_analytics(self, site: str, post_id: int) -> Dict[str, Any]:
+        """記事分析データ（analytics ルートと同じ形式、未同期の記事は空）"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM posts WHERE site = ? AND post_id = ?",
+                               (site, int(post_id))).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return {}
+        return {
+            'post_id': row['post_id'],
+            'word_count': row['word_count'],
+            'character_count': row['character_count'],
+            'paragraph_count': row['paragraph_count'],
+            'last_modified': row['modified'],
+            'status': row['status'],
+            'heading_count': {'h2': row['h2_count'], 'h3': row['h3_count'], 'h4': row['h4_count']},
+            'has_featured_image': bool(row['featured_media'])
+        }
+
+    def select_rewrite_candidates(self, site: str, modified_before: Optional[str] = None,
+                                  max_characters: Optional[int] = None, max_h2: Optional[int] = None,
+                                  intent_id: Optional[str] = None, statuses: Iterable[str] = ('publish',),
+                                  history_path: Optional[Union[str, Path]] = DEFAULT_HISTORY_PATH,
+                                  limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        リライト候補の選定（更新が古い順、更新履歴の件数・最終更新日時を結合）
+
+        Args:
+            modified_before: この日時（GMT, 'YYYY-MM-DD HH:MM:SS'）より前に更新された記事のみ
+            max_characters: 本文がこの文字数以下の記事のみ
+            max_h2: H2見出しがこの数以下の記事のみ
+            intent_id: 検索意図ID
+            history_path: 更新履歴DB（UpdateHistoryStore、存在しない場合は結合しない）
+        """
+        statuses = tuple(statuses)
+        conditions = ["p.site = ?", f"p.status IN ({', '.join('?' * len(statuses))})"]
+        params: List[Any] = [site, *statuses]
+        if modified_before is not None:
+            conditions.append("p.modified_gmt < ?")
+            params.append(modified_before)
+        if max_characters is not None:
+            conditions.append("p.character_count <= ?")
+            params.append(int(max_characters))
+        if max_h2 is not None:
+            conditions.append("p.h2_count <= ?")
+            params.append(int(max_h2))
+        if intent_id:
+            conditions.append("p.post_id IN (SELECT post_id FROM post_intents WHERE site = ? AND intent_id = ?)")
+            params.extend([site, intent_id])
+
+        use_history = history_path is not None and Path(history_path).exists()
+        history_columns = ("h.update_count, h.last_update" if use_history
+                           else "0 AS update_count, NULL AS last_update")
+        history_join = ("LEFT JOIN (SELECT post_id, COUNT(*) AS update_count, MAX(updated_at) AS last_update "
+                        "FROM history.updates WHERE site = ? GROUP BY post_id) h ON h.post_id = p.post_id"
+                        if use_history else "")
+        query = (f"SELECT p.*, {history_columns}, "
+                 f"(SELECT group_concat(intent_id) FROM post_intents i "
+                 f"WHERE i.site = p.site AND i.post_id = p.post_id) AS intent_ids "
+                 f"FROM posts p {history_join} WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY p.modified_gmt ASC, p.post_id ASC LIMIT ?")
+        params = ([site] if use_history else []) + params + [int(limit)]
+
+        conn = self._connect()
+        try:
+            if use_history:
+                conn.execute("ATTACH DATABASE ? AS history", (str(history_path),))
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        candidates = []
+        for row in rows:
+            candidate = self._row_to_summary(row)
+            candidate.update({
+                'character_count': row['character_count'],
+                'h2_count': row['h2_count'],
+                'update_count': row['update_count'] or 0,
+                'last_update': row['last_update']
+            })
+            candidates.append(candidate)
+        return candidates
+
+    def get_stats(self, site: str) -> Dict[str, Any]:
+        """カタログ統計（記事数・ステータス別件数・同期位置）"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS count FROM posts WHERE site = ? GROUP BY status",
+                                (site,)).fetchall()
+        finally:
+            conn.close()
+        by_status = {row['status']: row['count'] for row in rows}
+        return {'posts': sum(by_status.values()), 'by_status': by_status, 'sync_state': self.get_sync_state(site)}
+
+    def _row_to_summary(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'id': row['post_id'],
+            'title': row['title'],
+            'status': row['status'],
+            'modified': row['modified'],
+            'featured_media': row['featured_media'],
+            'intent_ids': row['intent_ids'].split(',') if row['intent_ids'] else []
+        }
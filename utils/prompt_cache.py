@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Geminiプロンプト生成キャッシュ
+テンプレート内容・アウトライン・対象章・モデル名のハッシュをキーに
+generate_prompt_with_gemini の応答をディスクに保存する
+"""
+
+from typing import Dict, Any, Optional
+
+from utils.disk_cache import DiskLRUCache, DEFAULT_CACHE_ROOT, content_hash
+
+# デフォルトキャッシュ設定
+DEFAULT_PROMPT_CACHE_SETTINGS = {
+    "enabled": True,
+    "ttl_hours": 168,
+    "max_entries": 500,
+    "max_size_mb": 50
+}
+
+
+class PromptCache(DiskLRUCache):
+    """Geminiプロンプト応答のディスクキャッシュ"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_ROOT / 'gemini_prompts', **kwargs):
+        super().__init__(cache_dir, suffix='.txt', **kwargs)
+
+    @staticmethod
+    def make_key(template: str, outline_content: str, target_h2: Optional[str], model: str) -> str:
+        """(テンプレート内容, アウトライン, 対象章, モデル名) からキャッシュキーを生成"""
+        return content_hash('gemini_prompt', template, outline_content, target_h2, model)
+
+    @classmethod
+    def from_settings(cls, image_settings: Dict[str, Any], enabled: bool = True) -> 'PromptCache':
+        """image_settings.jsonの prompt_cache 設定からキャッシュを生成"""
+        return super().from_settings(image_settings.get('prompt_cache', {}),
+                                     DEFAULT_PROMPT_CACHE_SETTINGS, enabled)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+画像プロバイダークライアントの遅延初期化
+google.genai / openai SDK はimportだけで数百msかかるため、
+初回使用時にimport・クライアント生成を行い、CLIの起動を軽くする
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+# 認証情報（環境変数名）
+GOOGLE_API_KEY = 'GOOGLE_API_KEY'
+OPENAI_API_KEY = 'OPENAI_API_KEY'
+WORDPRESS_API_KEY = 'WORDPRESS_API_KEY'
+WORDPRESS_ENDPOINT = 'WORDPRESS_ENDPOINT'
+
+
+def require_credentials(names: Iterable[str]) -> Dict[str, str]:
+    """
+    指定された環境変数がすべて設定されているか検証
+
+    Returns:
+        {環境変数名: 値}
+
+    Raises:
+        ValueError: 未設定の環境変数がある場合
+    """
+    values = {name: os.getenv(name) for name in names}
+    missing = [name for name, value in values.items() if not value]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} not found in .env file")
+    return values
+
+
+class ProviderClients:
+    """Google GenAI / OpenAI クライアント（初回アクセス時に生成、スレッドセーフ）"""
+
+    def __init__(self, google_api_key: Optional[str] = None, openai_api_key: Optional[str] = None):
+        self.google_api_key = google_api_key
+        self.openai_api_key = openai_api_key
+        self._google = None
+        self._openai = None
+        self._lock = threading.Lock()
+
+    @property
+    def google(self):
+        """google.genai.Client"""
+        if self._google is None:
+            with self._lock:
+                if self._google is None:
+                    if not self.google_api_key:
+                        raise ValueError(f"{GOOGLE_API_KEY} not found in .env file")
+                    from google import genai
+                    self._google = genai.Client(api_key=self.google_api_key)
+        return self._google
+
+    @property
+    def openai(self):
+        """openai.OpenAI"""
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    if not self.openai_api_key:
+                        raise ValueError(f"{OPENAI_API_KEY} not found in .env file")
+                    from openai import OpenAI
+                    self._openai = OpenAI(api_key=self.openai_api_key)
+        return self._openai
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+WordPressリクエスト本文の圧縮
+記事作成・更新・バックアップのJSON本文（全文のGutenberg HTML）を gzip（Content-Encoding: gzip）で送信する
+プラグインの対応は /usage の request_encodings で確認し、未対応（旧バージョン）の場合は非圧縮で送る
+送信量（圧縮前 / 実送信バイト数）を集計する
+"""
+
+import json
+import gzip
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+# デフォルト設定（無効時は常に非圧縮）
+DEFAULT_REQUEST_COMPRESSION_SETTINGS = {
+    "enabled": False,
+    "min_bytes": 8192,
+    "level": 6
+}
+
+
+class RequestBodyEncoder:
+    """JSONリクエスト本文のエンコード（プラグイン対応時はgzip圧縮）と送信量統計"""
+
+    def __init__(self, enabled: bool = False, min_bytes: int = 8192, level: int = 6):
+        """
+        Args:
+            enabled: gzip圧縮を使用（プラグインが対応している場合のみ）
+            min_bytes: 圧縮する最小本文サイズ（これ未満は非圧縮）
+            level: gzip圧縮レベル
+        """
+        self.enabled = enabled
+        self.min_bytes = min_bytes
+        self.level = level
+        # プラグインのgzip対応（None: 未確認）
+        self.gzip_supported: Optional[bool] = None
+        self.stats = {"requests": 0, "compressed": 0, "raw_bytes": 0, "wire_bytes": 0}
+        self._lock = threading.Lock()
+        # 並行送信時に /usage を1回だけ取得する
+        self._negotiation_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, wordpress_settings: Dict[str, Any]) -> 'RequestBodyEncoder':
+        """wordpress_settings の request_compression 設定から生成"""
+        settings = dict(DEFAULT_REQUEST_COMPRESSION_SETTINGS)
+        settings.update(wordpress_settings.get('request_compression', {}))
+        return cls(enabled=settings['enabled'], min_bytes=settings['min_bytes'], level=settings['level'])
+
+    @property
+    def needs_negotiation(self) -> bool:
+        """圧縮が有効でプラグインの対応が未確認"""
+        return self.enabled and self.gzip_supported is None
+
+    def negotiate(self, usage: Dict[str, Any]) -> bool:
+        """/usage の応答からプラグインのgzip対応を記録"""
+        encodings = usage.get('request_encodings') if isinstance(usage, dict) else None
+        self.gzip_supported = isinstance(encodings, list) and 'gzip' in encodings
+        return self.gzip_supported
+
+    def negotiate_with(self, session: requests.Session, endpoint: str, headers: Dict[str, str], timeout):
+        """未確認の場合のみ /usage を取得して対応を確認（接続エラー時は未確認のまま非圧縮で送信）"""
+        if not self.needs_negotiation:
+            return
+        with self._negotiation_lock:
+            if not self.needs_negotiation:
+                return
+            try:
+                response = session.get(f"{endpoint}/usage", headers=headers, timeout=timeout)
+                self.negotiate(response.json() if response.status_code == 200 else {})
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+
+    def encode(self, data: Dict[str, Any], headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        JSON本文をエンコード
+
+        Returns:
+            (送信する本文, ヘッダー（圧縮時は Content-Encoding: gzip を追加）)
+        """
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        raw_bytes = len(body)
+        compressed = self.enabled and self.gzip_supported is True and raw_bytes >= self.min_bytes
+        if compressed:
+            body = gzip.compress(body, compresslevel=self.level, mtime=0)
+            headers = dict(headers, **{'Content-Encoding': 'gzip'})
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["compressed"] += int(compressed)
+            self.stats["raw_bytes"] += raw_bytes
+            self.stats["wire_bytes"] += len(body)
+        return body, headers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """送信量統計取得（saved_ratio: 圧縮で削減した割合）"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["gzip_supported"] = self.gzip_supported
+        stats["saved_ratio"] = 1 - stats["wire_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 0.0
+        return stats
+
+    def format_stats(self) -> str:
+        """送信量の表示用文字列"""
+        stats = self.get_stats()
+        return (f"{stats['raw_bytes'] / 1024:.1f}KB → {stats['wire_bytes'] / 1024:.1f}KB "
+                f"(gzip {stats['compressed']}/{stats['requests']}件, 削減 {stats['saved_ratio']:.0%})")
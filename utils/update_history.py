@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+WordPress記事更新履歴ストア
+記事更新を追記専用で記録し (site, post_id, updated_at) のインデックスで検索する（SQLite WAL）
+本文は全文を保存せず SHA-256 と文字数のみ記録する
+"""
+
+import json
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# プロジェクトルート基準（実行ディレクトリに依存しない）
+DEFAULT_HISTORY_PATH = Path(__file__).parent.parent / 'outputs' / 'update_history.db'
+
+# 全文の代わりにハッシュで記録する項目
+HASHED_FIELDS = ('content',)
+
+
+def compact_update_data(update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """更新データの本文を {'sha256', 'length'} に置き換える"""
+    compact = dict(update_data)
+    for field in HASHED_FIELDS:
+        value = compact.get(field)
+        if isinstance(value, str):
+            compact[field] = {
+                'sha256': hashlib.sha256(value.encode('utf-8')).hexdigest(),
+                'length': len(value)
+            }
+    return compact
+
+
+class UpdateHistoryStore:
+    """記事更新履歴（追記専用）"""
+
+    BUSY_TIMEOUT_SECONDS = 30
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_HISTORY_PATH):
+        self.db_path = Path(db_path)
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を作成（スレッド・プロセス間で共有せず操作ごとに使用）"""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """スキーマ作成・WALモード設定"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS updates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    site TEXT NOT NULL,
+                    post_id INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    update_strategy TEXT,
+                    update_data TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    backup_id TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_updates_post_time
+                    ON updates (site, post_id, updated_at);
+                CREATE INDEX IF NOT EXISTS idx_updates_time
+                    ON updates (site, updated_at);
+            """)
+        finally:
+            conn.close()
+
+    def record(self, site: str, post_id: int, update_data: Dict[str, Any],
+               result: Dict[str, Any], backup_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        更新を1件追記
+
+        Returns:
+            記録した履歴エントリ（本文はハッシュ化済み）
+        """
+        entry = {
+            "post_id": post_id,
+            "updated_at": datetime.now().isoformat(),
+            "update_data": compact_update_data(update_data),
+            "result": result,
+            "backup_id": backup_id
+        }
+        self.append(site, [entry])
+        return entry
+
+    def append(self, site: str, entries: Iterable[Dict[str, Any]]):
+        """履歴エントリをまとめて追記（1トランザクション）"""
+        rows = [
+            (site, int(entry["post_id"]), entry["updated_at"],
+             entry["update_data"].get('update_strategy'),
+             json.dumps(compact_update_data(entry["update_data"]), ensure_ascii=False),
+             json.dumps(entry.get("result") or {}, ensure_ascii=False),
+             entry.get("backup_id"))
+            for entry in entries
+        ]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO updates (site, post_id, updated_at, update_strategy, update_data, result, backup_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get_history(self, site: str, post_id: Optional[int] = None,
+                    since: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        更新履歴取得（古い順）
+
+        Args:
+            site: サイトURL
+            post_id: 投稿ID（Noneの場合は全記事）
+            since: この日時（ISO形式）以降の更新のみ
+            limit: 新しい方から最大件数（Noneで無制限）
+        """
+        conditions = ["site = ?"]
+        params: List[Any] = [site]
+        if post_id is not None:
+            conditions.append("post_id = ?")
+            params.append(int(post_id))
+        if since is not None:
+            conditions.append("updated_at >= ?")
+            params.append(since)
+
+        query = (f"SELECT * FROM updates WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY updated_at DESC, id DESC")
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_entry(row) for row in reversed(rows)]
+
+    def _row_to_entry(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "post_id": row["post_id"],
+            "updated_at": row["updated_at"],
+            "update_data": json.loads(row["update_data"]),
+            "result": json.loads(row["result"]),
+            "backup_id": row["backup_id"]
+        }
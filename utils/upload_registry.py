@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+WordPressアップロード重複排除レジストリ
+アップロードした画像バイトのSHA-256を (attachment_id, url, site) に対応付けて記録し、
+同じ内容の画像を再アップロードせずに既存の添付ファイルを再利用する（SQLite WAL）
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+# プロジェクトルート基準（実行ディレクトリに依存しない）
+DEFAULT_REGISTRY_PATH = Path(__file__).parent.parent / 'outputs' / 'upload_registry.db'
+
+
+def site_from_endpoint(endpoint: str) -> str:
+    """プラグインAPIエンドポイントからサイトURLを取得"""
+    return endpoint.split('/wp-json')[0].rstrip('/')
+
+
+class UploadRegistry:
+    """SHA-256 → {attachment_id, url, site} のアップロード記録"""
+
+    BUSY_TIMEOUT_SECONDS = 30
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_REGISTRY_PATH):
+        self.db_path = Path(db_path)
+        self._initialize_database()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """画像バイトのSHA-256（16進64文字）"""
+        return hashlib.sha256(data).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を作成（スレッド・プロセス間で共有せず操作ごとに使用）"""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """スキーマ作成・WALモード設定"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    sha256 TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    attachment_id INTEGER NOT NULL,
+                    url TEXT,
+                    filename TEXT,
+                    uploaded_at TEXT NOT NULL,
+                    PRIMARY KEY (sha256, site)
+                )
+            """)
+        finally:
+            conn.close()
+
+    def lookup(self, sha256: str, site: str,
+               exists: Optional[Callable[[int], bool]] = None) -> Optional[Dict[str, Any]]:
+        """
+        記録済みのアップロードを取得
+
+        Args:
+            sha256: 画像バイトのSHA-256
+            site: サイトURL
+            exists: 添付ファイルの存在確認（Falseを返した場合は記録を削除してNone）
+
+        Returns:
+            {'attachment_id', 'url', 'site'} または None
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT attachment_id, url, site FROM uploads WHERE sha256 = ? AND site = ?",
+                (sha256, site)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+
+        entry = dict(row)
+        if exists is not None and not exists(entry['attachment_id']):
+            # メディアライブラリから削除済み
+            self.forget(sha256, site)
+            return None
+        return entry
+
+    def record(self, sha256: str, site: str, attachment_id: int,
+               url: Optional[str] = None, filename: Optional[str] = None):
+        """アップロード結果を記録（同じ内容の再アップロード時は上書き）"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (sha256, site, attachment_id, url, filename, uploaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (sha256, site, attachment_id, url, filename, datetime.now().isoformat())
+            )
+        finally:
+            conn.close()
+
+    def forget(self, sha256: str, site: str):
+        """記録を削除"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM uploads WHERE sha256 = ? AND site = ?", (sha256, site))
+        finally:
+            conn.close()
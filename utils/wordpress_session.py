@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+WordPress HTTPセッション共有
+全WordPressクライアントで1つの requests.Session を共有し、同一エンドポイントへの
+TCP/TLS接続を keep-alive で再利用する（リクエストごとのハンドシェイクを回避）
+プールサイズ・タイムアウト・リトライは ConfigManager.get_wordpress_config から取得
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config_manager import ConfigManager
+
+_session: Optional[requests.Session] = None
+_settings: Optional[Dict[str, Any]] = None
+_lock = threading.Lock()
+
+
+def get_wordpress_settings() -> Dict[str, Any]:
+    """wordpress_settings（初回のみ ConfigManager から読み込み）"""
+    global _settings
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = ConfigManager().get_wordpress_config()['wordpress_settings']
+    return _settings
+
+
+def _build_session(settings: Dict[str, Any]) -> requests.Session:
+    """接続プール付きセッションを生成"""
+    # 接続確立前のエラーのみ再試行（送信済みPOSTの二重実行を避けるため read/status は再試行しない）
+    retry = Retry(
+        total=settings['retry_attempts'],
+        connect=settings['retry_attempts'],
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=settings['retry_delay'] / 2,
+        raise_on_status=False
+    )
+    # pool_block: ホストあたり pool_maxsize を超える同時リクエストは空き接続を待つ
+    adapter = HTTPAdapter(
+        pool_connections=settings['pool_connections'],
+        pool_maxsize=settings['pool_maxsize'],
+        pool_block=True,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_wordpress_session() -> requests.Session:
+    """プロセス共有のWordPressセッション（スレッドセーフ）"""
+    global _session
+    if _session is None:
+        settings = get_wordpress_settings()
+        with _lock:
+            if _session is None:
+                _session = _build_session(settings)
+    return _session
+
+
+def wordpress_timeout(upload: bool = False) -> Tuple[int, int]:
+    """
+    requests の timeout 引数
+
+    Args:
+        upload: 画像アップロード用（読み取りタイムアウトを upload_timeout にする）
+
+    Returns:
+        (接続タイムアウト, 読み取りタイムアウト)
+    """
+    settings = get_wordpress_settings()
+    read_timeout = settings['upload_timeout'] if upload else settings['timeout']
+    return settings['connect_timeout'], read_timeout
+
+
+def close_wordpress_session():
+    """共有セッションを閉じる（次回取得時に再生成）"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None